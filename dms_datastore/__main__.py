@@ -17,10 +17,12 @@ from dms_datastore.populate_repo import populate_main_cli
 from dms_datastore.station_info import station_info_cli
 from dms_datastore.reformat import reformat_cli
 from dms_datastore.auto_screen import auto_screen_cli
+from dms_datastore.screen_benchmark import screen_benchmark_cli
 from dms_datastore.inventory import inventory_cli
 from dms_datastore.usgs_multi import usgs_multi_cli
 from dms_datastore.delete_from_filelist import delete_from_filelist_cli
 from dms_datastore.caching import data_cache_cli
+from dms_datastore.sidecar import sidecar_cache_cli
 from dms_datastore.merge_files import merge_files_cli
 from dms_datastore.dropbox_data import dropbox_cli
 from dms_datastore.coarsen_file import coarsen_ts_cli
@@ -63,10 +65,12 @@ cli.add_command(populate_main_cli, "populate_repo")
 cli.add_command(station_info_cli, "station_info")
 cli.add_command(reformat_cli, "reformat")
 cli.add_command(auto_screen_cli, "auto_screen")
+cli.add_command(screen_benchmark_cli, "screen_benchmark")
 cli.add_command(inventory_cli, "inventory")
 cli.add_command(usgs_multi_cli, "usgs_multi")
 cli.add_command(delete_from_filelist_cli, "delete_from_filelist")
 cli.add_command(data_cache_cli, "data_cache")
+cli.add_command(sidecar_cache_cli, "sidecar_cache")
 cli.add_command(merge_files_cli, "merge_files")
 cli.add_command(coarsen_ts_cli, "coarsen")
 cli.add_command(update_flagged_data,"updated_flagged_data")
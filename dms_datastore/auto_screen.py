@@ -2,9 +2,13 @@
 # -*- coding: utf-8 -*
 
 import click
+import concurrent.futures
 import glob
+import logging.handlers
 import os
+import queue
 import random
+import time
 import yaml
 import copy
 import pandas as pd
@@ -19,6 +23,7 @@ from dms_datastore.dstore_config import *
 from dms_datastore.inventory import *
 from dms_datastore.write_ts import *
 from dms_datastore.filename import meta_to_filename, _template_tokens, fname_implies_chunking
+from dms_datastore.screen_engine import compile_protocol
 from schimpy.station import *
 import geopandas as gpd
 import numpy as np
@@ -33,6 +38,18 @@ logger = logging.getLogger(__name__)
 region_checkers = {}
 
 
+def _bind_args(args, station_id, subloc, param):
+    """Fill in ``station_id``/``subloc``/``param`` placeholders of step args in place."""
+    for key in list(args):
+        if args[key] == "station_id" and args[key] == "station_id":
+            args["station_id"] = station_id
+        if args[key] == "subloc" and args[key] == "subloc":
+            args["subloc"] = subloc
+        if args[key] == "param" and args[key] == "param":
+            args["param"] = param
+    return args
+
+
 def screener(
     ts,
     station_id,
@@ -43,8 +60,19 @@ def screener(
     plot_label=None,
     return_anomaly=False,
     plot_dest=None,  # directory or 'interactive' or None for no plots
+    fused=False,
+    step_hook=None,
 ):
-    """Performs yaml-specified screening protocol on time series"""
+    """Performs yaml-specified screening protocol on time series
+
+    With *fused*, the protocol is compiled with
+    :func:`dms_datastore.screen_engine.compile_protocol` and run in a single
+    pass over NumPy arrays. The resulting ``user_flag`` is the same.
+
+    *step_hook*, if given, is called after each step as
+    ``step_hook(label, seconds, nrows)`` with the wall time of the step,
+    e.g. :func:`log_step_time`.
+    """
     logger.info(
         f"screening: station_id: {station_id}, subloc: {subloc}, param: {param}"
     )
@@ -53,43 +81,47 @@ def screener(
     full = None
     ts_process = ts.copy()
     nstep = len(steps)
-    for step in steps:
-        method_name = step["method"]
-        label = step["label"] if "label" in step else method_name
-        logger.debug(f"Performing step: {label}")
-        method = globals()[method_name]
-
-        args = step["args"]
-        for key in args:
-            if args[key] == "station_id" and args[key] == "station_id":
-                args["station_id"] = station_id
-            if args[key] == "subloc" and args[key] == "subloc":
-                args["subloc"] = subloc
-            if args[key] == "param" and args[key] == "param":
-                args["param"] = param
-
-        if len(ts_process.columns) > 1:
-            if "value" in ts_process.columns:
-                ts_process = ts_process.value.to_frame()
+    if fused:
+        for step in steps:
+            _bind_args(step["args"], station_id, subloc, param)
+        result = compile_protocol(protocol, globals()).run(ts_process, step_hook=step_hook)
+        ts_process = result.processed
+        if do_plot or return_anomaly:
+            full = result.anomalies()
+    else:
+        for step in steps:
+            method_name = step["method"]
+            label = step["label"] if "label" in step else method_name
+            logger.debug(f"Performing step: {label}")
+            started = time.perf_counter()
+            method = globals()[method_name]
+
+            args = _bind_args(step["args"], station_id, subloc, param)
+
+            if len(ts_process.columns) > 1:
+                if "value" in ts_process.columns:
+                    ts_process = ts_process.value.to_frame()
+                else:
+                    raise ValueError(
+                        "Multiple columns with no 'value' column to evaluate is unexpected"
+                    )
+
+            anomaly = method(ts_process, **args)
+            if "apply_immediately" in step and step["apply_immediately"]:
+                ts_process = ts_process.mask(anomaly)
+
+            # Create column with step label as column name in dataframe of anomaly results
+            if full is None:
+                try:
+                    full = anomaly.to_frame()
+                except:
+                    full = anomaly
+                full.columns = [label]
             else:
-                raise ValueError(
-                    "Multiple columns with no 'value' column to evaluate is unexpected"
-                )
-
-        anomaly = method(ts_process, **args)
-        if "apply_immediately" in step and step["apply_immediately"]:
-            ts_process = ts_process.mask(anomaly)
-
-        # Create column with step label as column name in dataframe of anomaly results
-        if full is None:
-            try:
-                full = anomaly.to_frame()
-            except:
-                full = anomaly
-            full.columns = [label]
-        else:
-            full[label] = anomaly
-        logger.debug("step complete")
+                full[label] = anomaly
+            if step_hook is not None:
+                step_hook(label, time.perf_counter() - started, len(ts_process))
+            logger.debug("step complete")
 
     if do_plot:
         logger.debug("plotting")
@@ -97,9 +129,12 @@ def screener(
             ts_process, full, plot_label, gap_fill_final=3, plot_dest=plot_dest
         )
         logger.debug("plotting complete")
-    # This uses nullable integer so we can leave blank
-    ts["user_flag"] = full.any(axis=1).astype(pd.Int64Dtype())  # This is nullable
-    ts["user_flag"] = ts["user_flag"].mask(ts["user_flag"] == 0, other=pd.NA)
+    if fused:
+        ts["user_flag"] = result.user_flag()
+    else:
+        # This uses nullable integer so we can leave blank
+        ts["user_flag"] = full.any(axis=1).astype(pd.Int64Dtype())  # This is nullable
+        ts["user_flag"] = ts["user_flag"].mask(ts["user_flag"] == 0, other=pd.NA)
     if return_anomaly:
         return ts, full
     else:
@@ -107,6 +142,12 @@ def screener(
     logger.debug("time series screen complete")
 
 
+def log_step_time(label, seconds, nrows):
+    """Step hook for :func:`screener` that logs the time each step took."""
+    rate = nrows / seconds if seconds > 0 else float("inf")
+    logger.info(f"step {label}: {seconds:.3f} s, {nrows} rows, {rate:.0f} rows/s")
+
+
 def plot_anomalies(
     ts, anomaly_df, plot_label, gap_fill_final=0, plot_dest="interactive"
 ):
@@ -165,6 +206,349 @@ def filter_inventory_(inventory, stations, params):
 
     return inventory
 
+def _load_screen_config(config):
+    """Screening config from a yaml file name or an already loaded struct."""
+    if isinstance(config, (str, os.PathLike)) and os.path.exists(config):
+        # file name was given
+        screen_config = load_config(config)
+        screen_config["config_dir"] = os.path.split(config)[0]
+    else:
+        # yaml struct
+        screen_config = config
+    return screen_config
+
+
+def _resume_inventory(inventory, start_station):
+    """Inventory rows from the first row of *start_station* onward."""
+    if start_station is None:
+        return inventory
+    hits = np.flatnonzero(inventory["station_id"].to_numpy() == start_station)
+    if len(hits) == 0:
+        raise ValueError(f"start_station {start_station} not found in inventory")
+    logger.info(f"Resuming at station {start_station}, skipping {hits[0]} series")
+    return inventory.iloc[hits[0]:]
+
+
+#: Least history screened before the first recomputed flag in incremental
+#: mode, so that tests estimating their scale from the data (median tests
+#: without an explicit ``scale``) see a representative sample.
+INCREMENTAL_MIN_CONTEXT = pd.Timedelta(days=365)
+
+#: Relative difference below which a value counts as unchanged when looking
+#: for the incremental watermark.
+WATERMARK_RTOL = 1e-12
+
+
+def _bind_protocol(proto, station_id, subloc, param):
+    """Copy of *proto* with step args bound as :func:`screener` binds them."""
+    bound = copy.deepcopy(proto)
+    for step in bound["steps"]:
+        _bind_args(step["args"], station_id, subloc, param)
+    return bound
+
+
+def _prior_screened(output_fpath, chunk_years, proto):
+    """Existing screened output for a series, or None if it must be redone.
+
+    Output written with a different screening protocol does not count.
+    """
+    pattern = str(output_fpath).replace(".csv", "_*.csv") if chunk_years else str(output_fpath)
+    if not glob.glob(pattern):
+        return None
+    try:
+        prior_meta, prior = read_flagged(
+            pattern, apply_flags=False, return_flags=True, return_meta=True
+        )
+    except Exception as e:
+        logger.warning(f"Could not read prior screened output {pattern}: {e}")
+        return None
+    if prior_meta.get("screen") != proto:
+        logger.info(f"Screening protocol changed since {pattern} was written")
+        return None
+    prior = prior.copy()
+    prior["user_flag"] = pd.to_numeric(prior["user_flag"]).astype(pd.Int64Dtype())
+    return prior
+
+
+def _screen_watermark(ts, prior):
+    """First timestamp of *ts* whose screening may differ from *prior*.
+
+    That is the earliest value that is new, changed or no longer present
+    compared with the previously screened output. Returns None if *ts* and
+    *prior* hold the same values.
+    """
+    new = ts["value"] if "value" in ts.columns else ts.iloc[:, 0]
+    old = prior["value"].reindex(new.index)
+    # pandas' default CSV float parser is not round-trip exact, so the same
+    # text can read back a unit in the last place apart.
+    same = np.isclose(
+        new.to_numpy(dtype="float64"), old.to_numpy(dtype="float64"),
+        rtol=WATERMARK_RTOL, atol=0.0, equal_nan=True,
+    )
+    changed = ~(same & new.index.isin(prior.index))
+    candidates = []
+    if changed.any():
+        candidates.append(new.index[changed.argmax()])
+    gone = prior.index.difference(new.index)
+    if len(gone) > 0:
+        candidates.append(gone[0])
+    return min(candidates) if candidates else None
+
+
+def _equal_run_start(values, pos):
+    """Start of the run of equal consecutive values that contains *pos*."""
+    v = values[: pos + 1]
+    breaks = np.flatnonzero(v[1:] != v[:-1])
+    return int(breaks[-1]) + 1 if len(breaks) else 0
+
+
+def _big_gap_start(values, pos, small_gap_len):
+    """Start of the last gap longer than *small_gap_len* before *pos*, or 0."""
+    missing = np.isnan(values[: pos + 1]).astype(np.int8)
+    edges = np.flatnonzero(np.diff(np.concatenate(([0], missing, [0]))))
+    starts, ends = edges[::2], edges[1::2]
+    big = np.flatnonzero(ends - starts > small_gap_len)
+    return int(starts[big[-1]]) if len(big) else 0
+
+
+def _step_reach(step, values, pos):
+    """Earliest position whose flag can depend on, or is needed for, *pos*.
+
+    Returns None for methods whose reach is unknown.
+    """
+    method = step["method"]
+    args = step.get("args", {})
+    if method == "bounds_test":
+        return pos
+    if method == "dip_test":
+        return pos - 1
+    if method in ("median_test", "median_test_twoside"):
+        return pos - args.get("filt_len", 7)
+    if method == "median_test_oneside":
+        # diff, shift and a trailing window of 2 * (filt_len // 2)
+        return pos - 2 * (args.get("filt_len", 6) // 2) - 2
+    if method == "repeat_test":
+        return _equal_run_start(values, pos) - 1
+    if method == "short_run_test":
+        return _big_gap_start(values, pos, args["small_gap_len"]) - 1
+    return None
+
+
+def _incremental_window(ts, proto, watermark):
+    """Positions to screen incrementally from *watermark*.
+
+    Returns
+    -------
+    tuple of int or None
+        ``(first, start)``: flags are recomputed from position *first* on,
+        screening the data from position *start* on. None if the protocol has
+        a step of unknown reach and the whole series must be screened.
+    """
+    col = ts["value"] if "value" in ts.columns else ts.iloc[:, 0]
+    values = col.to_numpy(dtype="float64")
+    first = int(ts.index.searchsorted(watermark))
+    if first >= len(values):
+        # data were removed at the end
+        return None
+    # A change can alter flags before it (centered windows, runs) and each
+    # flag needs its own context; steps apply in turn, so chain their reach.
+    bounds = []
+    pos = first
+    for _ in range(2):
+        for step in proto["steps"]:
+            pos = _step_reach(step, values, max(pos, 0))
+            if pos is None:
+                return None
+        bounds.append(max(pos, 0))
+    first, start = bounds
+    start = min(start, int(ts.index.searchsorted(ts.index[first] - INCREMENTAL_MIN_CONTEXT)))
+    return first, start
+
+
+def _screen_series(
+    row,
+    resolver,
+    source_repo,
+    actual_fpath,
+    output_naming,
+    dest,
+    plot_dest,
+    incremental=False,
+    fused=False,
+    step_hook=None,
+):
+    """Fetch, screen and write one inventory row.
+
+    With *incremental*, only data from the watermark found by
+    :func:`_screen_watermark` on (plus warm-up context) are screened, and only
+    the affected year shards are rewritten.
+
+    Returns
+    -------
+    tuple or None
+        ``(station_id, subloc, param)`` if no data could be read, else None.
+    """
+    station_id = row["station_id"]
+    subloc = row["subloc"]
+    param = row["param"]
+
+    if pd.isna(subloc) or subloc is None:
+        subloc = "default"
+
+    station_info = resolver.station_db.loc[station_id, :]
+    agency = row["agency_registry"] if "agency_registry" in row.index else row["agency"]
+    if agency.startswith("dwr_"):
+        agency = agency[4:]  # todo: need to take care of des_ vs dwr_des etc
+
+    # Now we have most information, but the time series may be split between sources
+    # with low and high priority
+    fetcher = custom_fetcher(agency)
+    # these may be lists
+    try:
+        # logger.debug(f"fetching {actual_fpath},{station_id},{param}")
+        meta_ts = fetcher(source_repo, station_id, param, subloc=subloc, data_path=actual_fpath)
+    except Exception as e:
+        logger.warning(f"Read failed for {actual_fpath}, {station_id}, {param}, {subloc}, storage loc = {actual_fpath}")
+        logger.exception(e)
+        print(e)
+        meta_ts = None
+
+    if meta_ts is None:
+        logger.debug(f"No data found for {station_id} {subloc} {param}")
+        return (station_id, subloc, param)
+    metas, ts = meta_ts
+    meta = metas[0]
+    # temporary tolerance for "sublocation" added in early 2026. "subloc" is now preferred.
+    subloc_actual = meta.get("subloc", meta.get("sublocation", "default"))
+    if subloc_actual in (None, "", "none"):
+        subloc_actual = "default"
+    proto = resolver.protocol(station_id, subloc, param)
+
+    # Resolve the naming config for output files.
+    # output_naming is either a literal template string or a repo name.
+    if "{" in output_naming:
+        # Literal template string — wrap in a minimal spec dict.
+        _out_rcfg = {"filename_templates": [output_naming], "provider_key": None, "name": "<explicit>"}
+    else:
+        # Repo name supplied for naming purposes only.
+        _out_rcfg = repo_config(output_naming)
+
+    _provider_key = _out_rcfg.get("provider_key", "agency")
+    _first_template = (_out_rcfg.get("filename_templates") or [""])[0]
+    chunk_style = fname_implies_chunking(_first_template)
+    chunk_years = chunk_style != "none"
+
+    # Build output filename.  Include both agency and source so the template
+    # can use whichever provider key it needs regardless of source repo convention.
+    output_meta = {
+        "agency": agency,
+        "source": meta.get("source", agency),
+        "station_id": station_id,
+        "subloc": subloc_actual if subloc_actual != "default" else None,
+        "param": param,
+        "agency_id": row.agency_id,
+    }
+    if chunk_style == "single" and "year" in meta:
+        output_meta["year"] = meta["year"]
+    elif chunk_style == "blocked" and "syear" in meta and "eyear" in meta:
+        output_meta["syear"] = meta["syear"]
+        output_meta["eyear"] = meta["eyear"]
+
+    output_fname = meta_to_filename(output_meta, repo_cfg=_out_rcfg, include_shard=not chunk_years)
+    output_fpath = os.path.join(dest, output_fname)
+
+    window = None
+    if incremental:
+        bound = _bind_protocol(proto, station_id, subloc_actual, param)
+        prior = _prior_screened(output_fpath, chunk_years, bound)
+        if prior is not None:
+            watermark = _screen_watermark(ts, prior)
+            if watermark is None:
+                logger.info(f"No new or changed data for {station_id} {subloc} {param}, skipping")
+                return None
+            window = _incremental_window(ts, bound, watermark)
+        if window is None:
+            logger.debug(f"Screening full history of {station_id} {subloc} {param}")
+
+    do_plot = plot_dest is not None
+    subloc_label = "" if subloc == "default" else subloc
+    subloc_suffix = f"@{subloc_label}" if subloc_label else ""
+    plot_label = f"{station_info['name']}_{station_id}{subloc_suffix}_{param}"
+    screened = screener(
+        ts if window is None else ts.iloc[window[1]:].copy(),
+        station_id,
+        subloc_actual,
+        param,
+        proto,
+        do_plot,
+        plot_label,
+        plot_dest=plot_dest,
+        fused=fused,
+        step_hook=step_hook,
+    )
+    logger.debug(f"screening complete for {station_id} {subloc} {param}")
+    if "value" in screened.columns:
+        screened = screened[["value", "user_flag"]]
+    meta["screen"] = proto
+
+    if window is not None:
+        first = window[0]
+        logger.info(
+            f"Incremental screen of {station_id} {subloc} {param} from {ts.index[first]}"
+        )
+        flags = pd.concat(
+            [
+                prior["user_flag"].reindex(ts.index[:first]),
+                screened["user_flag"].loc[ts.index[first]:],
+            ]
+        )
+        screened = ts[["value"]].copy() if "value" in ts.columns else ts.copy()
+        screened["user_flag"] = flags.astype(pd.Int64Dtype())
+        if chunk_years:
+            # Shards of earlier years are unchanged.
+            screened = screened.loc[str(ts.index[first].year):]
+
+    logger.debug(f"start write for {output_fpath} with meta {meta}")
+    write_ts_csv(screened, output_fpath, meta, chunk_years=chunk_years)
+    logger.debug("end write")
+    return None
+
+
+# Per-process state of auto_screen workers, filled in by _init_screen_worker.
+_worker_state = {}
+
+
+def _init_screen_worker(resolver, level):
+    """Install the protocol resolver, resolved by the parent, in a worker.
+
+    Log records of the package are buffered instead of emitted so the parent
+    can replay them in inventory order.
+    """
+    records = queue.SimpleQueue()
+    pkg_logger = logging.getLogger("dms_datastore")
+    pkg_logger.handlers.clear()
+    pkg_logger.addHandler(logging.handlers.QueueHandler(records))
+    pkg_logger.setLevel(level)
+    pkg_logger.propagate = False
+
+    _worker_state.update(resolver=resolver, records=records)
+
+
+def _screen_series_job(row, options):
+    """Screen one row in a worker. Returns ``(failed, error, log_records)``."""
+    records = _worker_state["records"]
+    try:
+        failed = _screen_series(row, _worker_state["resolver"], **options)
+        error = None
+    except Exception as exc:
+        logger.exception(f"Screening failed for {row['station_id']} {row['param']}")
+        failed, error = None, exc
+    log_records = []
+    while not records.empty():
+        log_records.append(records.get())
+    return failed, error, log_records
+
+
 def auto_screen(
     output_naming,
     repo="formatted",
@@ -175,6 +559,10 @@ def auto_screen(
     params=None,
     plot_dest=None,
     start_station=None,
+    workers=1,
+    incremental=False,
+    fused=False,
+    step_hook=None,
 ):
     """Auto screen all data in directory
     Parameters
@@ -214,124 +602,103 @@ def auto_screen(
 
     start_station : str
         In case of crash, restarts processing at this station
-    """
-    if os.path.exists(config):
-        # file name was given
-        screen_config = load_config(config)
-        screen_config["config_dir"] = os.path.split(config)[0]
-    else:
-        # yaml struct
-        screen_config = config
 
-    active = start_station is None
-    station_db = station_dbase()
+    workers : int
+        Number of processes screening series concurrently. Protocols are
+        resolved once in the parent and shipped to the workers. Log output and
+        failures are reported in inventory order whatever the worker count.
+
+    incremental : bool
+        Screen only what changed since the output in *dest* was written. The
+        watermark is the earliest new, changed or removed value compared with
+        the existing screened output. Flags before it are kept, flags from it
+        on are recomputed with enough warm-up context for each step (filter
+        lengths, repeat and gap runs), and only year shards from the
+        watermark's year on are rewritten. Series without changes are skipped.
+        Series with no prior output, output from a different protocol, or a
+        step of unknown reach are screened in full. Median tests that estimate
+        their scale from the data see at least :data:`INCREMENTAL_MIN_CONTEXT`
+        of history rather than the whole series; give ``scale`` explicitly in
+        the protocol to make them independent of the screened span.
+
+    fused : bool
+        Run each protocol as a single compiled pass, see
+        :mod:`dms_datastore.screen_engine`. Flags are the same as without it.
+
+    step_hook : callable, optional
+        Passed to :func:`screener` for every series, e.g. :func:`log_step_time`
+        to log the time of each step. Must be picklable if ``workers > 1``.
+
+    Returns
+    -------
+    list of tuple
+        ``(station_id, subloc, param)`` of the series that could not be read.
+    """
+    if workers < 1:
+        raise ValueError("workers must be >= 1")
+    if workers > 1 and plot_dest == "interactive":
+        raise ValueError("Interactive plotting requires workers=1")
 
     source_repo = repo
     actual_fpath = fpath if fpath is not None else repo_root(source_repo)
     inventory = repo_data_inventory(repo=source_repo, in_path=actual_fpath) # repo is the config repo, in_path is the data storage location
     inventory = filter_inventory_(inventory, stations, params)
+    inventory = _resume_inventory(inventory, start_station)
+    rows = [row for _, row in inventory.iterrows()]
+    options = dict(
+        source_repo=source_repo,
+        actual_fpath=actual_fpath,
+        output_naming=output_naming,
+        dest=dest,
+        plot_dest=plot_dest,
+        incremental=incremental,
+        fused=fused,
+        step_hook=step_hook,
+    )
     failed_read = []
 
-    for index, row in inventory.iterrows():
-        station_id = row["station_id"]
-        subloc = row["subloc"]
-        param = row["param"]
-
-        if pd.isna(subloc) or subloc is None:
-            subloc = "default"
-
-        if subloc is None:
-            subloc = "default"
-        if np.random.uniform() < 0.0:  # 0.95:
-            logger.debug(f"Randomly rejecting: {station_id} {subloc} {param}")
-            continue
-
-        station_info = station_db.loc[station_id, :]
-        agency = row["agency_registry"] if "agency_registry" in row.index else row["agency"]
-        if agency.startswith("dwr_"):
-            agency = agency[4:]  # todo: need to take care of des_ vs dwr_des etc
-
-        # Now we have most information, but the time series may be split between sources
-        # with low and high priority
-        fetcher = custom_fetcher(agency)
-        # these may be lists
-        try:
-            # logger.debug(f"fetching {actual_fpath},{station_id},{param}")
-            meta_ts = fetcher(source_repo, station_id, param, subloc=subloc, data_path=actual_fpath)
-        except Exception as e:
-            logger.warning(f"Read failed for {actual_fpath}, {station_id}, {param}, {subloc}, storage loc = {actual_fpath}")
-            logger.exception(e)
-            print(e)
-            meta_ts = None
-
-        if meta_ts is None:
-            logger.debug(f"No data found for {station_id} {subloc} {param}")
-            failed_read.append((station_id, subloc, param))
-            logger.debug("Cumulative fails:")
-            for fr in failed_read:
-                logger.debug(fr)
-            continue
-        metas, ts = meta_ts
-        meta = metas[0]
-        # temporary tolerance for "sublocation" added in early 2026. "subloc" is now preferred.
-        subloc_actual = meta.get("subloc", meta.get("sublocation", "default"))
-        if subloc_actual in (None, "", "none"):
-            subloc_actual = "default"
-        proto = context_config(screen_config, station_id, subloc, param)
-        do_plot = plot_dest is not None
-        subloc_label = "" if subloc == "default" else subloc
-        subloc_suffix = f"@{subloc_label}" if subloc_label else ""
-        plot_label = f"{station_info['name']}_{station_id}{subloc_suffix}_{param}"
-        screened = screener(
-            ts,
-            station_id,
-            subloc_actual,
-            param,
-            proto,
-            do_plot,
-            plot_label,
-            plot_dest=plot_dest,
+    def record_failure(failed):
+        if failed is None:
+            return
+        failed_read.append(failed)
+        logger.debug("Cumulative fails:")
+        for fr in failed_read:
+            logger.debug(fr)
+
+    # Regions and protocols are resolved up front: one spatial join for the
+    # registry, then a lookup per series.
+    resolver = ProtocolResolver(_load_screen_config(config)).precompute(
+        (
+            row["station_id"],
+            "default" if pd.isna(row["subloc"]) else row["subloc"],
+            row["param"],
         )
-        logger.debug(f"screening complete for {station_id} {subloc} {param}")
-        if "value" in screened.columns:
-            screened = screened[["value", "user_flag"]]
-        meta["screen"] = proto
-
-        # Resolve the naming config for output files.
-        # output_naming is either a literal template string or a repo name.
-        if "{" in output_naming:
-            # Literal template string — wrap in a minimal spec dict.
-            _out_rcfg = {"filename_templates": [output_naming], "provider_key": None, "name": "<explicit>"}
-        else:
-            # Repo name supplied for naming purposes only.
-            _out_rcfg = repo_config(output_naming)
-
-        _provider_key = _out_rcfg.get("provider_key", "agency")
-        _first_template = (_out_rcfg.get("filename_templates") or [""])[0]
-        chunk_style = fname_implies_chunking(_first_template)
-        chunk_years = chunk_style != "none"
-
-        # Build output filename.  Include both agency and source so the template
-        # can use whichever provider key it needs regardless of source repo convention.
-        output_meta = {
-            "agency": agency,
-            "source": meta.get("source", agency),
-            "station_id": station_id,
-            "subloc": subloc_actual if subloc_actual != "default" else None,
-            "param": param,
-            "agency_id": row.agency_id,
-        }
-        if chunk_style == "single" and "year" in meta:
-            output_meta["year"] = meta["year"]
-        elif chunk_style == "blocked" and "syear" in meta and "eyear" in meta:
-            output_meta["syear"] = meta["syear"]
-            output_meta["eyear"] = meta["eyear"]
+        for row in rows
+    )
 
-        output_fname = meta_to_filename(output_meta, repo_cfg=_out_rcfg, include_shard=not chunk_years)
-        output_fpath = os.path.join(dest, output_fname)
-        logger.debug(f"start write for {output_fpath} with meta {meta}")
-        write_ts_csv(screened, output_fpath, meta, chunk_years=chunk_years)
-        logger.debug("end write")
+    workers = min(workers, len(rows))
+    if workers <= 1:
+        for row in rows:
+            record_failure(_screen_series(row, resolver, **options))
+        return failed_read
+
+    with concurrent.futures.ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_screen_worker,
+        initargs=(resolver, logging.getLogger("dms_datastore").getEffectiveLevel()),
+    ) as executor:
+        futures = [executor.submit(_screen_series_job, row, options) for row in rows]
+        # Collect in submission order so logs and failures read as a serial run.
+        for future in futures:
+            failed, error, log_records = future.result()
+            for record in log_records:
+                logging.getLogger(record.name).handle(record)
+            if error is not None:
+                for other in futures:
+                    other.cancel()
+                raise error
+            record_failure(failed)
+    return failed_read
 
 
 def update_steps(proto, x):
@@ -380,6 +747,20 @@ def load_config(config_file):
     return screen_config
 
 
+def _region_file(screen_config):
+    """Path of the region shapefile, or None if no spatial lookup is needed."""
+    region_file = screen_config["regions"]["region_file"]
+    logger.debug(f"Region file: {region_file}")
+
+    # Only perform spatial lookup when there are regions beyond "region_file" and "default"
+    active_regions = [k for k in screen_config["regions"] if k not in ("region_file", "default")]
+    if not active_regions:
+        return None
+    if not (os.path.exists(region_file)):
+        region_file = os.path.join(screen_config["config_dir"], region_file)
+    return region_file
+
+
 def context_config(screen_config, station_id, subloc, param):
     """Find the screening specification for the given station and param
     Parameters
@@ -401,15 +782,8 @@ def context_config(screen_config, station_id, subloc, param):
 
     station_info = station_dbase()
 
-    region_file = screen_config["regions"]["region_file"]
-    logger.debug(f"Region file: {region_file}")
-
-    # Only perform spatial lookup when there are regions beyond "region_file" and "default"
-    active_regions = [k for k in screen_config["regions"] if k not in ("region_file", "default")]
-    if active_regions:
-        if not (os.path.exists(region_file)):
-            region_file = os.path.join(screen_config["config_dir"], region_file)
-
+    region_file = _region_file(screen_config)
+    if region_file is not None:
         # Search for applicable region
         logger.debug(f"station_id: {station_id}, subloc: {subloc}, param: {param}")
         x = station_info.loc[station_id, "x"]
@@ -419,7 +793,19 @@ def context_config(screen_config, station_id, subloc, param):
     else:
         region_name = "default"
 
-    config = copy.deepcopy(screen_config)
+    return _merge_protocol(screen_config, region_name, station_id, param)
+
+
+def _merge_protocol(screen_config, region_name, station_id, param):
+    """Merge global, param, region and station steps into one protocol."""
+    # Only the sections used are copied; update_steps modifies its arguments.
+    config = copy.deepcopy(
+        {
+            "defaults": screen_config["defaults"],
+            "region": screen_config["regions"].get(region_name),
+            "station": screen_config["stations"].get(station_id),
+        }
+    )
     update_global = None
     proto = config["defaults"]["global"]
 
@@ -431,9 +817,8 @@ def context_config(screen_config, station_id, subloc, param):
         proto = update_steps(proto, update_global)  # updates components or replaces
 
     # next try for region+variable
-    region_config = None
-    if region_name in config["regions"]:
-        region_config = config["regions"][region_name]
+    region_config = config["region"]
+    if region_config is not None:
         if param in region_config["params"]:
             update_region = region_config["params"][param]
             logger.debug(f"region var\n{proto}\n{update_region}")
@@ -441,10 +826,9 @@ def context_config(screen_config, station_id, subloc, param):
             logger.debug(f"region var 2\n{proto}\nafter\n{update_region}")
 
     # first priority: match station and variable
-    station_config = None
-    if station_id in config["stations"]:
+    station_config = config["station"]
+    if station_config is not None:
         logger.debug("Found station")
-        station_config = config["stations"][station_id]
         if param in station_config["params"]:
             update_station = station_config["params"][param]
             logger.debug(f"station var\n{proto}\nthen\n{update_station}")
@@ -454,6 +838,83 @@ def context_config(screen_config, station_id, subloc, param):
     return proto
 
 
+class ProtocolResolver(object):
+    """Screening protocols resolved once per station, subloc and param.
+
+    :func:`context_config` looks up the region of one station with a spatial
+    join and deep copies the whole screening config on every call. The
+    resolver joins all registry stations to the region shapefile in a single
+    ``sjoin`` the first time a region is needed and memoizes each merged
+    protocol, so a series costs a dictionary lookup. It is picklable and can
+    be handed, precomputed, to worker processes.
+
+    Parameters
+    ----------
+    screen_config : dict
+        Loaded screening configuration.
+    station_db : pandas.DataFrame, optional
+        Station registry with ``x`` and ``y`` columns, default
+        :func:`station_dbase`.
+    """
+
+    def __init__(self, screen_config, station_db=None):
+        self.screen_config = screen_config
+        self.station_db = station_dbase() if station_db is None else station_db
+        self._regions = None
+        self._protocols = {}
+
+    def regions(self):
+        """Region name of every registry station (NaN outside all regions)."""
+        if self._regions is None:
+            region_file = _region_file(self.screen_config)
+            if region_file is None:
+                self._regions = dict.fromkeys(self.station_db.index, "default")
+            else:
+                if region_file not in region_checkers:
+                    region_checkers[region_file] = RegionChecker(region_file)
+                xy = self.station_db[["x", "y"]].to_numpy(dtype="float64")
+                located = np.isfinite(xy).all(axis=1)
+                info = region_checkers[region_file].region_info(xy[located, 0], xy[located, 1])
+                # A point on a shared border matches more than one region. The
+                # old per-station lookup raised on that; keep the first region
+                # and say so.
+                stations = self.station_db.index[located]
+                counts = info.groupby(level=0).size()
+                for pos in counts.index[counts > 1]:
+                    logger.warning(
+                        "Station %s lies in more than one screening region %s; using %s",
+                        stations[pos],
+                        list(info.loc[[pos], "name"]),
+                        info.loc[[pos], "name"].iloc[0],
+                    )
+                names = info["name"].groupby(level=0).first().reindex(range(located.sum()))
+                self._regions = dict.fromkeys(self.station_db.index, np.nan)
+                self._regions.update(zip(stations, names.to_numpy()))
+        return self._regions
+
+    def protocol(self, station_id, subloc, param):
+        """Merged protocol for a series. The caller may modify the copy returned."""
+        key = (station_id, subloc, param)
+        proto = self._protocols.get(key)
+        if proto is None:
+            if station_id not in self.station_db.index:
+                raise KeyError(station_id)
+            region_name = self.regions()[station_id]
+            proto = _merge_protocol(self.screen_config, region_name, station_id, param)
+            self._protocols[key] = proto
+        return copy.deepcopy(proto)
+
+    def precompute(self, keys):
+        """Resolve the protocols of an iterable of ``(station_id, subloc, param)``.
+
+        Stations missing from the registry are left to fail when screened.
+        """
+        for key in keys:
+            if key[0] in self.station_db.index:
+                self.protocol(*key)
+        return self
+
+
 class RegionChecker(object):
     def __init__(self, fname):
         self.shp = gpd.read_file(fname)  # open the shapefile
@@ -638,12 +1099,34 @@ def test_single(fname):  # not maintained
     default=None,
     help="Station id for starting or restarting the screening process.",
 )
+@click.option(
+    "--workers",
+    type=click.IntRange(min=1),
+    default=1,
+    show_default=True,
+    help="Number of processes screening series concurrently.",
+)
+@click.option(
+    "--incremental",
+    is_flag=True,
+    help="Only screen data that are new or changed relative to the output in --dest.",
+)
+@click.option(
+    "--fused",
+    is_flag=True,
+    help="Run each screening protocol as a single compiled pass over the series.",
+)
+@click.option(
+    "--step-timing",
+    is_flag=True,
+    help="Log the wall time of every screening step.",
+)
 @click.option("--logdir", type=click.Path(path_type=Path), default="logs")
 @click.option("--debug", is_flag=True)
 @click.option("--quiet", is_flag=True)
 @click.help_option("-h", "--help")
 def auto_screen_cli(config, fpath, repo, output_naming, dest, stations, params, plot_dest, start_station,
-                    logdir=None, debug=False, quiet=False):
+                    workers=1, incremental=False, fused=False, step_timing=False, logdir=None, debug=False, quiet=False):
     """Auto-screen individual files or whole repos."""
     level, console = resolve_loglevel(
         debug=debug,
@@ -675,6 +1158,10 @@ def auto_screen_cli(config, fpath, repo, output_naming, dest, stations, params,
         params=params_list,
         plot_dest=plot_dest,
         start_station=start_station,
+        workers=workers,
+        incremental=incremental,
+        fused=fused,
+        step_hook=log_step_time if step_timing else None,
     )
 
 
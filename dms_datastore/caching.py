@@ -1,13 +1,217 @@
 import diskcache as dc
+import io
 import os
+import pickle
 import shutil
 import inspect
+import logging
 import pandas as pd
 import functools
 import urllib.parse
 import atexit
 import click
 import inspect
+from dms_datastore import dstore_config
+
+logger = logging.getLogger(__name__)
+
+CACHE_DIR_ENV = "DMS_DATA_CACHE_DIR"
+CACHE_SIZE_ENV = "DMS_DATA_CACHE_SIZE_LIMIT"
+CACHE_EVICTION_ENV = "DMS_DATA_CACHE_EVICTION"
+CACHE_TTL_ENV = "DMS_DATA_CACHE_TTL"
+CACHE_SERIALIZER_ENV = "DMS_DATA_CACHE_SERIALIZER"
+
+_DEFAULT_SETTINGS = {
+    "directory": "cache",
+    "size_limit": int(6e9),
+    "eviction_policy": "least-recently-stored",
+    "default_ttl": None,
+    "ttl": {},
+    "serializer": "arrow",
+}
+
+
+def cache_settings():
+    """
+    Settings of the local data cache.
+
+    Values come from the ``data_cache`` mapping in ``dstore_config.yaml``,
+    overridden by the ``DMS_DATA_CACHE_*`` environment variables.
+
+    Returns
+    -------
+    dict
+        ``directory``, ``size_limit`` (bytes), ``eviction_policy`` (any
+        diskcache policy), ``default_ttl`` and per-function ``ttl`` (seconds,
+        None for no expiry) and ``serializer`` (``arrow``, ``parquet`` or
+        ``pickle``).
+    """
+    settings = dict(_DEFAULT_SETTINGS)
+    configured = dstore_config.config.get("data_cache") or {}
+    settings.update({k: v for k, v in configured.items() if v is not None})
+    env = {
+        "directory": os.environ.get(CACHE_DIR_ENV),
+        "size_limit": os.environ.get(CACHE_SIZE_ENV),
+        "eviction_policy": os.environ.get(CACHE_EVICTION_ENV),
+        "default_ttl": os.environ.get(CACHE_TTL_ENV),
+        "serializer": os.environ.get(CACHE_SERIALIZER_ENV),
+    }
+    settings.update({k: v for k, v in env.items() if v})
+    settings["directory"] = os.path.expanduser(str(settings["directory"]))
+    settings["size_limit"] = int(float(settings["size_limit"]))
+    if settings["default_ttl"] is not None:
+        settings["default_ttl"] = float(settings["default_ttl"])
+    settings["ttl"] = dict(settings.get("ttl") or {})
+    if settings["serializer"] not in _SERIALIZERS:
+        raise ValueError(
+            f"data_cache serializer must be one of {_SERIALIZERS}, "
+            f"got {settings['serializer']!r}"
+        )
+    return settings
+
+
+def _function_ttl(func_name, settings):
+    ttl = settings["ttl"].get(func_name, settings["default_ttl"])
+    return None if ttl is None else float(ttl)
+
+
+# Values are pickled as usual, except that DataFrames inside them are written
+# in an Arrow format: LZ4-compressed Arrow IPC ("arrow", loads faster than a
+# pickled frame and is about 40% smaller for typical repo series) or
+# zstd-compressed Parquet ("parquet", smallest, slower to load). Entries
+# written by older versions (plain pickles) still load.
+_SERIALIZERS = ("arrow", "parquet", "pickle")
+_FRAME_MAGIC = b"\x00dms-frames-1\x00"
+
+
+def _pyarrow():
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        return None
+    return pa, pq
+
+
+def _arrow_exact(df):
+    """True if Arrow restores the labels of *df* exactly.
+
+    Arrow stores column names as strings and MultiIndex columns as a string
+    encoding that does not survive None levels, so frames with such labels
+    (e.g. wide ``read_ts_repo_many`` output) are pickled instead.
+    """
+    if isinstance(df.columns, pd.MultiIndex) or isinstance(df.index, pd.MultiIndex):
+        return False
+    if not all(isinstance(c, str) for c in df.columns):
+        return False
+    names = [df.columns.name] + list(df.index.names)
+    return all(n is None or isinstance(n, str) for n in names)
+
+
+def _frame_to_bytes(df, serializer, arrow):
+    pa, pq = arrow
+    table = pa.Table.from_pandas(df, preserve_index=True)
+    if serializer == "parquet":
+        buf = pa.BufferOutputStream()
+        pq.write_table(table, buf, compression="zstd")
+        return buf.getvalue().to_pybytes()
+    codec = "lz4" if pa.Codec.is_available("lz4") else None
+    sink = pa.BufferOutputStream()
+    options = pa.ipc.IpcWriteOptions(compression=codec)
+    with pa.ipc.new_file(sink, table.schema, options=options) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def _frame_from_bytes(kind, payload):
+    pa, pq = _pyarrow()
+    if kind == "parquet":
+        table = pq.read_table(io.BytesIO(payload))
+    else:
+        table = pa.ipc.open_file(pa.py_buffer(payload)).read_all()
+    return table.to_pandas()
+
+
+class _FramePickler(pickle.Pickler):
+    def __init__(self, file, protocol, serializer, arrow):
+        super().__init__(file, protocol=protocol)
+        self._serializer = serializer
+        self._arrow = arrow
+
+    def persistent_id(self, obj):
+        if type(obj) is not pd.DataFrame or not _arrow_exact(obj):
+            return None
+        pa = self._arrow[0]
+        try:
+            payload = _frame_to_bytes(obj, self._serializer, self._arrow)
+        except (pa.ArrowException, TypeError, ValueError):
+            return None  # e.g. mixed object columns: pickle the frame instead
+        freq = getattr(obj.index, "freqstr", None)
+        return (self._serializer, freq, payload)
+
+
+class UndecodableEntry(Exception):
+    """A cached value could not be decoded."""
+
+
+class _FrameUnpickler(pickle.Unpickler):
+    def persistent_load(self, pid):
+        kind, freq, payload = pid
+        if kind not in ("arrow", "parquet"):
+            raise pickle.UnpicklingError(f"Unknown persistent id {kind!r}")
+        df = _frame_from_bytes(kind, payload)
+        if freq is not None and isinstance(df.index, pd.DatetimeIndex) and len(df):
+            # The stored index conformed to freq, so rebuild it rather than
+            # paying for pandas to validate the freq against every stamp.
+            idx = df.index
+            df.index = pd.date_range(
+                idx[0], periods=len(idx), freq=freq, name=idx.name
+            )
+        return df
+
+
+class FrameDisk(dc.Disk):
+    """diskcache Disk that stores DataFrames inside cached values in Arrow form."""
+
+    def __init__(self, directory, serializer="arrow", **kwargs):
+        super().__init__(directory, **kwargs)
+        self._serializer = serializer
+        self._arrow = _pyarrow() if serializer != "pickle" else None
+
+    def store(self, value, read, key=dc.core.UNKNOWN):
+        if not read and self._arrow is not None and not isinstance(
+            value, (bytes, str, int, float)
+        ):
+            buf = io.BytesIO()
+            buf.write(_FRAME_MAGIC)
+            pickler = _FramePickler(
+                buf, pickle.HIGHEST_PROTOCOL, self._serializer, self._arrow
+            )
+            pickler.dump(value)
+            value = buf.getvalue()
+        return super().store(value, read, key=key)
+
+    def fetch(self, mode, filename, value, read):
+        data = super().fetch(mode, filename, value, read)
+        if isinstance(data, bytes) and data.startswith(_FRAME_MAGIC):
+            try:
+                return _FrameUnpickler(io.BytesIO(data[len(_FRAME_MAGIC):])).load()
+            except Exception as exc:
+                raise UndecodableEntry(str(exc)) from exc
+        return data
+
+
+class FrameCache(dc.Cache):
+    """diskcache Cache whose undecodable entries read as misses and are evicted."""
+
+    def get(self, key, default=None, *args, **kwargs):
+        try:
+            return super().get(key, default, *args, **kwargs)
+        except UndecodableEntry as exc:
+            logger.warning(f"Evicting undecodable cache entry {key!r}: {exc}")
+            self.delete(key)
+            return default
+
 
 class LocalCache:
     _instance = None
@@ -15,7 +219,20 @@ class LocalCache:
     @classmethod
     def instance(cls):
         if cls._instance is None:
-            cls._instance = dc.Cache("cache", size_limit=int(6e9))
+            settings = cache_settings()
+            if settings["serializer"] != "pickle" and _pyarrow() is None:
+                logger.warning(
+                    "pyarrow is not installed; cached frames are pickled. "
+                    "Install it with: pip install pyarrow"
+                )
+            cls._instance = FrameCache(
+                settings["directory"],
+                size_limit=settings["size_limit"],
+                eviction_policy=settings["eviction_policy"],
+                disk=FrameDisk,
+                disk_serializer=settings["serializer"],
+            )
+            cls._instance.stats(enable=True)
             atexit.register(cls.close)
         return cls._instance
 
@@ -26,6 +243,36 @@ class LocalCache:
             cls._instance = None
 
 
+def cache_stats(reset=False):
+    """
+    Usage statistics of the local data cache.
+
+    Parameters
+    ----------
+    reset : bool
+        Reset the hit and miss counters after reading them.
+
+    Returns
+    -------
+    dict
+        ``hits``, ``misses``, ``hit_rate``, ``entries``, ``bytes`` (on-disk
+        volume), ``size_limit``, ``eviction_policy`` and ``directory``.
+    """
+    cache = LocalCache.instance()
+    hits, misses = cache.stats(enable=True, reset=reset)
+    total = hits + misses
+    return {
+        "hits": hits,
+        "misses": misses,
+        "hit_rate": hits / total if total else None,
+        "entries": len(cache),
+        "bytes": cache.volume(),
+        "size_limit": cache.size_limit,
+        "eviction_policy": cache.eviction_policy,
+        "directory": cache.directory,
+    }
+
+
 def wrap_cache_value(data, func):
     return {"data": data, "fname": f"{func.__module__}.{func.__name__}"}
 
@@ -105,7 +352,7 @@ def cache_dataframe(key_args=None):
 
 
 
-def cache_dataframe(key_args=None):
+def cache_dataframe(key_args=None, range_args=None, ttl=None):
     """
     Decorator to cache function outputs based on selected keyword arguments.
 
@@ -113,11 +360,40 @@ def cache_dataframe(key_args=None):
     ----------
     key_args : list of str, optional
         Names of arguments to include in the cache key. If None, use all named arguments.
+    range_args : tuple of str, optional
+        Names of the ``(start, end)`` arguments of a function that returns a
+        time-indexed DataFrame for a closed time window, e.g.
+        ``("start", "end")``. When given, the window is not part of the cache
+        key. Instead the entry remembers which windows it covers: a request
+        inside the covered windows is served by slicing, and a request that
+        only partly overlaps them calls the function for the missing
+        sub-windows and merges the result into the entry. Window values are
+        converted with ``pd.Timestamp``; None means unbounded.
+    ttl : float, optional
+        Seconds until entries of this function expire. Defaults to the
+        ``ttl`` configured for the function name, or ``default_ttl``, in the
+        ``data_cache`` settings (see :func:`cache_settings`).
+
+    Examples
+    --------
+    >>> @cache_dataframe(range_args=("start", "end"))
+    ... def get_flow(station, start=None, end=None):
+    ...     return read_ts_repo(station, "flow", start=start, end=end)
+    >>> a = get_flow(station="sjj", start="2020-01-01", end="2022-01-01")
+    >>> b = get_flow(station="sjj", start="2021-01-01", end="2021-06-01")  # sliced from a
     """
+    if range_args is not None:
+        range_args = tuple(range_args)
+        if len(range_args) != 2:
+            raise ValueError("range_args must name the (start, end) arguments")
 
     def decorator(func):
         sig = inspect.signature(func)
         func_name = func.__name__
+        if range_args is not None:
+            missing = [a for a in range_args if a not in sig.parameters]
+            if missing:
+                raise ValueError(f"{func_name} has no argument(s) {missing}")
 
         @functools.wraps(func)
         def wrapper(*args, **kwargs):
@@ -128,17 +404,25 @@ def cache_dataframe(key_args=None):
 
             # Filter to just those used in the cache key
             key_dict = {
-                k: v for k, v in all_args.items() if key_args is None or k in key_args
+                k: v
+                for k, v in all_args.items()
+                if (key_args is None or k in key_args)
+                and (range_args is None or k not in range_args)
             }
 
             cache = LocalCache.instance()
             cache_key = generate_cache_key(func_name, **key_dict)
+            expire = ttl if ttl is not None else _function_ttl(func_name, cache_settings())
 
-            if cache_key in cache:
-                return cache[cache_key]
+            if range_args is not None:
+                return _interval_call(func, bound, range_args, cache, cache_key, expire)
+
+            cached = cache.get(cache_key, default=dc.core.ENOVAL)
+            if cached is not dc.core.ENOVAL:
+                return cached
             else:
                 result = func(*args, **kwargs)
-                cache[cache_key] = result
+                cache.set(cache_key, result, expire=expire)
                 return result
 
         return wrapper
@@ -146,6 +430,116 @@ def cache_dataframe(key_args=None):
     return decorator
 
 
+def _to_bound(value, default):
+    return default if value is None else pd.Timestamp(value)
+
+
+def _merge_intervals(intervals):
+    """Union of closed ``(lo, hi)`` intervals, sorted."""
+    merged = []
+    for lo, hi in sorted(intervals):
+        if merged and lo <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], hi))
+        else:
+            merged.append((lo, hi))
+    return merged
+
+
+def _missing_intervals(covered, lo, hi):
+    """Parts of ``[lo, hi]`` not inside the sorted, disjoint *covered* list.
+
+    Gaps share their end points with the neighbouring covered intervals, so a
+    fetch of a gap may return rows that are already cached at its ends.
+    """
+    gaps = []
+    cursor = lo
+    for clo, chi in covered:
+        if chi < cursor:
+            continue
+        if clo > hi:
+            break
+        if clo > cursor:
+            gaps.append((cursor, clo))
+        cursor = max(cursor, chi)
+        if cursor >= hi:
+            return gaps
+    gaps.append((cursor, hi))
+    return gaps
+
+
+def _interval_call(func, bound, range_args, cache, cache_key, expire=None):
+    start_arg, end_arg = range_args
+    lo = _to_bound(bound.arguments[start_arg], pd.Timestamp.min)
+    hi = _to_bound(bound.arguments[end_arg], pd.Timestamp.max)
+    if lo > hi:
+        raise ValueError(f"{start_arg} is after {end_arg}")
+
+    entry = cache.get(cache_key)
+    if not (isinstance(entry, dict) and "intervals" in entry):
+        entry = None
+    covered = entry["intervals"] if entry is not None else []
+    gaps = _missing_intervals(covered, lo, hi)
+    if entry is not None and not gaps:
+        return entry["data"].loc[lo:hi]
+
+    pieces = [] if entry is None else [entry["data"]]
+    for glo, ghi in gaps:
+        call = inspect.BoundArguments(bound.signature, dict(bound.arguments))
+        call.arguments[start_arg] = None if glo == pd.Timestamp.min else glo
+        call.arguments[end_arg] = None if ghi == pd.Timestamp.max else ghi
+        result = func(*call.args, **call.kwargs)
+        if result is not None:
+            pieces.append(result)
+
+    if pieces:
+        data = pd.concat(pieces) if len(pieces) > 1 else pieces[0]
+        if len(pieces) > 1:
+            freq = getattr(pieces[0].index, "freq", None)
+            data = data[~data.index.duplicated(keep="first")].sort_index()
+            if freq is not None:
+                try:
+                    data.index.freq = freq
+                except ValueError:
+                    pass  # the covered windows are not contiguous
+    else:
+        data = pd.DataFrame()
+    entry = wrap_cache_value(data, func)
+    entry["intervals"] = _merge_intervals(covered + gaps)
+    cache.set(cache_key, entry, expire=expire)
+    return data.loc[lo:hi] if len(data) else data
+
+
+def cached_intervals(func_name=None):
+    """
+    Time windows covered by interval-mode cache entries.
+
+    Parameters
+    ----------
+    func_name : str, optional
+        Restrict the report to one decorated function.
+
+    Returns
+    -------
+    dict
+        Cache key -> list of ``(start, end)`` Timestamps, None for unbounded.
+    """
+    cache = LocalCache.instance()
+    out = {}
+    for key in cache.iterkeys():
+        if func_name is not None and not key.startswith(func_name + "|"):
+            continue
+        entry = cache.get(key)
+        if isinstance(entry, dict) and "intervals" in entry:
+            out[key] = [
+                (
+                    None if lo == pd.Timestamp.min else lo,
+                    None if hi == pd.Timestamp.max else hi,
+                )
+                for lo, hi in entry["intervals"]
+            ]
+    return out
+
+
 def generate_cache_key(func_name, **kwargs):
     """
     Generates a cache key based on the function name and its keyword arguments.
@@ -180,6 +574,48 @@ def generate_cache_key(func_name, **kwargs):
     return key
 
 
+def iter_cached_data(func_name):
+    """
+    Yield the cached entries of a function one at a time.
+
+    Each entry's index is extended with the function arguments that formed
+    its cache key, as in :func:`retrieve_all_data`. Only one entry is held in
+    memory at a time.
+
+    Parameters
+    ----------
+    func_name : str
+        The name of the function whose data is to be retrieved.
+
+    Yields
+    ------
+    tuple
+        ``(key_args, frame)`` where ``key_args`` is the dict of arguments
+        parsed from the cache key.
+    """
+    cache = LocalCache.instance()
+    for key in cache.iterkeys():
+        if not key.startswith(func_name + "|"):
+            continue
+        df = unwrap_cache_value(cache.get(key))
+        if df is None:
+            continue  # expired or evicted since the key was listed
+        _, args = parse_cache_key(key)
+        # The fetched frame is a fresh copy, so its index can be replaced.
+        if isinstance(df.index, pd.MultiIndex):
+            index_names = list(df.index.names)
+            df_index_parts = [df.index.get_level_values(i) for i in index_names]
+        else:
+            index_names = [df.index.name or "index"]
+            df_index_parts = [df.index]
+
+        key_parts = [[args[k]] * len(df) for k in args]
+        df.index = pd.MultiIndex.from_arrays(
+            df_index_parts + key_parts, names=index_names + list(args.keys())
+        )
+        yield args, df
+
+
 def retrieve_all_data(func_name):
     """
     Retrieves and concatenates all data related to a specific function from the cache.
@@ -187,6 +623,7 @@ def retrieve_all_data(func_name):
     This function aggregates all entries in the cache for a specified function,
     combining them into a single pandas DataFrame with a MultiIndex. Each level of
     the MultiIndex corresponds to one of the function's arguments used as a cache key.
+    For large caches prefer :func:`iter_cached_data`, which holds one entry at a time.
 
     Please be careful using the result -- time alone is not a unique key.
 
@@ -206,37 +643,27 @@ def retrieve_all_data(func_name):
     >>> df = retrieve_all_data('get_dataframe1')
     >>> print(df.head())
     """
-    cache = LocalCache.instance()
-    dataframes = []
-    for key in cache.iterkeys():
-        if key.startswith(func_name + "|"):
-            df = cache[key].copy()
-            _, args = parse_cache_key(key)
-            # Extend the index with function arguments for each row
-            if isinstance(df.index, pd.MultiIndex):
-                index_arrays = list(df.index.levels)
-                index_values = list(zip(*df.index.values))
-                df_index_parts = [pd.Index(level) for level in zip(*df.index.values)]
-            else:
-                df_index_parts = [df.index]
+    dataframes = [df for _, df in iter_cached_data(func_name)]
+    return pd.concat(dataframes) if dataframes else pd.DataFrame()
 
-            if isinstance(df.index, pd.MultiIndex):
-                index_names = list(df.index.names)
-                df_index_parts = [df.index.get_level_values(i) for i in index_names]
-            else:
-                index_names = [df.index.name or "index"]
-                df_index_parts = [df.index]
 
-            key_parts = [[args[k]] * len(df) for k in args]
-            extended_index = pd.MultiIndex.from_arrays(
-                df_index_parts + key_parts, names=index_names + list(args.keys())
-            )
-            df.set_index(extended_index, inplace=True)
-            dataframes.append(df)
-    return pd.concat(dataframes) if dataframes else pd.DataFrame()
+def _read_cache_csv_header(file_path):
+    header_map = {}
+    with open(file_path, "r") as f:
+        for line in f:
+            if not line.startswith("#"):
+                break
+            if ":" in line:
+                key, val = line[1:].strip().split(":", 1)
+                header_map[key.strip()] = val.strip()
+    return header_map
+
+
+def _header_list(header_map, name):
+    return [s.strip() for s in header_map.get(name, "").split(",") if s.strip()]
 
 
-def load_cache_csv(file_path):
+def load_cache_csv(file_path, chunksize=1_000_000):
     """
     Loads data from a CSV file into the cache, reconstructing the cached DataFrame structure.
 
@@ -245,11 +672,19 @@ def load_cache_csv(file_path):
     caching. It reconstructs the DataFrame with the appropriate MultiIndex based on the
     metadata and repopulates the cache with these DataFrames.
 
+    The file is read in chunks of `chunksize` rows and each cache entry is
+    inserted as soon as its rows are complete, so memory is bounded by the
+    largest entry rather than the whole file. Rows of one entry are expected
+    to be contiguous, as `cache_to_csv()` writes them; if they are not, the
+    pieces are merged.
+
     Parameters
     ----------
     file_path : str
         The path to the CSV file to be loaded. This file should contain metadata headers
         and data formatted as saved by `cache_to_csv()`.
+    chunksize : int
+        Number of CSV rows parsed at a time.
 
     Returns
     -------
@@ -273,51 +708,54 @@ def load_cache_csv(file_path):
             self.__module__ = "from_csv"
 
     cache = LocalCache.instance()
-    header_map = {}
-
-    with open(file_path, "r") as f:
-        while True:
-            pos = f.tell()
-            line = f.readline()
-            if not line.startswith("#"):
-                f.seek(pos)
-                break
-            if ":" in line:
-                key, val = line[1:].strip().split(":", 1)
-                header_map[key.strip()] = val.strip()
+    header_map = _read_cache_csv_header(file_path)
 
     function_line = header_map.get("cached_function")
-    keys_line = [s.strip() for s in header_map.get("keys", "").split(",") if s.strip()]
-    col_keys_line = [
-        s.strip() for s in header_map.get("col_keys", "").split(",") if s.strip()
-    ]
-    index_names = [
-        s.strip() for s in header_map.get("index_name", "").split(",") if s.strip()
-    ]
-
-    # Load CSV body
-    df = pd.read_csv(file_path, comment="#", header=0)
-
-    # groupby requires keys to be in columns, not index — DO NOT drop them yet
-    # Just confirm drop_keys for later
-    drop_keys = [k for k in keys_line if k not in col_keys_line]
+    keys_line = _header_list(header_map, "keys")
+    col_keys_line = _header_list(header_map, "col_keys")
+    index_names = _header_list(header_map, "index_name")
 
-    # Group using keys
-    for name, group in df.groupby(keys_line):
-        kwargs = dict(zip(keys_line, name if isinstance(name, tuple) else (name,)))
+    # Key columns are read as text so that a value such as "01" produces the
+    # same cache key in every chunk; drop_keys are removed from the entries.
+    drop_keys = [k for k in keys_line if k not in col_keys_line]
+    loaded = set()
 
-        # Remove unwanted key columns from inside each group
+    def insert(kwargs, parts):
+        group = pd.concat(parts) if len(parts) > 1 else parts[0]
         group = group.drop(columns=drop_keys, errors="ignore")
 
         # Set final index
         final_index = [col for col in index_names if col in group.columns]
         group = group.set_index(final_index)
-
         group = coerce_datetime_index(group)
 
-        wrapped = wrap_cache_value(group, DummyFunction(function_line))
-        print("CACHE INSERT:", generate_cache_key(function_line, **kwargs))
-        cache[generate_cache_key(function_line, **kwargs)] = wrapped
+        cache_key = generate_cache_key(function_line, **kwargs)
+        if cache_key in loaded:
+            group = pd.concat([unwrap_cache_value(cache[cache_key]), group])
+        loaded.add(cache_key)
+        print("CACHE INSERT:", cache_key)
+        cache[cache_key] = wrap_cache_value(group, DummyFunction(function_line))
+
+    reader = pd.read_csv(
+        file_path,
+        comment="#",
+        header=0,
+        dtype={k: str for k in keys_line},
+        chunksize=chunksize,
+    )
+    current, parts = None, []  # the entry being assembled and its row blocks
+    for chunk in reader:
+        for name, group in chunk.groupby(keys_line, sort=False, dropna=False):
+            name = name if isinstance(name, tuple) else (name,)
+            kwargs = {k: ("None" if pd.isna(v) else v) for k, v in zip(keys_line, name)}
+            if parts and kwargs == current:
+                parts.append(group)
+                continue
+            if parts:
+                insert(current, parts)
+            current, parts = kwargs, [group]
+    if parts:
+        insert(current, parts)
 
 
 def cache_to_csv(float_format=None):
@@ -325,10 +763,14 @@ def cache_to_csv(float_format=None):
     Writes all cached data to CSV files, one for each unique function.
 
     This function iterates over all entries in the cache, grouped by function name.
-    For each group associated with a function, it retrieves all related data using
-    `retrieve_all_data`, and saves it to a CSV file named after the function.
-    The CSV file includes metadata headers specifying the function and keys used
-    for caching.
+    Entries are streamed one at a time with `iter_cached_data` and appended to a
+    CSV file named after the function, so memory use is bounded by the largest
+    single entry. The CSV file includes metadata headers specifying the function
+    and keys used for caching.
+
+    Entries are read twice: once to collect the union of their columns, then
+    again to write each entry with those columns, so an entry lacking some of
+    them leaves the missing columns blank, as ``pd.concat`` would.
 
     No parameters.
 
@@ -349,31 +791,48 @@ def cache_to_csv(float_format=None):
     # containing all cached data for these functions.
     """
     cache = LocalCache.instance()
-    seen = set()
-
+    func_names = []
     for key in cache.iterkeys():
         func_name = key.split("|")[0]
-        if func_name in seen:
-            continue
-        seen.add(func_name)
-
-        all_data = retrieve_all_data(func_name)
-        if all_data.empty:
-            continue
-
-        index_name = all_data.index.names[0]
-        keys = all_data.index.names[1:]
-        file_path = f"{func_name}.csv"
-
+        if func_name not in func_names:
+            func_names.append(func_name)
+
+    for func_name in func_names:
+        # Union of the columns, in order of first appearance.
+        columns = None
+        for _, df in iter_cached_data(func_name):
+            if columns is None:
+                columns = list(df.columns)
+                index_names = list(df.index.names)
+                continue
+            for col in df.columns:
+                if col not in columns:
+                    columns.append(col)
+        if columns is None:
+            continue  # nothing cached for this function
+
+        keys = index_names[1:]
         # Determine which keys are retained in the data
-        col_keys = [key for key in keys if key in all_data.columns]
-        with open(file_path, "w") as f:
-            f.write(f"# cached_function: {func_name}\n")
-            f.write(f"# index_name: {', '.join(all_data.index.names)}\n")
-            f.write(f"# keys: {', '.join(keys)}\n")
-            if len(col_keys) > 0:
-                f.write(f"# col_keys: {', '.join(col_keys)}\n")
-        all_data.to_csv(file_path, mode="a", float_format=float_format)
+        col_keys = [key for key in keys if key in columns]
+        file_path = f"{func_name}.csv"
+        tmp_path = f"{file_path}.tmp"
+        try:
+            with open(tmp_path, "w", newline="") as f:
+                f.write(f"# cached_function: {func_name}\n")
+                f.write(f"# index_name: {', '.join(index_names)}\n")
+                f.write(f"# keys: {', '.join(keys)}\n")
+                if len(col_keys) > 0:
+                    f.write(f"# col_keys: {', '.join(col_keys)}\n")
+                header = True
+                for _, df in iter_cached_data(func_name):
+                    df.reindex(columns=columns).to_csv(
+                        f, header=header, float_format=float_format
+                    )
+                    header = False
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+        os.replace(tmp_path, file_path)
 
 
 def coerce_datetime_index(df):
@@ -398,9 +857,21 @@ def coerce_datetime_index(df):
     return df
 
 
-def caching(clear, to_csv, from_csv, delete, float_format):
+def caching(clear, to_csv, from_csv, delete, float_format, intervals=False, stats=False):
     """Manage the local cache"""
 
+    if stats:
+        for name, value in cache_stats().items():
+            print(f"{name}: {value}")
+
+    if intervals:
+        for key, spans in cached_intervals().items():
+            print(key)
+            for lo, hi in spans:
+                lo = "-inf" if lo is None else lo.isoformat()
+                hi = "+inf" if hi is None else hi.isoformat()
+                print(f"    {lo} .. {hi}")
+
     if (to_csv and delete) or (to_csv and clear):
         raise ValueError(
             "to_csv and delete/clear are incompatible. dump to csv, check the result then delete"
@@ -420,8 +891,10 @@ def caching(clear, to_csv, from_csv, delete, float_format):
         load_cache_csv(from_csv)
 
     if delete:
-        if os.path.exists("cache"):
-            shutil.rmtree("cache")
+        directory = cache_settings()["directory"]
+        LocalCache.close()
+        if os.path.exists(directory):
+            shutil.rmtree(directory)
 
 
 @click.command()
@@ -445,11 +918,21 @@ def caching(clear, to_csv, from_csv, delete, float_format):
     default=None,
     help="Load cache from a previously saved CSV file",
 )
+@click.option(
+    "--intervals",
+    is_flag=True,
+    help="List the time windows covered by each range-aware cache entry",
+)
+@click.option(
+    "--stats",
+    is_flag=True,
+    help="Report hit/miss counts, entries and bytes used",
+)
 @click.help_option("-h", "--help")
-def data_cache_cli(clear, to_csv, from_csv, delete, float_format):
+def data_cache_cli(clear, to_csv, from_csv, delete, float_format, intervals, stats):
     """CLI for managing the local cache."""
 
-    caching(clear, to_csv, from_csv, delete, float_format)
+    caching(clear, to_csv, from_csv, delete, float_format, intervals, stats)
 
 
 if __name__ == "__main__":
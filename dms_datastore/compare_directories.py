@@ -1,6 +1,5 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-import pandas as pd
-import glob
 import re
 import os
 import sys
@@ -10,6 +9,8 @@ import datetime as dtm
 import matplotlib.pyplot as plt
 from dms_datastore import dstore_config
 from dms_datastore.read_ts import *
+from dms_datastore.repo_index import DataHashManifest, index_glob
+from dms_datastore.shard_writer import _same_data_section, _stable_header
 import shutil
 
 __all__ = ["compare_dir"]
@@ -91,6 +92,20 @@ def _trim_using_exceptions(fnamelist, exceptions, base_present, compare_present)
     return fnamelistfilt
 
 
+def _same_content(bpath, cpath, base_hashes, comp_hashes):
+    """True if two files differ at most in volatile header keys."""
+    if _stable_header(bpath) != _stable_header(cpath):
+        return False
+    # Hashes already in both manifests settle it without reading data;
+    # otherwise the fingerprints screen out most changed files before hashing.
+    bhash, chash = base_hashes.cached_hash(bpath), comp_hashes.cached_hash(cpath)
+    if bhash is not None and chash is not None:
+        return bhash == chash
+    return _same_data_section(
+        bpath, cpath, hash_a=base_hashes.data_hash, hash_b=comp_hashes.data_hash
+    )
+
+
 def compare_dir(
     base,
     comp,
@@ -121,9 +136,9 @@ def compare_dir(
     if not (os.path.exists(comp)):
         raise ValueError(f"Comparison directory {comp} does not exist")
 
-    base_files = glob.glob(os.path.join(base, pat))
+    base_files = index_glob(os.path.join(base, pat))
     base_files = [os.path.split(x)[1] for x in base_files if os.path.isfile(x)]
-    comp_files = set(glob.glob(os.path.join(comp, pat)))
+    comp_files = set(index_glob(os.path.join(comp, pat)))
     comp_files = set([os.path.split(y)[1] for y in comp_files if os.path.isfile(y)])
     comp_files2 = comp_files.copy()
 
@@ -155,8 +170,15 @@ def compare_dir(
     outline(f"\nExact base matches: {nmatch}")
     # files that have changed but name is present in both
     if apply_change or apply_update:
-        for item in base_matched:  # move from comp to base
-            shutil.copy(os.path.join(comp, item), os.path.join(base, item))
+        nsame = 0
+        with DataHashManifest(base) as base_hashes, DataHashManifest(comp) as comp_hashes:
+            for item in base_matched:  # move from comp to base
+                bpath, cpath = os.path.join(base, item), os.path.join(comp, item)
+                if _same_content(bpath, cpath, base_hashes, comp_hashes):
+                    nsame += 1
+                    continue
+                shutil.copy(cpath, bpath)
+        outline(f"Exact matches with unchanged content, not copied: {nsame}")
 
     if year2:
         # files whose name is present in both except for the final year of
@@ -27,6 +27,7 @@ import pandas as pd
 from pathlib import Path
 from dms_datastore import dstore_config
 from dms_datastore.logging_config import configure_logging, resolve_loglevel
+from dms_datastore.shard_writer import write_shard
 import logging
 logging.captureWarnings(True)
 logger = logging.getLogger(__name__)
@@ -86,7 +87,7 @@ def query_station_data(program_id, result_id, start, end):
 
 
 def write_ts(fpath, df, meta):
-    with open(fpath, "w", encoding="utf-8") as fout:
+    def write(fout):
         for item in meta.keys():
             fout.write(f"# {item} : {meta[item]}\n")
         df.to_csv(
@@ -97,6 +98,8 @@ def write_ts(fpath, df, meta):
             date_format="%Y-%m-%dT%H:%M",
         )
 
+    write_shard(fpath, write)
+
 
 des_unit_map = {
     "ÂµS/cm": "microS/cm",
@@ -3,6 +3,9 @@
 
 import os
 import re
+import functools
+
+import pandas as pd
 
 
 _TEMPLATE_TOKEN_RE = re.compile(r"\{([^{}]+)\}")
@@ -46,6 +49,40 @@ def extract_year_fname(fname):
     return yr
 
 
+_SHARD_YEARS_RE = re.compile(r"(?:_(\d{4}))?_(\d{4})\.[A-Za-z0-9]+$")
+
+
+def shard_year_span(fname):
+    """Return the inclusive calendar-year span encoded in a shard file name.
+
+    Handles both single-year shards (``..._2020.csv``) and blocked shards
+    (``..._2020_2024.csv``). An end year of ``9999`` marks an open-ended
+    download and is returned as is.
+
+    Parameters
+    ----------
+    fname : str
+        File name or path.
+
+    Returns
+    -------
+    tuple of int or None
+        ``(first_year, last_year)``, or ``None`` if the name carries no
+        recognizable year token (e.g. an unsharded file).
+    """
+    m = _SHARD_YEARS_RE.search(os.path.basename(str(fname)))
+    if m is None:
+        return None
+    eyear = int(m.group(2))
+    syear = int(m.group(1)) if m.group(1) is not None else None
+    if syear is not None and 1800 <= syear <= 2200 and (syear <= eyear <= 2200 or eyear == 9999):
+        # blocked shard; downloaders use 9999 for an open-ended last year
+        return syear, eyear
+    if 1800 <= eyear <= 2200:
+        return eyear, eyear
+    return None
+
+
 def _station_key_from_parts(key, subloc):
     if "@" in key:
         return key
@@ -231,6 +268,7 @@ def _token_regex(token, key_column):
         return rf"(?P<{token}>[a-z0-9]+)"
 
 
+@functools.lru_cache(maxsize=None)
 def _template_regex_from_template(template, *, key_column="station_id"):
     pieces = ["^"]
     last = 0
@@ -246,6 +284,46 @@ def _template_regex_from_template(template, *, key_column="station_id"):
     return re.compile("".join(pieces), re.IGNORECASE)
 
 
+@functools.lru_cache(maxsize=256)
+def _template_matchers(templates, key_column="station_id"):
+    """Compiled regexes for a tuple of templates, in priority order."""
+    return tuple(
+        _template_regex_from_template(tmpl, key_column=key_column) for tmpl in templates
+    )
+
+
+def _meta_from_groups(fname, gd, site_key):
+    meta = {"filename": fname, "subloc": None}
+
+    for k, v in gd.items():
+        if v is None:
+            continue
+
+        if k.endswith("_full"):
+            base = k[:-5]
+
+            if "@" in v:
+                base_val, suffix_val = v.split("@", 1)
+            else:
+                base_val, suffix_val = v, None
+
+            if base == site_key:
+                meta[site_key] = base_val
+                meta["subloc"] = suffix_val
+            elif base == "param":
+                meta["param"] = base_val
+                if suffix_val is not None:
+                    meta["modifier"] = suffix_val
+            else:
+                meta[base] = base_val
+                if suffix_val is not None:
+                    meta[f"{base}_suffix"] = suffix_val
+        else:
+            meta[k] = v
+
+    return meta
+
+
 def _interpret_fname_template(fname, repo_cfg):
     fname = os.path.split(fname)[1]
     templates = repo_cfg.get("filename_templates", [])
@@ -255,47 +333,73 @@ def _interpret_fname_template(fname, repo_cfg):
             f"Repo {repo_cfg.get('name')!r} has no filename_templates for template parse"
         )
 
-    for tmpl in templates:
-        rx = _template_regex_from_template(tmpl, key_column=site_key)
+    for rx in _template_matchers(tuple(templates), site_key):
         m = rx.match(fname)
-        if m is None:
-            continue
-
-        gd = m.groupdict()
-        meta = {"filename": fname, "subloc": None}
-
-        for k, v in gd.items():
-            if v is None:
-                continue
-
-            if k.endswith("_full"):
-                base = k[:-5]
-
-                if "@" in v:
-                    base_val, suffix_val = v.split("@", 1)
-                else:
-                    base_val, suffix_val = v, None
-
-                if base == site_key:
-                    meta[site_key] = base_val
-                    meta["subloc"] = suffix_val
-                elif base == "param":
-                    meta["param"] = base_val
-                    if suffix_val is not None:
-                        meta["modifier"] = suffix_val
-                else:
-                    meta[base] = base_val
-                    if suffix_val is not None:
-                        meta[f"{base}_suffix"] = suffix_val
-            else:
-                meta[k] = v
-
-        return meta
+        if m is not None:
+            return _meta_from_groups(fname, m.groupdict(), site_key)
 
     raise ValueError(
         f"Template naming convention not matched for {fname} in repo {repo_cfg.get('name')!r}"
     )
 
+
+def interpret_fnames(fnames, repo=None, repo_cfg=None, naming=None, errors="raise"):
+    """Parse many file names at once.
+
+    Equivalent to ``pd.DataFrame([interpret_fname(f, ...) for f in fnames])``,
+    but the naming spec and compiled templates are resolved once for the
+    whole batch.
+
+    Parameters
+    ----------
+    fnames : list of str
+        File names or paths.
+    repo, repo_cfg, naming :
+        Naming convention, as for :func:`interpret_fname`.
+    errors : {'raise', 'coerce'}
+        If 'raise', a name that matches no template raises ValueError. If
+        'coerce', its row is missing everything except ``filename``.
+
+    Returns
+    -------
+    pandas.DataFrame
+        One row per name, in input order, with a ``filename`` column (the
+        base name) and one column per parsed field.
+    """
+    if errors not in ("raise", "coerce"):
+        raise ValueError(f"errors must be 'raise' or 'coerce', got {errors!r}")
+    spec = _coerce_naming_spec(repo=repo, repo_cfg=repo_cfg, naming=naming)
+    templates = spec.get("filename_templates", [])
+    site_key = "station_id"
+    if not templates:
+        raise ValueError(
+            f"Repo {spec.get('name')!r} has no filename_templates for template parse"
+        )
+
+    # Note: Series.str.extract is a per-element Python loop as well and
+    # measured slower than matching the compiled templates directly.
+    matchers = [rx.match for rx in _template_matchers(tuple(templates), site_key)]
+    records = []
+    for fname in fnames:
+        fname = os.path.split(fname)[1]
+        for match in matchers:
+            m = match(fname)
+            if m is not None:
+                records.append(_meta_from_groups(fname, m.groupdict(), site_key))
+                break
+        else:
+            if errors == "raise":
+                raise ValueError(
+                    f"Template naming convention not matched for {fname} "
+                    f"in repo {spec.get('name')!r}"
+                )
+            records.append({"filename": fname, "subloc": None})
+
+    if not records:
+        return pd.DataFrame(columns=["filename", "subloc"])
+    return pd.DataFrame(records)
+
+
 def _coerce_naming_spec(repo=None, repo_cfg=None, naming=None):
     if naming is not None:
         return naming
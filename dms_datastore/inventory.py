@@ -3,13 +3,19 @@
 
 import os
 import re
-import glob
 import click
 import pandas as pd
 
-from dms_datastore.filename import interpret_fname
+from dms_datastore.filename import interpret_fnames
 from dms_datastore.dstore_config import coerce_repo_config, repo_registry
-from dms_datastore.read_ts import read_yaml_header
+from dms_datastore.read_ts import read_header_fields
+from dms_datastore.repo_index import (
+    index_enabled,
+    index_glob,
+    indexed_fname_meta,
+    indexed_header_unit,
+    indexed_header_units,
+)
 
 __all__ = ["repo_file_inventory", "repo_data_inventory"]
 
@@ -45,20 +51,29 @@ def to_wildcard(fname, remove_provider=False):
 
 
 def scrape_header_metadata(fname):
-    yml = read_yaml_header(fname)
-    if yml is None:
-        return None
-    return yml["unit"] if "unit" in yml else None
+    if index_enabled():
+        return indexed_header_unit(fname)
+    return read_header_fields(fname, ["unit"]).get("unit")
+
+
+def scrape_header_units(fnames):
+    """Header ``unit`` of each file in *fnames*, in one index query when enabled."""
+    fnames = list(fnames)
+    if index_enabled():
+        return indexed_header_units(fnames)
+    return [scrape_header_metadata(fname) for fname in fnames]
 
 
 def _inventory_files(root):
-    return glob.glob(os.path.join(root, "*_*.rdb")) + glob.glob(
+    return index_glob(os.path.join(root, "*_*.rdb")) + index_glob(
         os.path.join(root, "*_*.csv")
     )
 
 
 def _parse_inventory_meta(allfiles, repo_cfg=None):
-    return [interpret_fname(fname, repo_cfg=repo_cfg) for fname in allfiles]
+    if index_enabled():
+        return indexed_fname_meta(allfiles, repo_cfg=repo_cfg)
+    return interpret_fnames(allfiles, repo_cfg=repo_cfg)
 
 
 def series_id_from_meta(meta, repo_cfg=None, remove_provider=False):
@@ -206,9 +221,8 @@ def repo_data_inventory(repo=None, *, repo_cfg=None, in_path=None, registry=None
     )
 
     if "year" in metadf.columns and "syear" not in metadf.columns:
-        metastat["unit"] = metastat.apply(
-            lambda x: scrape_header_metadata(os.path.join(root, x.original_filename)),
-            axis=1,
+        metastat["unit"] = scrape_header_units(
+            os.path.join(root, f) for f in metastat.original_filename
         )
     else:
         metastat["unit"] = None
@@ -313,9 +327,8 @@ def repo_file_inventory(repo=None, *, repo_cfg=None, in_path=None):
     )
 
     if "year" in metadf.columns and "syear" not in metadf.columns:
-        metastat["unit"] = metastat.apply(
-            lambda x: scrape_header_metadata(os.path.join(root, x.original_filename)),
-            axis=1,
+        metastat["unit"] = scrape_header_units(
+            os.path.join(root, f) for f in metastat.original_filename
         )
     else:
         metastat["unit"] = None
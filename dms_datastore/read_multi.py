@@ -14,12 +14,15 @@ processed.  :func:`read_ts_repo` targets the ``"screened"`` tier by default.
 
 import os
 import glob
+import fnmatch
 import logging
+import concurrent.futures
 import pandas as pd
 
-from dms_datastore.read_ts import read_ts, read_yaml_header
+from dms_datastore.read_ts import read_ts, read_yaml_header, read_header_fields
 from dms_datastore import dstore_config
-from dms_datastore.filename import build_repo_globs, interpret_fname
+from dms_datastore.filename import build_repo_globs, interpret_fname, shard_year_span
+from dms_datastore.repo_index import index_enabled, index_glob
 from vtools.functions.merge import ts_merge, ts_splice
 from vtools.functions.unit_conversions import *
 from vtools.data.vtime import compare_interval, to_timedelta
@@ -27,7 +30,13 @@ from decimal import Decimal, InvalidOperation
 
 logger = logging.getLogger(__name__)
 
-__all__ = ["read_ts_repo", "ts_multifile_read", "resolve_providers_for_repo"]
+__all__ = [
+    "read_ts_repo",
+    "read_ts_repo_many",
+    "iter_ts_repo",
+    "ts_multifile_read",
+    "resolve_providers_for_repo",
+]
 
 
 def infer_source_priority(station_id):
@@ -164,6 +173,8 @@ def read_ts_repo(
     data_path=None,
     freq_resolver=None,
     dtypes=None,
+    max_workers=None,
+    executor=None,
 ):
     """Read time series data from a configured repository by station and variable.
 
@@ -236,6 +247,12 @@ def read_ts_repo(
         categorical/string columns such as gate-mode ops logs that have no
         header ``dtypes``).  A dict (e.g. ``{"gate_1": "str"}``) overrides
         specific columns and lets pandas infer the rest.
+    max_workers : int or None, optional
+        Number of workers used to read shards concurrently.  See
+        :func:`ts_multifile`.  Default ``None`` reads serially.
+    executor : None or "thread" or "process" or concurrent.futures.Executor, optional
+        Pool type or existing executor for concurrent shard reads.  See
+        :func:`ts_multifile`.
 
     Returns
     -------
@@ -283,13 +300,35 @@ def read_ts_repo(
     start = pd.to_datetime(start) if start is not None else None
     end = pd.to_datetime(end) if end is not None else None
 
+    rel_pats = _repo_series_globs(
+        repo_cfg, station_id, variable, subloc, modifier, provider_priority
+    )
+    pats = [os.path.join(repository, p) for p in rel_pats]
+
+    retval = ts_multifile(
+        pats,
+        meta=meta,
+        start=start,
+        end=end,
+        force_regular=force_regular,
+        repo=repo_cfg.get("name"),
+        freq_resolver=freq_resolver,
+        dtypes=dtypes,
+        max_workers=max_workers,
+        executor=executor,
+    )
+    return retval
+
+
+def _repo_series_globs(repo_cfg, station_id, variable, subloc, modifier, provider_priority):
+    """Relative file-name globs for one series, after provider resolution."""
     providers = resolve_providers_for_repo(
         station_id,
         repo_cfg,
         provider_priority=provider_priority,
     )
 
-    rel_pats = build_repo_globs(
+    return build_repo_globs(
         repo_cfg,
         key=station_id,
         param=variable,
@@ -301,11 +340,155 @@ def read_ts_repo(
         syear="*",
         eyear="*",
     )
-    pats = [os.path.join(repository, p) for p in rel_pats]
 
-    retval = ts_multifile(
-        pats,
-        meta=meta,
+
+def _normalize_series_request(req):
+    """Coerce one :func:`read_ts_repo_many` request to a dict of read_ts_repo args."""
+    if isinstance(req, dict):
+        out = dict(req)
+    else:
+        req = tuple(req)
+        if len(req) not in (2, 3):
+            raise ValueError(
+                f"Request {req!r} must be (station_id, variable) or "
+                "(station_id, variable, subloc)"
+            )
+        out = dict(zip(("station_id", "variable", "subloc"), req))
+    unknown = set(out) - {"station_id", "variable", "subloc", "modifier", "provider_priority"}
+    if unknown:
+        raise ValueError(f"Unsupported request fields {sorted(unknown)} in {req!r}")
+    station_id = out["station_id"]
+    subloc = out.get("subloc")
+    if "@" in station_id:
+        if subloc is not None:
+            raise ValueError("@ short hand and subloc are mutually exclusive")
+        station_id, subloc = station_id.split("@", 1)
+    if subloc == "default":
+        subloc = None
+    out["station_id"] = station_id
+    out["subloc"] = subloc
+    out.setdefault("modifier", None)
+    out.setdefault("provider_priority", "infer")
+    return out
+
+
+def _raw_request_label(req):
+    """Best-effort ``(station_id, subloc, variable)`` of a request that may not parse."""
+    if isinstance(req, dict):
+        return (req.get("station_id"), req.get("subloc"), req.get("variable"))
+    try:
+        parts = tuple(req)
+    except TypeError:
+        return (repr(req), None, None)
+    return tuple(parts[i] if len(parts) > i else None for i in (0, 2, 1))
+
+
+def _listed_files(pattern, listings):
+    """Sorted matches for *pattern*, listing each directory only once."""
+    dirname, basepat = os.path.split(pattern)
+    if index_enabled() or glob.has_magic(dirname):
+        return index_glob(pattern)
+    if dirname not in listings:
+        try:
+            listings[dirname] = [
+                n for n in os.listdir(dirname or ".") if not n.startswith(".")
+            ]
+        except FileNotFoundError:
+            listings[dirname] = []
+    return sorted(
+        os.path.join(dirname, n) for n in fnmatch.filter(listings[dirname], basepat)
+    )
+
+
+def read_ts_repo_many(
+    requests,
+    repo=None,
+    start=None,
+    end=None,
+    force_regular=True,
+    data_path=None,
+    freq_resolver=None,
+    dtypes=None,
+    wide=False,
+    max_workers=None,
+    executor=None,
+):
+    """Read many series from one repository in a single batch.
+
+    The repo config is resolved and the repository directory listed once for
+    the whole batch; each request is then matched against that listing
+    instead of globbing the share again. Series are read on a shared pool
+    when *max_workers* > 1. A failure reading one series is recorded and does
+    not abort the batch.
+
+    Parameters
+    ----------
+    requests : iterable
+        Items of the form ``(station_id, variable)``,
+        ``(station_id, variable, subloc)`` or dicts with keys
+        ``station_id``, ``variable`` and optionally ``subloc``, ``modifier``
+        and ``provider_priority``. ``station@subloc`` short hand is accepted.
+    repo : str or None, optional
+        Repository name as in :func:`read_ts_repo`.
+    start, end : str or pandas.Timestamp or None, optional
+        Inclusive time window applied to every series.
+    force_regular, data_path, freq_resolver, dtypes
+        As in :func:`read_ts_repo`.
+    wide : bool, optional
+        If ``True``, return the series as one DataFrame whose columns are a
+        ``(station_id, subloc, variable)`` MultiIndex (an extra inner level
+        is kept if any series has more than one column). Default ``False``
+        returns a dict.
+    max_workers : int or None, optional
+        Number of series read concurrently.  ``None`` (default) reads serially.
+    executor : None or "thread" or "process" or concurrent.futures.Executor, optional
+        Pool type or existing executor, as in :func:`ts_multifile`.
+
+    Returns
+    -------
+    results : dict or pandas.DataFrame
+        Mapping ``(station_id, subloc, variable) -> DataFrame`` in request
+        order, or the wide frame. Series with no files are omitted.
+    errors : dict
+        Mapping ``(station_id, subloc, variable) -> Exception`` for series
+        that could not be read.
+
+    See Also
+    --------
+    read_ts_repo : Single-series accessor.
+    """
+    if repo is None:
+        repo = dstore_config.config.get("default_repo", "screened")
+    repo_cfg = dstore_config.repo_config(repo)
+    repository = data_path if data_path is not None else repo_cfg["root"]
+
+    listings = {}
+    jobs = []
+    errors = {}
+    for req in requests:
+        label = _raw_request_label(req)
+        try:
+            req = _normalize_series_request(req)
+            label = (req["station_id"], req["subloc"], req["variable"])
+            rel_pats = _repo_series_globs(
+                repo_cfg,
+                req["station_id"],
+                req["variable"],
+                req["subloc"],
+                req["modifier"],
+                req["provider_priority"],
+            )
+            pat_files = []
+            for p in rel_pats:
+                fp = os.path.join(repository, p)
+                pat_files.append((fp, _listed_files(fp, listings)))
+        except Exception as e:
+            logger.warning("read_ts_repo_many: could not resolve %s: %s", label, e)
+            errors[label] = e
+            continue
+        jobs.append((label, pat_files))
+
+    read_kwargs = dict(
         start=start,
         end=end,
         force_regular=force_regular,
@@ -313,7 +496,281 @@ def read_ts_repo(
         freq_resolver=freq_resolver,
         dtypes=dtypes,
     )
-    return retval
+    pool, owned = _make_executor(max_workers, executor)
+    outcomes = []
+    try:
+        if pool is None:
+            for label, pat_files in jobs:
+                outcomes.append((label, _read_series_outcome(pat_files, read_kwargs)))
+        else:
+            futures = [
+                (label, pool.submit(_read_series_outcome, pat_files, read_kwargs))
+                for label, pat_files in jobs
+            ]
+            outcomes = [(label, fut.result()) for label, fut in futures]
+    finally:
+        if owned:
+            pool.shutdown(wait=True)
+
+    results = {}
+    for label, (ts, err) in outcomes:
+        if err is not None:
+            logger.warning("read_ts_repo_many: failed to read %s: %s", label, err)
+            errors[label] = err
+        elif ts is not None:
+            results[label] = ts
+
+    if wide:
+        results = _wide_frame(results)
+    return results, errors
+
+
+def _read_series_outcome(pat_files, read_kwargs):
+    """Read one series for :func:`read_ts_repo_many`, returning ``(ts, error)``."""
+    try:
+        return _ts_multifile_files(pat_files, **read_kwargs), None
+    except Exception as e:
+        return None, e
+
+
+def _wide_frame(results):
+    names = ["station_id", "subloc", "variable"]
+    if not results:
+        return pd.DataFrame(columns=pd.MultiIndex.from_tuples([], names=names))
+    univariate = all(ts.shape[1] == 1 for ts in results.values())
+    if univariate:
+        cols = {label: ts.iloc[:, 0] for label, ts in results.items()}
+        out = pd.concat(cols, axis=1)
+        out.columns = pd.MultiIndex.from_tuples(list(cols), names=names)
+        return out
+    out = pd.concat(results, axis=1)
+    out.columns.names = names + [None]
+    return out
+
+
+def iter_ts_repo(
+    station_id,
+    variable,
+    subloc=None,
+    repo=None,
+    provider_priority="infer",
+    start=None,
+    end=None,
+    chunk="Y",
+    rows=None,
+    force_regular=True,
+    modifier=None,
+    data_path=None,
+    freq_resolver=None,
+    dtypes=None,
+):
+    """Iterate over a repository series in time order, one chunk at a time.
+
+    Files are resolved exactly as in :func:`read_ts_repo`, but instead of
+    materializing the whole history the series is assembled one calendar
+    window at a time. Only the shards overlapping the current window are
+    held in memory; a shard is released once the window has moved past the
+    last year in its file name.
+
+    Parameters
+    ----------
+    station_id, variable, subloc, repo, provider_priority, modifier, data_path
+        As in :func:`read_ts_repo`.
+    start, end : str or pandas.Timestamp or None, optional
+        Inclusive bounds of the iteration.
+    chunk : str, optional
+        Pandas period alias for the window size, e.g. ``"Y"`` (default),
+        ``"Q"``, ``"M"``. Ignored for splitting when *rows* is given, but
+        still the unit in which shards are loaded.
+    rows : int or None, optional
+        If given, yield chunks of exactly this many rows (the last may be
+        shorter) regardless of calendar boundaries.
+    force_regular, freq_resolver, dtypes
+        As in :func:`read_ts_repo`.
+
+    Yields
+    ------
+    pandas.DataFrame
+        Consecutive, non-overlapping pieces of the series with units
+        converted as :func:`read_ts_repo` would. Empty windows are skipped.
+
+    Notes
+    -----
+    Shard merging and splicing across providers are applied per window, so
+    a provider transition is resolved within each chunk rather than over the
+    whole record.
+
+    Examples
+    --------
+    >>> for ts in iter_ts_repo("sac", "flow", chunk="Y"):
+    ...     write_boundary(ts)
+    """
+    if rows is not None and rows < 1:
+        raise ValueError("rows must be >= 1")
+    if repo is None:
+        repo = dstore_config.config.get("default_repo", "screened")
+
+    if subloc is not None:
+        if "@" in station_id:
+            raise ValueError("@ short hand and subloc are mutually exclusive")
+        if subloc != "default":
+            station_id = f"{station_id}@{subloc}"
+
+    repo_cfg = dstore_config.repo_config(repo)
+    repository = data_path if data_path is not None else repo_cfg["root"]
+    start = pd.to_datetime(start) if start is not None else None
+    end = pd.to_datetime(end) if end is not None else None
+
+    rel_pats = _repo_series_globs(
+        repo_cfg, station_id, variable, subloc, modifier, provider_priority
+    )
+    pieces = _iter_pattern_windows(
+        [(fp, index_glob(fp)) for fp in (os.path.join(repository, p) for p in rel_pats)],
+        start=start,
+        end=end,
+        chunk=chunk,
+        force_regular=force_regular,
+        repo=repo_cfg.get("name"),
+        freq_resolver=freq_resolver,
+        dtypes=dtypes,
+    )
+    if rows is None:
+        yield from pieces
+        return
+
+    buffer = []
+    nbuf = 0
+    for piece in pieces:
+        buffer.append(piece)
+        nbuf += len(piece)
+        if nbuf < rows:
+            continue
+        joined = pd.concat(buffer) if len(buffer) > 1 else buffer[0]
+        nfull = (len(joined) // rows) * rows
+        for i in range(0, nfull, rows):
+            yield joined.iloc[i : i + rows]
+        rest = joined.iloc[nfull:]
+        buffer = [rest] if len(rest) else []
+        nbuf = len(rest)
+    if nbuf:
+        yield pd.concat(buffer) if len(buffer) > 1 else buffer[0]
+
+
+def _shard_years(path, repo):
+    """Inclusive ``(first, last)`` year of a shard from its name, None if unknown."""
+    span = shard_year_span(path)
+    if span is not None:
+        return span
+    metafname = interpret_fname(os.path.basename(path), repo=repo)
+    if "year" in metafname:
+        yr = int(metafname["year"])
+        return yr, yr
+    return None
+
+
+def _iter_pattern_windows(
+    pat_files,
+    start=None,
+    end=None,
+    chunk="Y",
+    force_regular=True,
+    repo=None,
+    freq_resolver=None,
+    dtypes=None,
+):
+    """Yield the merged/spliced series of *pat_files* one period window at a time."""
+    pat_files = [(fp, files) for fp, files in pat_files if files]
+    if not pat_files:
+        logger.warning("No files found for any of the patterns")
+        return
+
+    transforms = {}
+    spans = {}
+    for fp, files in pat_files:
+        transforms[fp] = detect_dms_unit(files[0])[1]
+        for f in files:
+            spans[f] = _shard_years(f, repo)
+
+    known = [sp for sp in spans.values() if sp is not None]
+    unbounded = len(known) < len(spans)
+    lo_year = min(sp[0] for sp in known) if known else None
+    hi_year = max(sp[1] for sp in known) if known else None
+    if hi_year == 9999:
+        hi_year = pd.Timestamp.now().year
+    if start is not None:
+        lo_year = start.year if lo_year is None else max(lo_year, start.year)
+    if end is not None:
+        hi_year = end.year if hi_year is None else min(hi_year, end.year)
+
+    held = {}  # path -> shard item, only while it overlaps upcoming windows
+    if unbounded or lo_year is None or hi_year is None:
+        # Some shard carries no year: its extent is only known after reading,
+        # so read everything once and then window over the result.
+        for fp, files in pat_files:
+            for f in files:
+                held[f] = _read_one_shard(f, transforms[fp], force_regular, dtypes, None, None)
+        indexes = [item["ts"].index for item in held.values() if len(item["ts"])]
+        if not indexes:
+            return
+        first = min(idx[0] for idx in indexes)
+        last = max(idx[-1] for idx in indexes)
+        wstart = first if start is None else max(first, start)
+        wend = last if end is None else min(last, end)
+        if wstart > wend:
+            return
+    else:
+        if lo_year > hi_year:
+            return
+        wstart = pd.Timestamp(year=lo_year, month=1, day=1)
+        wend = pd.Timestamp(year=hi_year + 1, month=1, day=1) - pd.Timedelta(1, "ns")
+        if start is not None:
+            wstart = max(wstart, start)
+        if end is not None:
+            wend = min(wend, end)
+
+    for period in pd.period_range(wstart, wend, freq=chunk):
+        w0 = max(period.start_time, wstart)
+        w1 = min(period.end_time, wend)
+        for f in [f for f in held if spans[f] is not None and spans[f][1] < w0.year]:
+            del held[f]
+
+        pattern_series = []
+        for fp, files in pat_files:
+            items = []
+            for f in files:
+                sp = spans[f]
+                if sp is not None and (sp[1] < w0.year or sp[0] > w1.year):
+                    continue
+                if f not in held:
+                    held[f] = _read_one_shard(f, transforms[fp], force_regular, dtypes, None, None)
+                piece = held[f]["ts"].loc[w0:w1]
+                if len(piece):
+                    items.append(
+                        {"path": f, "ts": piece, "freq_label": _series_freq_label(held[f]["ts"])}
+                    )
+            if not items:
+                continue
+            items, _ = _apply_freq_resolution(items, freq_resolver)
+            if len(items) == 1:
+                pattern_series.append(items[0]["ts"])
+            else:
+                _assert_non_overlapping_shards(items, fp)
+                pattern_series.append(ts_merge(list(reversed([item["ts"] for item in items]))))
+
+        if not pattern_series:
+            continue
+        if len(pattern_series) == 1:
+            out = pattern_series[0]
+        else:
+            pattern_items = [
+                {"path": f"<pattern_{i}>", "ts": ts, "freq_label": _series_freq_label(ts)}
+                for i, ts in enumerate(pattern_series)
+            ]
+            pattern_items, _ = _apply_freq_resolution(pattern_items, freq_resolver)
+            out = ts_splice([item["ts"] for item in pattern_items], transition="prefer_first")
+        out = out.loc[w0:w1]
+        if len(out):
+            yield out
 
 
 def detect_dms_unit(fname):
@@ -333,8 +790,7 @@ def detect_dms_unit(fname):
         A function ``f(DataFrame) -> DataFrame`` to convert the data to the
         canonical unit, or ``None`` if no conversion is needed.
     """
-    meta = read_yaml_header(fname)
-    unit = meta["unit"] if "unit" in meta else None
+    unit = read_header_fields(fname, ["unit"]).get("unit")
     if unit in ["FNU", "NTU"]:
         return "FNU", None
     elif unit in ["uS/cm", "microS/cm"]:
@@ -812,6 +1268,111 @@ def _apply_freq_resolution(ordered_items, freq_resolver):
 
 
 
+def _read_one_shard(tsfile, transform, force_regular, dtypes, selector, column_names):
+    """Read one shard for :func:`ts_multifile` and return its item dict.
+
+    Module-level so it can be shipped to a process pool.
+    """
+    ts = read_ts(tsfile, force_regular=force_regular, dtypes=dtypes)
+
+    dup_mask = ts.index.duplicated(keep=False)
+    if dup_mask.any():
+        dup_index = ts.index[dup_mask]
+        unique_dups = dup_index.unique()
+
+        first = unique_dups[0]
+        last = unique_dups[-1]
+
+        example_first = ts.loc[first]
+        example_last = ts.loc[last]
+
+        raise ValueError(
+            f"Duplicate index detected in file {tsfile}\n"
+            f"Duplicate timestamps: {len(unique_dups)} "
+            f"(total duplicate rows: {dup_mask.sum()})\n"
+            f"First duplicate: {first}\n"
+            f"Last duplicate: {last}\n\n"
+            f"Example at first duplicate:\n{example_first}\n\n"
+            f"Example at last duplicate:\n{example_last}"
+        )
+
+    if ts.shape[1] > 1:
+        if selector is not None:
+            ts = ts[selector].to_frame()
+
+    if column_names is not None:
+        if isinstance(column_names, str):
+            cols = [column_names]
+        else:
+            cols = list(column_names)
+        ts.columns = cols
+
+    # possibly apply unit transition
+    ts = ts if transform is None else transform(ts)
+
+    return {
+        "path": tsfile,
+        "ts": ts,
+        "freq_label": _series_freq_label(ts),
+    }
+
+
+def _make_executor(max_workers, executor):
+    """Return ``(executor, owned)`` for the ``max_workers``/``executor`` options.
+
+    ``executor`` may be an existing :class:`concurrent.futures.Executor`
+    (used as is and left open), ``"thread"`` or ``"process"``. Returns
+    ``(None, False)`` when reads should stay serial.
+    """
+    if isinstance(executor, concurrent.futures.Executor):
+        return executor, False
+    if executor not in (None, "thread", "process"):
+        raise ValueError("executor must be None, 'thread', 'process' or an Executor")
+    if max_workers is None or max_workers <= 1:
+        if max_workers is not None and max_workers < 1:
+            raise ValueError("max_workers must be >= 1")
+        return None, False
+    if executor == "process":
+        return concurrent.futures.ProcessPoolExecutor(max_workers=max_workers), True
+    return concurrent.futures.ThreadPoolExecutor(max_workers=max_workers), True
+
+
+def _read_shards(
+    jobs,
+    force_regular=True,
+    dtypes=None,
+    selector=None,
+    column_names=None,
+    max_workers=None,
+    executor=None,
+):
+    """Read ``(tag, path, transform)`` jobs, returning ``(tag, item)`` in job order.
+
+    With a pool the shards are read concurrently but results (and the first
+    error, in job order) are collected exactly as a serial loop would see them.
+    """
+    args = (force_regular, dtypes, selector, column_names)
+    pool, owned = _make_executor(max_workers, executor)
+    if pool is None or len(jobs) <= 1:
+        return [
+            (tag, _read_one_shard(tsfile, transform, *args))
+            for tag, tsfile, transform in jobs
+        ]
+    futures = [
+        pool.submit(_read_one_shard, tsfile, transform, *args)
+        for _, tsfile, transform in jobs
+    ]
+    try:
+        return [(job[0], fut.result()) for job, fut in zip(jobs, futures)]
+    except Exception:
+        for fut in futures:
+            fut.cancel()
+        raise
+    finally:
+        if owned:
+            pool.shutdown(wait=True)
+
+
 def ts_multifile(
     pats,
     selector=None,
@@ -823,6 +1384,8 @@ def ts_multifile(
     repo=None,
     freq_resolver=None,
     dtypes=None,
+    max_workers=None,
+    executor=None,
 ):
     """
     Read and merge/splice multiple time series files based on provided patterns.
@@ -848,6 +1411,14 @@ def ts_multifile(
         dms1/CSV reader.  ``None`` (default) uses header-declared dtypes or
         coerces value columns to float; ``"infer"`` lets pandas infer all
         column dtypes; a dict overrides specific columns.
+    max_workers : int or None, optional
+        Read shards concurrently on a pool of this many workers.  ``None``
+        (default) or 1 reads serially.  Merge order and errors are the same
+        either way.
+    executor : None or "thread" or "process" or concurrent.futures.Executor, optional
+        Pool type used when *max_workers* > 1 (threads by default), or an
+        existing executor to submit shard reads to.  A caller-supplied
+        executor is not shut down.
 
     Returns
     -------
@@ -855,19 +1426,80 @@ def ts_multifile(
         Merged time series data, or a tuple of metadata and data if meta=True.
     """
 
-    start = pd.to_datetime(start) if start is not None else None
-    end = pd.to_datetime(end) if end is not None else None
-
     if not (isinstance(pats, list)):
         pats = [pats]
 
-    pats_in = list(pats)  # keep original patterns for diagnostics
+    return _ts_multifile_files(
+        [(fp, index_glob(fp)) for fp in pats],
+        selector=selector,
+        column_names=column_names,
+        start=start,
+        end=end,
+        meta=meta,
+        force_regular=force_regular,
+        repo=repo,
+        freq_resolver=freq_resolver,
+        dtypes=dtypes,
+        max_workers=max_workers,
+        executor=executor,
+    )
+
+
+def _assert_non_overlapping_shards(pattern_items, pattern):
+    """Fail fast when shards for one pattern overlap in valid-data time."""
+    windows = []
+    for item in pattern_items:
+        ts = item["ts"]
+        lo = ts.first_valid_index()
+        hi = ts.last_valid_index()
+        if lo is None or hi is None:
+            continue
+        windows.append((lo, hi, item["path"]))
+
+    windows.sort(key=lambda row: row[0])
+
+    for i in range(len(windows) - 1):
+        lo0, hi0, path0 = windows[i]
+        lo1, hi1, path1 = windows[i + 1]
+        if lo1 <= hi0:
+            raise ValueError(
+                "Overlapping shard windows detected for pattern "
+                f"{pattern}:\n"
+                f"  {path0}: [{lo0}, {hi0}]\n"
+                f"  {path1}: [{lo1}, {hi1}]\n"
+                "Shards in read_ts_repo are expected to be non-overlapping."
+            )
+
+
+def _ts_multifile_files(
+    pat_files,
+    selector=None,
+    column_names=None,
+    start=None,
+    end=None,
+    meta=False,
+    force_regular=True,
+    repo=None,
+    freq_resolver=None,
+    dtypes=None,
+    max_workers=None,
+    executor=None,
+):
+    """Body of :func:`ts_multifile` given ``(pattern, sorted_files)`` pairs.
+
+    Split out so that callers which have already listed the repository
+    (:func:`read_ts_repo_many`) do not glob again.
+    """
+    start = pd.to_datetime(start) if start is not None else None
+    end = pd.to_datetime(end) if end is not None else None
+
+    pats_in = [fp for fp, _ in pat_files]  # keep original patterns for diagnostics
+    files_for = dict(pat_files)
     units = []
     metas = []
     some_files = False
     pats_revised = []  # for culling empty patterns
-    for fp in pats:
-        tsfiles = sorted(glob.glob(fp))
+    for fp, tsfiles in pat_files:
         if len(tsfiles) == 0:
             logger.debug("No files for pattern %s", fp)
             continue
@@ -876,9 +1508,10 @@ def ts_multifile(
         # assume consistency within each pattern
         unit, transform = detect_dms_unit(tsfiles[0])
         units.append((unit, transform))
-        example_header = read_yaml_header(tsfiles[0])
-        example_header["unit"] = unit
-        metas.append(example_header)
+        if meta:
+            example_header = read_yaml_header(tsfiles[0])
+            example_header["unit"] = unit
+            metas.append(example_header)
         some_files = True
     pats = pats_revised
     if not some_files:
@@ -888,86 +1521,31 @@ def ts_multifile(
 
     bigts = []  # list of merged time series, one per pattern
 
-    def _assert_non_overlapping_shards(pattern_items, pattern):
-        """Fail fast when shards for one pattern overlap in valid-data time."""
-        windows = []
-        for item in pattern_items:
-            ts = item["ts"]
-            lo = ts.first_valid_index()
-            hi = ts.last_valid_index()
-            if lo is None or hi is None:
-                continue
-            windows.append((lo, hi, item["path"]))
-
-        windows.sort(key=lambda row: row[0])
-
-        for i in range(len(windows) - 1):
-            lo0, hi0, path0 = windows[i]
-            lo1, hi1, path1 = windows[i + 1]
-            if lo1 <= hi0:
-                raise ValueError(
-                    "Overlapping shard windows detected for pattern "
-                    f"{pattern}:\n"
-                    f"  {path0}: [{lo0}, {hi0}]\n"
-                    f"  {path1}: [{lo1}, {hi1}]\n"
-                    "Shards in read_ts_repo are expected to be non-overlapping."
-                )
-
-    for fp, utrans in zip(pats, units):  # loop through patterns
-        items = []
-        tsfiles = sorted(glob.glob(fp))
+    # Gather the shards to read for every pattern up front so they can be
+    # read concurrently; results are consumed in this same order.
+    shard_jobs = []
+    for ipat, (fp, utrans) in enumerate(zip(pats, units)):
+        tsfiles = files_for[fp]
         unit, transform = utrans
-
         for tsfile in tsfiles:  # loop through files in pattern
             # read one by one, not by pattern/wildcard
             metafname = interpret_fname(os.path.basename(tsfile), repo=repo)
             if filter_date(metafname, start, end):
                 continue
+            shard_jobs.append((ipat, tsfile, transform))
 
-            ts = read_ts(tsfile, force_regular=force_regular, dtypes=dtypes)
-
-            dup_mask = ts.index.duplicated(keep=False)
-            if dup_mask.any():
-                dup_index = ts.index[dup_mask]
-                unique_dups = dup_index.unique()
-
-                first = unique_dups[0]
-                last = unique_dups[-1]
-
-                example_first = ts.loc[first]
-                example_last = ts.loc[last]
-
-                raise ValueError(
-                    f"Duplicate index detected in file {tsfile}\n"
-                    f"Duplicate timestamps: {len(unique_dups)} "
-                    f"(total duplicate rows: {dup_mask.sum()})\n"
-                    f"First duplicate: {first}\n"
-                    f"Last duplicate: {last}\n\n"
-                    f"Example at first duplicate:\n{example_first}\n\n"
-                    f"Example at last duplicate:\n{example_last}"
-                )
-
-            if ts.shape[1] > 1:
-                if selector is not None:
-                    ts = ts[selector].to_frame()
+    shard_items = _read_shards(
+        shard_jobs,
+        force_regular=force_regular,
+        dtypes=dtypes,
+        selector=selector,
+        column_names=column_names,
+        max_workers=max_workers,
+        executor=executor,
+    )
 
-            if column_names is not None:
-                if isinstance(column_names, str):
-                    cols = [column_names]
-                else:
-                    cols = list(column_names)
-                ts.columns = cols
-
-            # possibly apply unit transition
-            ts = ts if transform is None else transform(ts)
-
-            items.append(
-                {
-                    "path": tsfile,
-                    "ts": ts,
-                    "freq_label": _series_freq_label(ts),
-                }
-            )
+    for ipat, fp in enumerate(pats):  # loop through patterns
+        items = [item for jpat, item in shard_items if jpat == ipat]
 
         if len(items) == 0:
             print(f"No series for subpattern: {fp}")
@@ -1090,7 +1668,7 @@ def ts_multifile_read(
 
     tss = []
     for fp, trans in zip(pats, transforms):
-        tsfiles = sorted(glob.glob(fp))
+        tsfiles = index_glob(fp)
         for tsfile in tsfiles:
             ts = read_ts(tsfile)
 
@@ -9,7 +9,10 @@ import warnings  # temporary?
 import inspect
 from collections import defaultdict
 import os
+import io
+import functools
 import fnmatch
+import copy
 from os.path import split as opsplit
 from os import PathLike
 from vtools.data.indexing import infer_freq_robust
@@ -17,17 +20,20 @@ from vtools.data.indexing import infer_freq_robust
 from vtools.functions.merge import *
 from vtools.data.duplicate_index import inspect_duplicate_index
 from vtools.data.vtime import days, minutes, hours, months, seconds, years, to_timedelta
-from dms_datastore.filename import extract_year_fname
+from dms_datastore.filename import shard_year_span
+from dms_datastore import sidecar
 import logging
 logger = logging.getLogger(__name__)
 
 __all__ = [
     "extract_commented_header",
     "read_yaml_header",
+    "read_header_fields",
     "parse_yaml_header",
     "read_ts",
     "read_vtide",
-    "read_flagged"
+    "read_flagged",
+    "detected_reader",
 ]
 
 
@@ -79,27 +85,18 @@ def read_flagged(
 
     if len(matches) == 0:
         raise IOError("No matches found for pattern: {}".format(fpat))
-    if start is None:
-        startyr = -9999
-    else:
+    if start is not None:
         start = pd.to_datetime(start)
-        startyr = start.year
-    if end is None:
-        endyr = 9999
-    else:
+    if end is not None:
         end = pd.to_datetime(end)
-        endyr = end.year
 
-    matches = [
-        m
-        for m in matches
-        if extract_year_fname(m) >= startyr and extract_year_fname(m) <= endyr
-    ]
+    matches = _prune_shards_to_window(matches, start, end)
     dfs = []
     for m in matches:
+        src, _ = _window_source(m, start, end)
         dfs.append(
             pd.read_csv(
-                m,
+                src,
                 sep=",",
                 comment="#",
                 index_col=0,
@@ -119,6 +116,74 @@ def read_flagged(
         return df.loc[start:end]
 
 
+# Format predicates (is_dms1, is_usgs1, ...) only look at the top of a file.
+# The head is read once per (path, mtime, size) and kept in a small cache, so
+# the chain of predicates tried by read_ts does not reopen the file. What was
+# learned about the file (the reader that succeeded, its header dtypes) is
+# small and kept for many more files, so repeated reads of the same shard in a
+# session go straight to the right reader.
+_SNIFF_BYTES = 1 << 17
+_HEAD_CACHE_SIZE = 16
+_SNIFF_CACHE_SIZE = 4096
+
+
+def _file_key(fname):
+    st = os.stat(fname)
+    return os.path.abspath(str(fname)), st.st_mtime_ns, st.st_size
+
+
+@functools.lru_cache(maxsize=_HEAD_CACHE_SIZE)
+def _read_head(path, mtime_ns, size):
+    """Decoded head of *path*. The mtime and size only key the cache."""
+    with open(path, "rb") as f:
+        head = f.read(_SNIFF_BYTES)
+    if size > len(head):
+        # Drop the trailing partial line so predicates never see a fragment
+        head = head[: head.rfind(b"\n") + 1]
+    return head.decode("utf-8", errors="replace")
+
+
+@functools.lru_cache(maxsize=_SNIFF_CACHE_SIZE)
+def _sniff_record(path, mtime_ns, size):
+    """Detection record of *path*. The mtime and size only key the cache.
+
+    The returned dict carries the name of the reader that succeeded on this
+    file and its header dtypes, filled in lazily by read_ts/read_dms1.
+    """
+    return {"reader": None, "dtypes": None, "dtypes_known": False}
+
+
+def _sniff(fname):
+    return _sniff_record(*_file_key(fname))
+
+
+def _open_head(fname):
+    """Text stream over the memoized head of *fname*, usable in place of open()."""
+    return io.StringIO(_read_head(*_file_key(fname)))
+
+
+def detected_reader(fpath):
+    """Name of the reader that last read *fpath* successfully, if known.
+
+    The value can be passed to ``read_ts`` as ``hint``. ``read_ts`` already
+    consults it, so this is mainly informative.
+
+    Parameters
+    ----------
+    fpath : str
+        Path to a single file (not a pattern)
+
+    Returns
+    -------
+    str or None
+        Reader function name such as ``'read_dms1'``, or None if the file has
+        not been read in this session, was modified since, or is not a file.
+    """
+    if not os.path.isfile(fpath):
+        return None
+    return _sniff(fpath)["reader"]
+
+
 def extract_commented_header(fpath, comment="#"):
     """Scrapes the header from a file assuming all the lines at the top are the header
 
@@ -260,6 +325,131 @@ def parse_yaml_header(text, comment="#", strict_indent=True):
     return data
 
 
+# Parsed headers are memoized per (path, mtime, size). The header is also
+# split into its top-level YAML blocks so that callers needing a few keys
+# (unit, format, dtypes) parse only those blocks and never the whole header,
+# which for USGS files carries a large original_header.
+_HEADER_CACHE_SIZE = 1024
+_TOP_KEY_RE = re.compile(r"^([A-Za-z_][\w.\-]*)\s*:(?:\s|$)")
+_MISSING = object()
+
+
+@functools.lru_cache(maxsize=_HEADER_CACHE_SIZE)
+def _header_record(path, mtime_ns, size):
+    """Header text of *path*. The mtime and size only key the cache."""
+    return {
+        "text": extract_commented_header(path),
+        "blocks": None,
+        "fields": {},
+        "full": None,
+    }
+
+
+def _header_blocks(text, comment="#"):
+    """Split a canonical commented header into top-level YAML blocks.
+
+    Returns None if the header is not in the canonical form, in which case
+    callers fall back to a full parse.
+    """
+    blocks = {}
+    key = None
+    prefix = f"{comment} "
+    for line in text.splitlines():
+        if line.startswith(prefix):
+            body = line[len(prefix):]
+        elif line.strip() == comment:
+            body = ""
+        else:
+            return None
+        m = _TOP_KEY_RE.match(body)
+        if m is not None:
+            key = m.group(1)
+            blocks[key] = [body]
+        elif not body.strip() or body[0] in " -#":
+            if key is not None:
+                blocks[key].append(body)
+        else:
+            return None
+    return {k: "\n".join(v) for k, v in blocks.items()}
+
+
+def _full_header(record, fpath):
+    if record["full"] is None:
+        header = record["text"]
+        if not header.strip():
+            raise ValueError(
+                f"File {fpath} has no commented YAML front-matter header "
+                f"(expected '#'-prefixed metadata before the data rows)"
+            )
+        try:
+            record["full"] = parse_yaml_header(header)
+        except Exception as exc:
+            # Non-DMS files (e.g., USGS RDB) can have comment headers that are
+            # not valid YAML. Normalize parser failures to ValueError so callers
+            # probing for optional metadata can safely fall back.
+            raise ValueError(f"Malformed header in {fpath}: {exc}") from exc
+    return record["full"]
+
+
+def _header_field(record, fpath, key):
+    if record["full"] is not None:
+        return record["full"].get(key, _MISSING)
+    if record["blocks"] is None:
+        record["blocks"] = _header_blocks(record["text"]) or False
+    blocks = record["blocks"]
+    if blocks is not False:
+        if key not in blocks:
+            return _MISSING
+        try:
+            parsed = yaml.safe_load(blocks[key])
+        except yaml.YAMLError:
+            parsed = None
+        if isinstance(parsed, dict) and key in parsed:
+            return parsed[key]
+    return _full_header(record, fpath).get(key, _MISSING)
+
+
+def read_header_fields(fpath, keys):
+    """Read selected top-level keys from the yaml header at the top of a file
+
+    Only the YAML blocks of the requested keys are parsed, so this is much
+    cheaper than :func:`read_yaml_header` for headers with large nested
+    sections. Results are cached until the file changes.
+
+    Parameters
+    ----------
+    fpath : str
+        File with header to read
+
+    keys : list of str
+        Top-level header keys such as ``unit``, ``format`` or ``dtypes``
+
+    Returns
+    -------
+    dict
+        Values of the requested keys that are present in the header
+
+    Raises
+    ------
+    ValueError
+        If the file has no header, or a requested key can only be found by
+        parsing a header that is malformed.
+    """
+    if isinstance(keys, str):
+        keys = [keys]
+    record = _header_record(*_file_key(fpath))
+    if not record["text"].strip():
+        _full_header(record, fpath)  # raises the usual missing-header error
+    out = {}
+    for key in keys:
+        if key not in record["fields"]:
+            record["fields"][key] = _header_field(record, fpath, key)
+        value = record["fields"][key]
+        if value is not _MISSING:
+            out[key] = copy.deepcopy(value)
+    return out
+
+
 def read_yaml_header(fpath):
     """Reads yaml-based header at top of file
 
@@ -273,19 +463,8 @@ def read_yaml_header(fpath):
     Nested yaml data structure (lists and dicts)
 
     """
-    header = extract_commented_header(fpath)
-    if not header.strip():
-        raise ValueError(
-            f"File {fpath} has no commented YAML front-matter header "
-            f"(expected '#'-prefixed metadata before the data rows)"
-        )
-    try:
-        return parse_yaml_header(header)
-    except Exception as exc:
-        # Non-DMS files (e.g., USGS RDB) can have comment headers that are
-        # not valid YAML. Normalize parser failures to ValueError so callers
-        # probing for optional metadata can safely fall back.
-        raise ValueError(f"Malformed header in {fpath}: {exc}") from exc
+    record = _header_record(*_file_key(fpath))
+    return copy.deepcopy(_full_header(record, fpath))
 
 
 def _dtypes_from_header(fpath_pattern):
@@ -296,16 +475,28 @@ def _dtypes_from_header(fpath_pattern):
     float.  The first file matching *fpath_pattern* is inspected.  Returns
     ``None`` when no file matches or no ``dtypes`` mapping is present.
     """
-    matches = sorted(glob.glob(fpath_pattern))
-    if not matches:
-        return None
-    if not is_dms1(matches[0]):
+    if os.path.isfile(fpath_pattern):
+        first = fpath_pattern
+    else:
+        matches = sorted(glob.glob(fpath_pattern))
+        if not matches:
+            return None
+        first = matches[0]
+    record = _sniff(first)
+    if not record["dtypes_known"]:
+        record["dtypes"] = _parse_header_dtypes(first)
+        record["dtypes_known"] = True
+    dtypes = record["dtypes"]
+    return dict(dtypes) if dtypes else None
+
+
+def _parse_header_dtypes(fname):
+    if not is_dms1(fname):
         return None
     try:
-        meta = read_yaml_header(matches[0])
+        dtypes = read_header_fields(fname, ["dtypes"]).get("dtypes")
     except ValueError:
         return None
-    dtypes = meta.get("dtypes")
     if isinstance(dtypes, dict) and dtypes:
         return dict(dtypes)
     return None
@@ -317,7 +508,7 @@ def is_dms1_screen(fname):
         return False
     pattern = re.compile(r"format\s?:\s?dwr-dms-1.0")
     MAX_SCAN_LINE = 150
-    with open(fname, "r") as f:
+    with _open_head(fname) as f:
         line = f.readline().strip()
         if pattern.search(line) is None:
             return False
@@ -352,6 +543,7 @@ def read_dms1_screen(
         comment="#",
         nrows=nrows,
         freq=freq if freq not in (None, "None") else "infer",
+        time_sorted=True,
         **kwargs,
     )
     return ts
@@ -362,7 +554,7 @@ def is_dms1(fname):
     if not fname.endswith(".csv"):
         return False
     pattern = re.compile(r"#\s?format\s?:\s?dwr-dms-1.0")
-    with open(fname, "r") as f:
+    with _open_head(fname) as f:
         line = f.readline()
         if pattern.match(line) is None:
             return False
@@ -399,6 +591,7 @@ def read_dms1(
         comment="#",
         nrows=nrows,
         freq=freq if freq not in (None, "None") else "infer",
+        time_sorted=True,
         **kwargs,
     )
     # Coerce defective to standard
@@ -417,14 +610,14 @@ def _reject_caller_dtypes(reader_name, kwargs):
 
 
 def is_ncro_json(fname):
-    with open(fname, "r") as f:
+    with _open_head(fname) as f:
         first_line = f.readline()
         return "format: dwr-ncro-json" in first_line
 
 
 def is_ncro_cnra(fname):
     pattern = re.compile(r"#\s?provider\s?=\s?dwr-ncro")
-    with open(fname, "r") as f:
+    with _open_head(fname) as f:
         for i, line in enumerate(f):
             if i > 6:
                 return False
@@ -503,7 +696,7 @@ def is_des_std(fname):
 
     pattern0 = re.compile(r"#\s?provider\s?=\s?dwr-des")
     pattern1 = re.compile(r"#\s?provider\s?:\s?dwr-des")
-    with open(fname, "r") as f:
+    with _open_head(fname) as f:
         for i, line in enumerate(f):
             if i > 6:
                 return False
@@ -543,7 +736,7 @@ def read_des_std(
 
 
 def is_des(fname):
-    with open(fname, "r") as f:
+    with _open_head(fname) as f:
         count = 0
         for i, line in enumerate(f):
             if i > 7:
@@ -593,7 +786,7 @@ def read_des(
 
 
 def is_cdec_csv2(fname):
-    with open(fname, "r") as f:
+    with _open_head(fname) as f:
         title_line = f.readline()
         return title_line.lower().startswith("station_id,duration,sensor_number")
     return False
@@ -637,7 +830,7 @@ def read_cdec2(
 
 
 def is_cdec_csv1(fname):
-    with open(fname, "r") as f:
+    with _open_head(fname) as f:
         title_line = f.readline()
         return title_line.lower().startswith("title:")
 
@@ -684,7 +877,7 @@ def read_cdec1(
 
 
 def is_wdl(fname):
-    with open(fname, "r") as f:
+    with _open_head(fname) as f:
         first_line = f.readline()
         parts = first_line.split(",")
         if not len(parts) in (3, 4):
@@ -729,7 +922,7 @@ def read_wdl(
 
 
 def is_wdl2(fname):
-    with open(fname, "r") as f:
+    with _open_head(fname) as f:
         first_line = f.readline()
         second_line = f.readline()
         return '"Date' in first_line and "Site" in second_line
@@ -770,7 +963,7 @@ def read_wdl2(
 
 
 def is_wdl3(fname):
-    with open(fname, "r") as f:
+    with _open_head(fname) as f:
         first_line = f.readline()
         second_line = f.readline()
         ret = ('"Time' in first_line) and ('"and' in second_line)
@@ -839,7 +1032,7 @@ def read_wdl3(
 
 
 def is_usgs_json1(fname):
-    with open(fname, "r") as f:
+    with _open_head(fname) as f:
         line0 = f.readline()
         line1 = f.readline()
         line2 = f.readline()
@@ -936,7 +1129,7 @@ def is_usgs1(fname):
     MAX_SCAN_LINE = 220
     tzline = False
     usgsline = False
-    with open(fname, "r") as f:
+    with _open_head(fname) as f:
         for i, line in enumerate(f):
             if i > MAX_SCAN_LINE:
                 return False
@@ -965,7 +1158,7 @@ def usgs_data_columns1(fname):
     )
     colnames = []
     description = {}
-    with open(fname, "r") as f:
+    with _open_head(fname) as f:
         reading_cols = False
         use_statistic = False
         for i, line in enumerate(f):
@@ -1101,7 +1294,7 @@ def is_usgs1_daily(fname):
     tzline = False
     usgsline = False
     agencyline = False
-    with open(fname, "r") as f:
+    with _open_head(fname) as f:
         for i, line in enumerate(f):
             if i > MAX_SCAN_LINE:
                 return False
@@ -1175,7 +1368,7 @@ def is_usgs2(fname):
     MAX_SCAN_LINE = 210
     tzline = False
     usgsline = False
-    with open(fname, "r") as f:
+    with _open_head(fname) as f:
         for i, line in enumerate(f):
             if i > MAX_SCAN_LINE:
                 return False
@@ -1250,7 +1443,7 @@ def read_usgs2(
 def is_usgs_csv1(fname):
     MAX_SCAN = 32
     sampleline = False
-    with open(fname, "r") as f:
+    with _open_head(fname) as f:
         for i, line in enumerate(f):
             if i > MAX_SCAN and not sampleline:
                 return False
@@ -1322,7 +1515,7 @@ def read_usgs_csv1(
 
 def is_noaa_file(fname):
     MAX_SCAN_LINE = 120
-    with open(fname, "r") as f:
+    with _open_head(fname) as f:
         for i, line in enumerate(f):
             if "format: dwr" in line.lower(): 
                 return False
@@ -1338,7 +1531,7 @@ def is_noaa_file(fname):
 
 def noaa_data_column(fname):
     MAX_SCAN_LINE = 120
-    with open(fname, "r") as f:
+    with _open_head(fname) as f:
         reading_cols = False
         for i, line in enumerate(f):
             if i > MAX_SCAN_LINE:
@@ -1352,7 +1545,7 @@ def noaa_data_column(fname):
 
 def noaa_qaqc_selector(selector, fname):
     MAX_SCAN_LINE = 60
-    with open(fname, "r") as f:
+    with _open_head(fname) as f:
         reading_cols = False
         for i, line in enumerate(f):
             if i > MAX_SCAN_LINE:
@@ -1536,6 +1729,8 @@ def read_ts(
         column label with file to extract
     hint : str
         first few characters of reader to use, such as 'cdec' or 'nwis'. Speeds the read.
+        If omitted, a reader that already succeeded on the same unchanged file
+        in this session is tried first (see ``detected_reader``).
 
     Returns
     -------
@@ -1568,6 +1763,31 @@ def read_ts(
         read_wdl,
         read_last_resort_csv,
     ]
+    # A file whose reader is already known from an earlier read in this
+    # session (and unchanged since) tries that reader first.
+    record = _sniff(fpath) if os.path.isfile(fpath) else None
+    if hint is None and record is not None and record["reader"] is not None:
+        known = [r for r in readers if r.__name__ == record["reader"]]
+        readers = known + [r for r in readers if r.__name__ != record["reader"]]
+    # Whole-file dms1 reads can be served from (and saved to) the optional
+    # Parquet sidecar cache. Sliced reads use the sidecar but do not build it.
+    # An explicit hint is a request for that reader, so it bypasses the cache.
+    sidecar_variant = None
+    if (
+        record is not None
+        and hint is None
+        and nrows is None
+        and selector is None
+        and not kwargs.keys() - {"dtypes"}
+        and sidecar.sidecar_enabled()
+    ):
+        sidecar_variant = sidecar.variant_key(
+            force_regular=force_regular, freq=freq, dtypes=kwargs.get("dtypes")
+        )
+        cached = sidecar.load_sidecar(fpath, sidecar_variant)
+        if cached is not None:
+            return cached.loc[start:end] if (start, end) != (None, None) else cached
+
     ts = None
     reader_count = 0
     last_reader_tried = None
@@ -1605,6 +1825,18 @@ def read_ts(
                 freq=freq,
                 **reader_kwargs,
             )
+            if record is not None:
+                record["reader"] = reader.__name__
+            if (
+                sidecar_variant is not None
+                and start is None
+                and end is None
+                and reader.__name__ in ("read_dms1", "read_dms1_screen")
+            ):
+                try:
+                    sidecar.store_sidecar(fpath, sidecar_variant, ts)
+                except (OSError, ValueError, ImportError) as exc:
+                    logger.warning("Could not write sidecar for %s: %s", fpath, exc)
             return ts
         except IOError as e:
             if str(e).startswith("No match"):
@@ -1615,7 +1847,7 @@ def read_ts(
             raise
 
     if ts is None:
-        if last_reader_tried == readers[-1].__name__:
+        if last_reader_tried == read_last_resort_csv.__name__:
             last_reader_tried = (
                 last_reader_tried
                 + " (this is the last on the list, so it may not be meaningful)"
@@ -1705,6 +1937,240 @@ def _float_coercion_error(path, exc):
     )
 
 
+def _prune_shards_to_window(matches, start, end):
+    """Drop shard files whose filename year span cannot overlap ``[start, end]``.
+
+    Files without a recognizable year token are always kept. If nothing
+    overlaps, the last file is retained so that the caller still produces a
+    correctly shaped (empty) frame after slicing.
+    """
+    if start is None and end is None:
+        return matches
+    startyr = None if start is None else pd.Timestamp(start).year
+    endyr = None if end is None else pd.Timestamp(end).year
+    kept = []
+    for m in matches:
+        span = shard_year_span(m)
+        if span is not None:
+            if startyr is not None and span[1] < startyr:
+                continue
+            if endyr is not None and span[0] > endyr:
+                continue
+        kept.append(m)
+    if not kept and matches:
+        kept = matches[-1:]
+    return kept
+
+
+# Files smaller than this are read whole; a seek would not pay for itself.
+_WINDOW_MIN_BYTES = 1 << 18
+# Bisection stops once the bracket is this narrow.
+_WINDOW_SLACK = 1 << 14
+# Extra context kept on either side of the window so frequency inference and
+# nearest-timestamp regularization see the same neighbourhood as a full read.
+_WINDOW_PAD = 1 << 14
+
+
+def _leading_time(line):
+    """Parse the ISO timestamp in the first comma-separated field of *line*."""
+    return dtm.datetime.fromisoformat(line.split(b",", 1)[0].decode("ascii").strip())
+
+
+def _line_at(f, pos, data_start):
+    """Return ``(offset, time)`` for the first whole line starting at or after *pos*."""
+    f.seek(pos)
+    if pos > data_start:
+        f.readline()
+    off = f.tell()
+    line = f.readline()
+    if not line.strip():
+        return off, None
+    return off, _leading_time(line)
+
+
+def _bisect_offsets(f, data_start, size, target, inclusive):
+    """Bracket the rows whose time precedes *target* by byte offset.
+
+    Returns ``(lo, hi)`` line-start offsets such that every line starting
+    before ``lo`` is earlier than *target* (or not later, if *inclusive*) and
+    every line starting at or after ``hi`` is not.
+    """
+    lo, hi, hi_off = data_start, size, size
+    while hi - lo > _WINDOW_SLACK:
+        mid = (lo + hi) // 2
+        off, t = _line_at(f, mid, data_start)
+        if t is not None and (t <= target if inclusive else t < target):
+            lo = off
+        else:
+            hi, hi_off = mid, off
+    return lo, hi_off
+
+
+def _resync(f, pos, data_start):
+    """Offset of the first line start at or after *pos*."""
+    f.seek(pos)
+    if pos > data_start:
+        f.readline()
+    return f.tell()
+
+
+def _window_source(path, start, end, comment="#"):
+    """Return a byte-window of a time-sorted csv covering ``[start, end]``.
+
+    The file is assumed to hold ascending ISO timestamps in its first column
+    after an optional commented header and one column-name line. The rows of
+    interest are located by bisecting on byte offsets, so only the bytes in
+    the window (plus a little padding) are handed to the csv parser.
+
+    Returns
+    -------
+    tuple
+        ``(source, base_offset)`` where *source* is either *path* itself (the
+        window would cover the file or could not be determined) or a
+        ``BytesIO`` holding the column line and the windowed rows, and
+        *base_offset* maps a byte position in *source* back to the file.
+    """
+    if start is None and end is None:
+        return path, 0
+    try:
+        size = os.path.getsize(path)
+        if size < _WINDOW_MIN_BYTES:
+            return path, 0
+        with open(path, "rb") as f:
+            cbytes = comment.encode("ascii")
+            while True:
+                colline = f.readline()
+                if not colline:
+                    return path, 0
+                if not colline.startswith(cbytes):
+                    break
+            data_start = f.tell()
+            lo, hi = data_start, size
+            if start is not None:
+                target = pd.Timestamp(start).to_pydatetime()
+                lo, _ = _bisect_offsets(f, data_start, size, target, inclusive=False)
+                lo = _resync(f, max(data_start, lo - _WINDOW_PAD), data_start)
+            if end is not None:
+                target = pd.Timestamp(end).to_pydatetime()
+                _, hi = _bisect_offsets(f, data_start, size, target, inclusive=True)
+                hi = _resync(f, min(size, hi + _WINDOW_PAD), data_start)
+            if hi <= lo or (lo <= data_start and hi >= size):
+                return path, 0
+            f.seek(lo)
+            chunk = f.read(max(0, hi - lo))
+    except (ValueError, TypeError, UnicodeDecodeError, OSError):
+        # Unparseable timestamps, tz mismatches etc.: fall back to a full read.
+        return path, 0
+    return io.BytesIO(colline + chunk), lo - len(colline)
+
+
+def _collapse_to_grid(ts, f):
+    """Collapse *ts* onto the regular grid of frequency *f*.
+
+    Each timestamp is rounded to the grid (fixed-length offsets only; others
+    such as month or year starts are assumed to be on their grid already) and
+    one row is kept per grid time: a row whose first column is not NaN before
+    one that is, then the row nearest the grid time, then the earliest. The
+    result is equivalent to passing the kept rows through ``asfreq(f)``.
+
+    Series that are already on-grid, sorted and unique skip the selection.
+    Otherwise it runs over int64 arrays in a single pass (plus one argsort if
+    the index is unsorted) instead of sorting a frame with helper columns.
+    Rows with a missing timestamp are dropped.
+    """
+    try:
+        nanos = pd.tseries.frequencies.to_offset(f).nanos
+    except ValueError:
+        nanos = None
+
+    index = ts.index
+    if index.hasnans:
+        ts = ts.loc[index.notna()]
+        index = ts.index
+    if len(index) == 0:
+        return ts.asfreq(f)
+    rounded = index.round(f) if nanos is not None else index
+    torig = index.asi8
+    tgrid = rounded.asi8
+
+    if index.is_monotonic_increasing and (np.diff(torig) > 0).all():
+        if nanos is None or (torig == tgrid).all():
+            return _expand_to_grid(ts, None, rounded.rename(ts.index.name), f, nanos)
+
+    if not index.is_monotonic_increasing:
+        # Rounding is monotone, so sorting by original time also groups grid times
+        order = np.argsort(torig, kind="stable")
+        torig = torig[order]
+        tgrid = tgrid[order]
+    else:
+        order = None
+
+    newgrp = np.empty(len(tgrid), dtype=bool)
+    newgrp[0] = True
+    np.not_equal(tgrid[1:], tgrid[:-1], out=newgrp[1:])
+    if newgrp.all():
+        # No two rows share a grid time (typical clock jitter): nothing to choose
+        keep = order
+    else:
+        # Rank within a grid time: NaN values lose to any real value, then
+        # distance. Distances are below one grid step, so the NaN penalty
+        # cannot be reached otherwise.
+        isnan = ts.iloc[:, 0].isna().to_numpy()
+        if order is not None:
+            isnan = isnan[order]
+        score = np.abs(torig - tgrid)
+        score[isnan] += np.iinfo(np.int64).max // 2
+        del isnan
+        group = np.cumsum(newgrp) - 1
+        starts = np.flatnonzero(newgrp)
+        del newgrp
+        best = score == np.minimum.reduceat(score, starts)[group]
+        del score, starts
+        # First (earliest) best row of each group
+        keep = np.flatnonzero(best)
+        del best
+        group = group[keep]
+        first = np.empty(len(keep), dtype=bool)
+        first[0] = True
+        np.not_equal(group[1:], group[:-1], out=first[1:])
+        keep = keep[first]
+        if order is not None:
+            keep = order[keep]
+    grid = rounded if keep is None else rounded[keep]
+    return _expand_to_grid(ts, keep, grid.rename(ts.index.name), f, nanos)
+
+
+def _expand_to_grid(ts, keep, grid, f, nanos):
+    """Place ``ts.iloc[keep]`` on the sorted, unique DatetimeIndex *grid* and
+    fill out to a regular index of frequency *f*, like ``asfreq(f)``.
+    """
+    if keep is None:
+        out = ts.copy(deep=False)
+    else:
+        out = ts.iloc[keep]
+    if nanos is None or len(grid) == 0:
+        return out.set_axis(grid, axis=0).asfreq(f)
+
+    grid_i8 = grid.asi8
+    pos = (grid_i8 - grid_i8[0]) // nanos
+    full = pd.date_range(start=grid[0], periods=int(pos[-1]) + 1, freq=f, name=grid.name)
+    if len(full) == len(grid):
+        out.index = full
+        return out
+
+    if all(dt.kind == "f" for dt in ts.dtypes):
+        # Gaps: scatter float columns straight into NaN-filled grid arrays
+        data = {}
+        for col in ts.columns:
+            vals = ts[col].to_numpy()
+            filled = np.full(len(full), np.nan, dtype=vals.dtype)
+            filled[pos] = vals if keep is None else vals[keep]
+            data[col] = filled
+        return pd.DataFrame(data, index=full, columns=ts.columns)
+
+    return out.set_axis(full[pos], axis=0).asfreq(f)
+
+
 def csv_retrieve_ts(
     fpath_pattern,
     start,
@@ -1743,8 +2209,14 @@ def csv_retrieve_ts(
     dtypes=None,
     freq="infer",
     nrows=None,
+    time_sorted=False,
     **kwargs,
 ):
+    # Shards whose filename year span cannot overlap [start, end] are skipped.
+    # When time_sorted is True (the file holds ascending ISO timestamps in its
+    # first comma-separated column, as dms1 files do) the shards that are
+    # opened are also read through a byte window around [start, end].
+
     # Allow caller to provide additional NA tokens via kwargs (e.g. "(null)").
     # We cannot pass na_values directly to pd.read_csv because this function
     # already supplies na_values=extra_na. Instead, merge them here.
@@ -1768,6 +2240,7 @@ def csv_retrieve_ts(
     matches.sort()
     if len(matches) == 0:
         raise IOError("No matches found for pattern: {}".format(fpat))
+    matches = _prune_shards_to_window(matches, start, end)
 
     if not format_compatible_fn(matches[0]):
         raise IOError(
@@ -1850,11 +2323,21 @@ def csv_retrieve_ts(
             skiprows_spec = skiprows
 
         dset = None  # to prevent holdover in memory
+        src, src_base = m, 0
+        if (
+            time_sorted
+            and column_names is None
+            and nrows is None
+            and skiprows == 0
+            and header == 0
+            and sep == ","
+        ):
+            src, src_base = _window_source(m, start, end, comment=comment or "#")
         if column_names is None:
             # warnings.filterwarnings('error')
             try:
                 dset = pd.read_csv(
-                    m,
+                    src,
                     index_col=indexcol,
                     header=header,
                     skiprows=skiprows_spec,
@@ -1869,10 +2352,10 @@ def csv_retrieve_ts(
                     **dargs,
                 )
             except UnicodeDecodeError as e:
-                context = _decode_context(m, e.start)
+                context = _decode_context(m, e.start + src_base)
                 raise RuntimeError(
                     f"Invalid UTF-8 in file: {m}\n"
-                    f"Byte offset: {e.start}\n"
+                    f"Byte offset: {e.start + src_base}\n"
                     f"Nearby bytes: {context}\n\n"
                     "File is likely cp1252/latin-1 encoded."
                 ) from e
@@ -1897,7 +2380,7 @@ def csv_retrieve_ts(
         else:
             try:
                 dset = pd.read_csv(
-                    m,
+                    src,
                     index_col=indexcol,
                     header=header,
                     skiprows=skiprows_spec,
@@ -1913,10 +2396,10 @@ def csv_retrieve_ts(
                     **dargs,
                 )
             except UnicodeDecodeError as e:
-                context = _decode_context(m, e.start)
+                context = _decode_context(m, e.start + src_base)
                 raise RuntimeError(
                     f"Invalid UTF-8 in file: {m}\n"
-                    f"Byte offset: {e.start}\n"
+                    f"Byte offset: {e.start + src_base}\n"
                     f"Nearby bytes: {context}\n\n"
                     "File is likely cp1252/latin-1 encoded."
                 ) from e
@@ -1963,62 +2446,7 @@ def csv_retrieve_ts(
         if f is None:
             raise NotImplementedError("force_regular but could not discover freq")
 
-        big_ts = big_ts.copy()
-
-        # keep original times for tie-breaking
-        orig_index = big_ts.index
-
-        # round to target grid; .round only supports fixed-length offsets
-        # (e.g. minutes, hours, days). Non-fixed offsets such as <MonthBegin>
-        # or <YearBegin> have no constant nanosecond length, so skip rounding
-        # and rely on asfreq() to align the (already grid-aligned) index.
-        # f may be a str (from infer_freq_robust) or an offset (from
-        # to_offset), so normalize before probing .nanos.
-        try:
-            pd.tseries.frequencies.to_offset(f).nanos
-            fixed_freq = True
-        except ValueError:
-            fixed_freq = False
-
-        if fixed_freq:
-            rounded = big_ts.index.round(f)
-        else:
-            rounded = big_ts.index
-
-        # absolute distance to rounded target
-        delta = (orig_index - rounded).asi8
-        abs_delta = pd.Index(delta).to_numpy()
-        abs_delta = np.abs(abs_delta)
-
-        valcol = big_ts.columns[0]
-
-        big_ts["_orig_time"] = orig_index
-        big_ts["_rounded_time"] = rounded
-        big_ts["_abs_delta"] = abs_delta
-        big_ts["_is_nan"] = big_ts[valcol].isna()
-
-        # sort so that best representative per rounded timestamp comes first:
-        #   1. non-NaN before NaN
-        #   2. smallest distance to target
-        #   3. earlier original time as stable tie-break
-        big_ts = big_ts.sort_values(
-            by=["_rounded_time", "_is_nan", "_abs_delta", "_orig_time"]
-        )
-
-        # keep best row per rounded timestamp
-        big_ts = big_ts.drop_duplicates(subset="_rounded_time", keep="first")
-
-        # replace index with rounded grid timestamp
-        big_ts.index = pd.DatetimeIndex(big_ts["_rounded_time"], name=big_ts.index.name)
-
-        # clean up helper columns
-        big_ts = big_ts.drop(columns=["_orig_time", "_rounded_time", "_abs_delta", "_is_nan"])
-
-        # optional: fail here if anything somehow still duplicated
-        if big_ts.index.has_duplicates:
-            raise ValueError("Duplicate timestamps remain after nearest-timestamp collapse")
-
-        big_ts = big_ts.asfreq(f)
+        big_ts = _collapse_to_grid(big_ts, f)
 
     else:
         pass
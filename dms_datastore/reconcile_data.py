@@ -35,11 +35,11 @@ Notes
 from __future__ import annotations
 
 import concurrent.futures
+import dataclasses
 import hashlib
 import os
 import re
 from dataclasses import dataclass
-from glob import glob
 from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Set, Tuple
 
 import shutil
@@ -51,6 +51,14 @@ from dms_datastore.inventory import to_wildcard
 from dms_datastore.read_ts import extract_commented_header
 from dms_datastore import dstore_config
 from dms_datastore.read_ts import read_ts, read_flagged
+from dms_datastore.repo_index import DataHashManifest, index_glob
+from dms_datastore.shard_writer import (
+    _data_fingerprint,
+    _hash_data_section,
+    _same_data_section,
+    _skip_header,
+    write_shard,
+)
 import logging
 logger = logging.getLogger(__name__)
 
@@ -89,6 +97,9 @@ class ReconcileAction:
 
         - ``"write"``: write (or copy) staged data into repo.
         - ``"splice_write"``: merge staged and repo by time index and write.
+        - ``"append_write"``: the staged shard only adds rows after the end of
+          the repo shard; the repo file is rewritten as its own bytes followed
+          by those rows, without parsing either file.
 
     reason : str
         Human-readable reason string explaining why this action is needed.
@@ -124,6 +135,7 @@ class VettedWrite:
     action: ReconcileAction
     df_to_write: Optional[pd.DataFrame] = None
     header_text: Optional[str] = None
+    append_bytes: Optional[bytes] = None
 
 
 # -----------------------------
@@ -246,51 +258,6 @@ def _series_id_from_name(basename: str, remove_source: bool) -> str:
 # -----------------------------
 
 
-def _hash_data_section(path: str, comment: str = "#") -> str:
-    """ Hash the data portion of a time-series CSV.
-
-    This function skips the leading commented YAML-like header (lines beginning
-    with ``comment``) and hashes the remaining bytes.
-
-    Parameters
-    ----------
-    path : str
-        Path to a CSV file written in the dms-datastore format (commented header
-        followed by a CSV table).
-    comment : str, default '#'
-        Comment prefix used for header lines.
-
-    Returns
-    -------
-    digest : str
-        Hex-encoded SHA256 digest of the non-header bytes.
-
-    Notes
-    -----
-    This is used as a fast path to avoid rewriting files when only metadata changes
-    (e.g., ``date_formatted`` updates). When hashes differ, the code may fall back
-    to parsed-data comparison to ignore benign formatting differences in numeric
-    strings.
-    """
-    h = hashlib.sha256()
-    with open(path, "rb") as f:
-        # Skip header: lines beginning with comment in text mode.
-        # We do this in binary while checking for leading b'#'.
-        while True:
-            pos = f.tell()
-            line = f.readline()
-            if not line:
-                break
-            if line.startswith(comment.encode("utf-8")):
-                continue
-            # first non-comment line: rewind and hash remaining bytes
-            f.seek(pos)
-            break
-        for chunk in iter(lambda: f.read(1024 * 1024), b""):
-            h.update(chunk)
-    return h.hexdigest()
-
-
 def _stable_u01(key: str) -> float:
     """ Deterministic pseudo-random number in [0, 1).
 
@@ -411,7 +378,8 @@ def _write_preserving_header(
         header_text = header_text + "\n"
     if df.index.name is None:
         df.index.name = "datetime"
-    with open(dest_path, "w", encoding="utf-8", newline="\n") as f:
+
+    def write(f):
         if header_text:
             f.write(header_text)
         df.to_csv(
@@ -423,6 +391,97 @@ def _write_preserving_header(
             lineterminator="\n",
         )
 
+    write_shard(dest_path, write)
+
+
+def _row_times(lines: Sequence[bytes]) -> pd.DatetimeIndex:
+    return pd.to_datetime(
+        [line.split(b",", 1)[0].decode("utf-8").strip() for line in lines],
+        format="ISO8601",
+    )
+
+
+def _appended_tail(spath: str, rpath: str, regular: bool = True) -> Optional[bytes]:
+    """ Rows that a staged shard adds after the end of its repo namesake.
+
+    A staged shard is a pure append when its data section (column line
+    included) starts with the repo shard's data section byte for byte and
+    continues with whole rows that come strictly after the last repo row. For
+    ``regular`` data the new rows must also continue the repo's time step
+    without gaps. Only the appended rows are parsed.
+
+    Returns
+    -------
+    tail : bytes or None
+        The appended rows, ready to be written to the end of the repo file, or
+        None if the staged shard is not a pure append of the repo shard.
+    """
+    chunk_size = 1024 * 1024
+    with open(rpath, "rb") as rf, open(spath, "rb") as sf:
+        _skip_header(rf)
+        _skip_header(sf)
+        columns = rf.readline()
+        if not columns or sf.readline() != columns:
+            return None
+        end = b""
+        while True:
+            rchunk = rf.read(chunk_size)
+            if not rchunk:
+                break
+            if sf.read(len(rchunk)) != rchunk:
+                return None
+            end = (end + rchunk)[-4096:]
+        tail = sf.read()
+    if not tail or not end.endswith(b"\n"):
+        return None
+    if not tail.endswith(b"\n"):
+        tail += b"\n"
+
+    new_rows = tail.splitlines()
+    nfield = columns.count(b",")
+    if any(row.count(b",") != nfield for row in new_rows):
+        return None
+    repo_rows = end.splitlines()[-2:]
+    try:
+        new_times = _row_times(new_rows)
+        repo_times = _row_times(repo_rows)
+    except (ValueError, TypeError):
+        return None
+    if new_times.hasnans or repo_times.hasnans:
+        return None
+    if not (new_times.is_monotonic_increasing and new_times.is_unique):
+        return None
+    if new_times[0] <= repo_times[-1]:
+        return None
+    if regular:
+        if len(repo_times) < 2:
+            return None
+        step = repo_times[-1] - repo_times[-2]
+        steps = np.diff(np.concatenate([repo_times[-1:].asi8, new_times.asi8]))
+        if step <= pd.Timedelta(0) or (steps != step.value).any():
+            return None
+    return tail
+
+
+def _write_appended(rpath: str, tail: bytes) -> None:
+    """Atomically replace *rpath* with its current bytes followed by *tail*."""
+
+    def write(f):
+        with open(rpath, "rb") as src:
+            shutil.copyfileobj(src, f, 1024 * 1024)
+        f.write(tail)
+
+    write_shard(rpath, write, skip_unchanged=False, binary=True)
+
+
+def _append_tail(spath: str, rpath: str, regular: bool = True) -> bool:
+    """Append the rows from :func:`_appended_tail` to *rpath*; False if none."""
+    tail = _appended_tail(spath, rpath, regular=regular)
+    if tail is None:
+        return False
+    _write_appended(rpath, tail)
+    return True
+
 
 # -----------------------------
 # Discovery helpers
@@ -430,7 +489,7 @@ def _write_preserving_header(
 
 
 def _list_csv_files(d: str, pattern: str = "*.csv") -> List[str]:
-    return sorted(glob(os.path.join(d, pattern)))
+    return index_glob(os.path.join(d, pattern))
 
 
 def _index_by_series_and_shard(
@@ -469,6 +528,36 @@ def _index_by_series_and_shard(
 # -----------------------------
 
 
+_BAD_FLAG = object()
+
+
+def _coerce_flag(v):
+    """Coerce one user_flag value to 0, 1, None (blank) or ``_BAD_FLAG``."""
+    if v is None or v is pd.NA:
+        return None
+    # numeric types first
+    if isinstance(v, (int, np.integer)):
+        if v in (0, 1):
+            return int(v)
+        return _BAD_FLAG
+    if isinstance(v, (float, np.floating)):
+        if np.isnan(v):
+            return None
+        # accept integer-like floats 0.0/1.0
+        if np.isfinite(v) and float(v).is_integer() and int(v) in (0, 1):
+            return int(v)
+        return _BAD_FLAG
+    # strings (including things like "0.0" from prior stringification)
+    s2 = str(v).strip()
+    if s2 in ("", "nan", "NaN", "None"):
+        return None
+    if s2 in ("0", "1"):
+        return int(s2)
+    if s2 in ("0.0", "1.0"):
+        return int(float(s2))
+    return _BAD_FLAG
+
+
 def _normalize_flag(s: pd.Series) -> pd.Series:
     """ Normalize user_flag to {NA, 0, 1} as pandas nullable Int64.
 
@@ -478,42 +567,28 @@ def _normalize_flag(s: pd.Series) -> pd.Series:
       - 0/1 as ints
       - 0.0/1.0 as floats (common when CSV is read with default dtype)
       - "0"/"1" (strings, possibly with surrounding whitespace)
+
+    Only the distinct values are inspected (a screened column holds a handful
+    of spellings at most); the result is mapped back to all rows vectorized.
     """
     if s.dtype.name == "Int64":
         return s
 
-    x = s.astype("object")
-    x = x.where(~x.isna(), None)
-
-    def _coerce(v):
-        if v is None:
-            return None
-        # numeric types first
-        if isinstance(v, (int, np.integer)):
-            if v in (0, 1):
-                return int(v)
-            return "__BAD__"
-        if isinstance(v, (float, np.floating)):
-            # accept integer-like floats 0.0/1.0
-            if np.isfinite(v) and float(v).is_integer() and int(v) in (0, 1):
-                return int(v)
-            return "__BAD__"
-        # strings (including things like "0.0" from prior stringification)
-        s2 = str(v).strip()
-        if s2 in ("", "nan", "NaN", "None"):
-            return None
-        if s2 in ("0", "1"):
-            return int(s2)
-        if s2 in ("0.0", "1.0"):
-            return int(float(s2))
-        return "__BAD__"
-
-    x = x.apply(_coerce)
-    bad = x[x == "__BAD__"]
-    if len(bad) > 0:
-        raise ValueError(f"Invalid user_flag values: {sorted(set(bad.tolist()))}")
-
-    return x.astype("Int64")
+    codes, uniques = pd.factorize(s, use_na_sentinel=True)
+    coerced = [_coerce_flag(v) for v in uniques]
+    bad = [v for v, c in zip(uniques, coerced) if c is _BAD_FLAG]
+    if bad:
+        raise ValueError(f"Invalid user_flag values: {sorted(set(map(str, bad)))}")
+
+    # Code -1 (missing) picks the trailing blank entry.
+    table = np.array([-1 if c is None else c for c in coerced] + [-1], dtype=np.int64)
+    flags = table[codes]
+    missing = flags < 0
+    return pd.Series(
+        pd.arrays.IntegerArray(np.where(missing, 0, flags), missing),
+        index=s.index,
+        name=s.name,
+    )
 
 
 def _merge_screened_flags(
@@ -582,84 +657,56 @@ def _merge_screened_flags(
     r = repo.reindex(idx)
     s = staged.reindex(idx)
 
-    # Normalize flags
-    rflag = _normalize_flag(r["user_flag"])
-    sflag = _normalize_flag(s["user_flag"])
+    # Normalize flags and work on plain arrays: values, flag values and
+    # blank masks.
+    rflag = _normalize_flag(r["user_flag"]).array
+    sflag = _normalize_flag(s["user_flag"]).array
+    rf, r_blank = rflag.to_numpy(dtype="int64", na_value=0), rflag.isna()
+    sf, s_blank = sflag.to_numpy(dtype="int64", na_value=0), sflag.isna()
 
     # Determine where value differs/new:
     # - if one side missing value, treat as "different/new"
-    rv = r[["value"]]
-    sv = s[["value"]]
-    both_have = rv["value"].notna() & sv["value"].notna()
-
-    different = pd.Series(True, index=idx)
+    # - if both missing, treat as "not different"
+    rv = r["value"].to_numpy(dtype="float64")
+    sv = s["value"].to_numpy(dtype="float64")
+    r_missing = np.isnan(rv)
+    s_missing = np.isnan(sv)
+    both_have = ~r_missing & ~s_missing
+    different = np.ones(len(idx), dtype=bool)
     if both_have.any():
-        dm = _diff_mask(
-            rv.loc[both_have, ["value"]],
-            sv.loc[both_have, ["value"]],
-            atol=atol,
-            rtol=rtol,
-        )
-        different.loc[both_have] = dm
-
-    # If both missing, treat as "not different"
-    both_missing = rv["value"].isna() & sv["value"].isna()
-    different.loc[both_missing] = False
+        dm = _diff_mask(r[["value"]], s[["value"]], atol=atol, rtol=rtol)
+        different[both_have] = dm[both_have]
+    different[r_missing & s_missing] = False
 
     equal = ~different
 
     # Start output by taking the reference side everywhere (covers "different/new").
     if value_reference == "repo":
         out = r.copy()
+        flag, blank = rf.copy(), r_blank.copy()
     else:
         out = s.copy()
+        flag, blank = sf.copy(), s_blank.copy()
 
     # For equal-value timestamps: keep repo value to reduce churn, and merge flags.
     if equal.any():
-        vals = rv.loc[equal, "value"]
-        if not vals.isna().all():
-            out.loc[equal, "value"] = vals
-
-        rf = rflag.loc[equal]
-        sf = sflag.loc[equal]
-
-        # Identify explicit vs blank
-        rf_exp = rf.notna()
-        sf_exp = sf.notna()
-
-        merged = pd.Series(pd.NA, index=rf.index, dtype="Int64")
-
-        # One-sided explicit beats blank
-        merged.loc[rf_exp & ~sf_exp] = rf.loc[rf_exp & ~sf_exp]
-        merged.loc[~rf_exp & sf_exp] = sf.loc[~rf_exp & sf_exp]
-
-        # Both blank -> blank (already NA)
-
-        # Both explicit:
-        both_exp = rf_exp & sf_exp
-        if both_exp.any():
-            same = both_exp & (rf == sf)
-            merged.loc[same] = rf.loc[same]
+        out["value"] = np.where(equal, rv, out["value"].to_numpy(dtype="float64"))
 
-            conflict = both_exp & (rf != sf)
-            if conflict.any():
-                if explicit_conflict == "prefer_repo":
-                    merged.loc[conflict] = rf.loc[conflict]
-                elif explicit_conflict == "prefer_staged":
-                    merged.loc[conflict] = sf.loc[conflict]
-                else:
-                    t0 = conflict[conflict].index[0]
-                    raise ValueError(
-                        f"Explicit user_flag conflict at {t0}: repo={rf.loc[t0]} staged={sf.loc[t0]}"
-                    )
-
-        # Avoid dtype issues when out["user_flag"] was inferred as float/object
-        uf = _normalize_flag(out["user_flag"])
-        uf.loc[equal] = merged.astype("Int64")
-        out["user_flag"] = uf
+        # Explicit (0/1) beats blank; both blank stays blank.
+        both_exp = equal & ~r_blank & ~s_blank
+        conflict = both_exp & (rf != sf)
+        if conflict.any() and explicit_conflict == "error":
+            i0 = np.flatnonzero(conflict)[0]
+            raise ValueError(
+                f"Explicit user_flag conflict at {idx[i0]}: repo={rf[i0]} staged={sf[i0]}"
+            )
+        take_staged = ~s_blank & r_blank
+        if explicit_conflict == "prefer_staged":
+            take_staged |= conflict
+        flag[equal] = np.where(take_staged, sf, rf)[equal]
+        blank[equal] = (r_blank & s_blank)[equal]
 
-    # Ensure dtype
-    out["user_flag"] = _normalize_flag(out["user_flag"])
+    out["user_flag"] = pd.arrays.IntegerArray(np.where(blank, 0, flag), blank)
     return out
 
 
@@ -754,6 +801,7 @@ def _vet_one_flagged_shard(
     value_reference: str,
     explicit_conflict: str,
     freq_mismatch: str,
+    repo_hashes: Optional[DataHashManifest] = None,
 ) -> Optional[VettedWrite]:
     logger.debug(
         "vet flagged shard series_id=%s shard=%s staged=%s repo=%s",
@@ -789,7 +837,9 @@ def _vet_one_flagged_shard(
         )
 
     # Fast path: identical data section, nothing to do.
-    hash_equal = _hash_data_section(spath) == _hash_data_section(rpath)
+    hash_equal = _same_data_section(
+        spath, rpath, hash_b=None if repo_hashes is None else repo_hashes.data_hash
+    )
 
     if not hash_equal:
         logger.debug(
@@ -801,6 +851,21 @@ def _vet_one_flagged_shard(
     if hash_equal:
         return None
 
+    # Pure append: with staged as the value reference the merge would keep
+    # every repo row and add the staged tail, so append the tail bytes.
+    if value_reference == "staged":
+        tail = _appended_tail(spath, rpath)
+        if tail is not None:
+            action = ReconcileAction(
+                series_id=series_id,
+                shard=shard,
+                action="append_write",
+                reason="append_only",
+                staged_path=spath,
+                repo_path=dest,
+            )
+            return VettedWrite(action=action, append_bytes=tail)
+
     # Read staged screened file.
     try:
         sdf = read_flagged(spath, apply_flags=False, return_flags=True)
@@ -974,6 +1039,250 @@ def _vet_one_flagged_shard(
 # Public APIs
 # -----------------------------
 
+def _vet_repo_shard(
+    *,
+    series_id: str,
+    shard: str,
+    spath: str,
+    rpath: str,
+    repo_hash: Optional[str],
+    repo_dir: str,
+    regular: bool,
+    read_kwargs: dict,
+    atol: float,
+    rtol: float,
+    freq_mismatch: str,
+    append: bool = True,
+) -> Optional[ReconcileAction]:
+    """Compare one inspected staged shard with its repo namesake.
+
+    Returns the action needed to reconcile the pair, or None if they agree.
+    With ``append=False`` a pure append is spliced like any other change.
+    This is the pandas-heavy part of :func:`update_repo`; it is a module-level
+    function so that it can run in a process pool.
+    """
+    # Fast path: identical data section, nothing to do. A missing repo_hash
+    # means the cheap fingerprints already differ.
+    if repo_hash is not None and _hash_data_section(spath) == repo_hash:
+        return None
+
+    # Nightly deltas usually only add rows to the current shard.
+    if append and _appended_tail(spath, rpath, regular=regular) is not None:
+        return ReconcileAction(
+            series_id=series_id,
+            shard=shard,
+            action="append_write",
+            reason="append_only",
+            staged_path=spath,
+            repo_path=rpath,
+        )
+
+    logger.debug(
+        "Comparing staged=%s repo=%s series_id=%s shard=%s",
+        spath,
+        rpath,
+        series_id,
+        shard,
+    )
+
+    try:
+        sdf = read_ts(spath, force_regular=regular, **read_kwargs)
+    except Exception as e:
+        logger.warning("Failed to read staged file %s: %s", spath, e)
+        _quarantine_file(spath)
+        return None
+
+    try:
+        rdf = read_ts(rpath, force_regular=regular, **read_kwargs)
+    except NotImplementedError as e:
+        if "force_regular but could not discover freq" in str(e):
+            logger.warning(
+                "Repo file could not be regularized; rereading irregular for frequency classification: %s",
+                rpath,
+            )
+            rdf = read_ts(rpath, force_regular=False, **read_kwargs)
+        else:
+            raise
+    except Exception as e:
+        if file_empty(rpath) and "No columns to parse" in str(e):
+            logger.warning(
+                "Repo file appears empty/corrupt, treating as missing: %s",
+                rpath,
+            )
+            return ReconcileAction(
+                series_id=series_id,
+                shard=shard,
+                action="write",
+                reason="missing_in_repo",
+                staged_path=spath,
+                repo_path=os.path.join(repo_dir, os.path.basename(spath)),
+            )
+        logger.info("Error reading repo file %s: %s", rpath, e)
+        logger.error(e, stack_info=True, exc_info=True)
+        raise
+
+    if regular:
+        status, freq_reason, sfreq, rfreq = compare_regular_freq(sdf, rdf)
+    else:
+        # Irregular repos (e.g. structures): skip regular-frequency
+        # classification, which would spuriously flag a frequency
+        # mismatch on genuinely irregular data. Fall through to the
+        # normal index-based reconcile; the splice is applied with
+        # ts_splice so irregular steps are stitched, not shuffled.
+        status, freq_reason, sfreq, rfreq = "both_regular_same", None, None, None
+
+    if status == "dst_irregular":
+        logger.warning(
+            "Destination irregular; replacing whole file: "
+            "series_id=%s shard=%s staged=%s repo=%s reason=%s",
+            series_id, shard, spath, rpath, freq_reason,
+        )
+        return ReconcileAction(
+            series_id=series_id,
+            shard=shard,
+            action="replace_write",
+            reason=freq_reason,
+            staged_path=spath,
+            repo_path=rpath,
+        )
+
+    if status == "src_irregular":
+        logger.warning(
+            "Staged file irregular; quarantining and skipping: "
+            "series_id=%s shard=%s staged=%s repo=%s reason=%s",
+            series_id, shard, spath, rpath, freq_reason,
+        )
+        return ReconcileAction(
+            series_id=series_id,
+            shard=shard,
+            action="quarantine_skip",
+            reason=freq_reason,
+            staged_path=spath,
+            repo_path=rpath,
+        )
+
+    if status == "both_irregular":
+        logger.warning(
+            "Both files irregular; quarantining staged and skipping: "
+            "series_id=%s shard=%s staged=%s repo=%s reason=%s",
+            series_id, shard, spath, rpath, freq_reason,
+        )
+        return ReconcileAction(
+            series_id=series_id,
+            shard=shard,
+            action="quarantine_skip",
+            reason=freq_reason,
+            staged_path=spath,
+            repo_path=rpath,
+        )
+
+    if status == "both_regular_different":
+        logger.warning(
+            "Frequency mismatch; no merge: "
+            "series_id=%s shard=%s staged=%s repo=%s staged_freq=%s repo_freq=%s reason=%s",
+            series_id, shard, spath, rpath, sfreq, rfreq, freq_reason,
+        )
+        action_name = "quarantine_skip" if freq_mismatch == "quarantine" else "replace_write"
+        return ReconcileAction(
+            series_id=series_id,
+            shard=shard,
+            action=action_name,
+            reason=freq_reason,
+            staged_path=spath,
+            repo_path=rpath,
+        )
+
+    # only "both_regular_same" falls through to normal reconcile
+
+    if list(sdf.columns) != list(rdf.columns):
+        repo_only = [c for c in rdf.columns if c not in sdf.columns]
+        staged_only = [c for c in sdf.columns if c not in rdf.columns]
+        detail = []
+        if repo_only:
+            detail.append(f"present in repo but missing from staged: {repo_only}")
+        if staged_only:
+            detail.append(f"present in staged but missing from repo: {staged_only}")
+        if not detail:
+            detail.append("columns differ only in order")
+        raise ValueError(
+            f"Column mismatch for {series_id} shard {shard}: "
+            f"{'; '.join(detail)}. repo={list(rdf.columns)} "
+            f"staged={list(sdf.columns)}. Reconcile requires the staged "
+            "and repo column sets to match; repo-only columns are not "
+            "auto-preserved. Add the missing column(s) to the staged "
+            "series with an 'add_column' transform in the recipe so the "
+            "schemas align."
+        )
+
+    common_idx = sdf.index.intersection(rdf.index)
+    has_new_timestamps = (len(common_idx) != len(sdf.index)) or (
+        len(common_idx) != len(rdf.index)
+    )
+
+    if len(common_idx) == 0:
+        different = True
+    elif has_new_timestamps:
+        different = True
+    else:
+        different = not _values_equal(
+            sdf.loc[common_idx], rdf.loc[common_idx], atol=atol, rtol=rtol
+        )
+
+    if different:
+        reason = "data_changed"
+        if len(common_idx) == 0:
+            reason = "empty_overlap"
+        else:
+            extra_in_staged = sdf.index.difference(rdf.index)
+            extra_in_repo = rdf.index.difference(sdf.index)
+            if len(extra_in_staged) > 0 or len(extra_in_repo) > 0:
+                if len(extra_in_repo) == 0:
+                    if extra_in_staged.min() > rdf.index.max():
+                        reason = "append_only"
+                    elif extra_in_staged.max() < rdf.index.min():
+                        reason = "prepend_only"
+                    else:
+                        reason = "index_mismatch"
+                else:
+                    reason = "index_mismatch"
+            else:
+                reason = "overlap_values_changed"
+
+        return ReconcileAction(
+            series_id=series_id,
+            shard=shard,
+            action="splice_write",
+            reason=reason,
+            staged_path=spath,
+            repo_path=rpath,
+        )
+    return None
+
+
+def _run_repo_vetting(
+    jobs: Sequence[dict], max_workers: Optional[int]
+) -> List[Optional[ReconcileAction]]:
+    """Run :func:`_vet_repo_shard` for each job; results are in job order."""
+    if max_workers is not None and max_workers < 1:
+        raise ValueError("max_workers must be >= 1")
+    if max_workers is None or max_workers == 1 or len(jobs) <= 1:
+        return [_vet_repo_shard(**job) for job in jobs]
+
+    logger.info(
+        "update_repo: vetting %d shard(s) with %d worker process(es)",
+        len(jobs),
+        max_workers,
+    )
+    with concurrent.futures.ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(_vet_repo_shard, **job) for job in jobs]
+        try:
+            return [future.result() for future in futures]
+        except Exception:
+            for pending in futures:
+                pending.cancel()
+            raise
+
+
 def update_repo(
     staged_dir: str,
     repo_dir: str,
@@ -994,6 +1303,7 @@ def update_repo(
     float_format: Optional[str] = None,
     only_series: Optional[Set[str]] = None,
     plan: bool = False,
+    max_workers: Optional[int] = None,
 ) -> List[ReconcileAction]:
     """ Reconcile staged vs repo time-series CSV files (formatted/processed tiers).
 
@@ -1043,7 +1353,9 @@ def update_repo(
     float_format : str or None, optional
         Format string (e.g. ``"%.3f"``) applied to float columns when writing
         reconciled files, so output keeps uniform precision matching the
-        original products. ``None`` uses pandas' default repr.
+        original products. ``None`` uses pandas' default repr. Setting it
+        disables the byte-level append fast path, so every change is parsed
+        and rewritten in this format.
     only_series : set[str] or None, optional
         If provided, reconcile *only* the staged series whose identity (as
         computed by :func:`_series_id_from_name`, i.e. shard-agnostic) is in this
@@ -1055,6 +1367,10 @@ def update_repo(
         the historical whole-directory behavior used by the batch CLI.
     plan : bool, default False
         If True, return planned actions without writing.
+    max_workers : int or None, optional
+        Number of worker processes used to read and compare the inspected
+        shards. ``None`` or 1 vets serially. Writes are always applied serially
+        and the returned actions do not depend on this setting.
 
     Returns
     -------
@@ -1071,6 +1387,10 @@ def update_repo(
     **Rewrite minimization**
 
     - Data-section hashing ignores header churn (e.g., ``date_formatted``).
+    - A staged shard whose data section extends the repo shard byte for byte
+      (the usual nightly delta) is applied by appending only the new rows,
+      without parsing either file. The rows are copied verbatim, so this
+      fast path is skipped when ``float_format`` is given.
     - Parsed comparisons further ignore harmless numeric string formatting changes.
 
     **Deterministic sampling**
@@ -1125,87 +1445,32 @@ def update_repo(
     actions: List[ReconcileAction] = []
     n_candidates = 0
     n_inspected = 0
-
-    for series_id, staged_shards in staged_map.items():
-        repo_shards = repo_map.get(series_id, {})
-
-        if not repo_shards and not allow_new_series:
-            raise ValueError(
-                f"No namesake series found in repo for series_id={series_id!r}. "
-                f"Set allow_new_series=True to initialize new series."
-            )
-
-        changed_old = False
-
-        for shard, spath in staged_shards.items():
-            n_candidates += 1
-            rpath = repo_shards.get(shard)
-
-            if rpath is None:
-                actions.append(
-                    ReconcileAction(
-                        series_id=series_id,
-                        shard=shard,
-                        action="write",
-                        reason="missing_in_repo",
-                        staged_path=spath,
-                        repo_path=os.path.join(repo_dir, os.path.basename(spath)),
-                    )
+    # Shards that need a parsed comparison become vetting jobs. Each staged
+    # shard's outcome is a slot: a ready action or the index of its job.
+    jobs: List[dict] = []
+    job_is_old: List[bool] = []
+    series_slots = []
+
+    # Repo files rarely change between runs; their hashes come from the index
+    # and are only looked up when the cheap data fingerprints agree.
+    with DataHashManifest(repo_dir) as repo_hashes:
+        for series_id, staged_shards in staged_map.items():
+            repo_shards = repo_map.get(series_id, {})
+
+            if not repo_shards and not allow_new_series:
+                raise ValueError(
+                    f"No namesake series found in repo for series_id={series_id!r}. "
+                    f"Set allow_new_series=True to initialize new series."
                 )
-                continue
-
-            _, end_year = _parse_shard(os.path.basename(spath))
-            if end_year is None:
-                inspect = True
-            else:
-                age = this_year - end_year
-                if age < recent_years:
-                    inspect = True
-                elif age > 10:
-                    inspect = _stable_u01(f"{series_id}|{shard}|p10") < p10
-                else:
-                    inspect = _stable_u01(f"{series_id}|{shard}|p3") < p3
 
-            if not inspect:
-                continue
-            n_inspected += 1
-
-            if _hash_data_section(spath) == _hash_data_section(rpath):
-                continue
+            slots = []
 
-            logger.debug(
-                "Comparing staged=%s repo=%s series_id=%s shard=%s",
-                spath,
-                rpath,
-                series_id,
-                shard,
-            )
-
-            try:
-                sdf = read_ts(spath, force_regular=regular, **read_kwargs)
-            except Exception as e:
-                logger.warning("Failed to read staged file %s: %s", spath, e)
-                _quarantine_file(spath)
-                continue
+            for shard, spath in staged_shards.items():
+                n_candidates += 1
+                rpath = repo_shards.get(shard)
 
-            try:
-                rdf = read_ts(rpath, force_regular=regular, **read_kwargs)
-            except NotImplementedError as e:
-                if "force_regular but could not discover freq" in str(e):
-                    logger.warning(
-                        "Repo file could not be regularized; rereading irregular for frequency classification: %s",
-                        rpath,
-                    )
-                    rdf = read_ts(rpath, force_regular=False, **read_kwargs)
-                else:
-                    raise
-            except Exception as e:
-                if file_empty(rpath) and "No columns to parse" in str(e):
-                    logger.warning(
-                        "Repo file appears empty/corrupt, treating as missing: %s",
-                        rpath,
-                    )
-                    actions.append(
+                if rpath is None:
+                    slots.append(
                         ReconcileAction(
                             series_id=series_id,
                             shard=shard,
@@ -1216,162 +1481,67 @@ def update_repo(
                         )
                     )
                     continue
-                logger.info("Error reading repo file %s: %s", rpath, e)
-                logger.error(e, stack_info=True, exc_info=True)
-                raise
 
-            if regular:
-                status, freq_reason, sfreq, rfreq = compare_regular_freq(sdf, rdf)
-            else:
-                # Irregular repos (e.g. structures): skip regular-frequency
-                # classification, which would spuriously flag a frequency
-                # mismatch on genuinely irregular data. Fall through to the
-                # normal index-based reconcile; the splice is applied with
-                # ts_splice so irregular steps are stitched, not shuffled.
-                status, freq_reason, sfreq, rfreq = "both_regular_same", None, None, None
-
-            if status == "dst_irregular":
-                logger.warning(
-                    "Destination irregular; replacing whole file: "
-                    "series_id=%s shard=%s staged=%s repo=%s reason=%s",
-                    series_id, shard, spath, rpath, freq_reason,
-                )
-                actions.append(
-                    ReconcileAction(
-                        series_id=series_id,
-                        shard=shard,
-                        action="replace_write",
-                        reason=freq_reason,
-                        staged_path=spath,
-                        repo_path=rpath,
-                    )
-                )
-                continue
-
-            if status == "src_irregular":
-                logger.warning(
-                    "Staged file irregular; quarantining and skipping: "
-                    "series_id=%s shard=%s staged=%s repo=%s reason=%s",
-                    series_id, shard, spath, rpath, freq_reason,
-                )
-                actions.append(
-                    ReconcileAction(
-                        series_id=series_id,
-                        shard=shard,
-                        action="quarantine_skip",
-                        reason=freq_reason,
-                        staged_path=spath,
-                        repo_path=rpath,
-                    )
-                )
-                continue
+                _, end_year = _parse_shard(os.path.basename(spath))
+                if end_year is None:
+                    inspect = True
+                else:
+                    age = this_year - end_year
+                    if age < recent_years:
+                        inspect = True
+                    elif age > 10:
+                        inspect = _stable_u01(f"{series_id}|{shard}|p10") < p10
+                    else:
+                        inspect = _stable_u01(f"{series_id}|{shard}|p3") < p3
 
-            if status == "both_irregular":
-                logger.warning(
-                    "Both files irregular; quarantining staged and skipping: "
-                    "series_id=%s shard=%s staged=%s repo=%s reason=%s",
-                    series_id, shard, spath, rpath, freq_reason,
-                )
-                actions.append(
-                    ReconcileAction(
-                        series_id=series_id,
-                        shard=shard,
-                        action="quarantine_skip",
-                        reason=freq_reason,
-                        staged_path=spath,
-                        repo_path=rpath,
-                    )
-                )
-                continue
+                if not inspect:
+                    continue
+                n_inspected += 1
 
-            if status == "both_regular_different":
-                logger.warning(
-                    "Frequency mismatch; no merge: "
-                    "series_id=%s shard=%s staged=%s repo=%s staged_freq=%s repo_freq=%s reason=%s",
-                    series_id, shard, spath, rpath, sfreq, rfreq, freq_reason,
-                )
-                action_name = "quarantine_skip" if freq_mismatch == "quarantine" else "replace_write"
-                actions.append(
-                    ReconcileAction(
+                jobs.append(
+                    dict(
                         series_id=series_id,
                         shard=shard,
-                        action=action_name,
-                        reason=freq_reason,
-                        staged_path=spath,
-                        repo_path=rpath,
+                        spath=spath,
+                        rpath=rpath,
+                        repo_hash=(
+                            repo_hashes.data_hash(rpath)
+                            if _data_fingerprint(spath) == _data_fingerprint(rpath)
+                            else None
+                        ),
+                        repo_dir=repo_dir,
+                        regular=regular,
+                        read_kwargs=read_kwargs,
+                        atol=atol,
+                        rtol=rtol,
+                        freq_mismatch=freq_mismatch,
+                        # Appended rows are copied verbatim, so they would not
+                        # honour a requested float_format.
+                        append=float_format is None,
                     )
                 )
-                continue
-
-            # only "both_regular_same" falls through to normal reconcile
-
-            if list(sdf.columns) != list(rdf.columns):
-                repo_only = [c for c in rdf.columns if c not in sdf.columns]
-                staged_only = [c for c in sdf.columns if c not in rdf.columns]
-                detail = []
-                if repo_only:
-                    detail.append(f"present in repo but missing from staged: {repo_only}")
-                if staged_only:
-                    detail.append(f"present in staged but missing from repo: {staged_only}")
-                if not detail:
-                    detail.append("columns differ only in order")
-                raise ValueError(
-                    f"Column mismatch for {series_id} shard {shard}: "
-                    f"{'; '.join(detail)}. repo={list(rdf.columns)} "
-                    f"staged={list(sdf.columns)}. Reconcile requires the staged "
-                    "and repo column sets to match; repo-only columns are not "
-                    "auto-preserved. Add the missing column(s) to the staged "
-                    "series with an 'add_column' transform in the recipe so the "
-                    "schemas align."
+                slots.append(len(jobs) - 1)
+                job_is_old.append(
+                    end_year is not None and (this_year - end_year) > recent_years
                 )
 
-            common_idx = sdf.index.intersection(rdf.index)
-            has_new_timestamps = (len(common_idx) != len(sdf.index)) or (
-                len(common_idx) != len(rdf.index)
-            )
+            series_slots.append((series_id, staged_shards, repo_shards, slots))
 
-            if len(common_idx) == 0:
-                different = True
-            elif has_new_timestamps:
-                different = True
-            else:
-                different = not _values_equal(
-                    sdf.loc[common_idx], rdf.loc[common_idx], atol=atol, rtol=rtol
-                )
-
-            if different:
-                reason = "data_changed"
-                if len(common_idx) == 0:
-                    reason = "empty_overlap"
-                else:
-                    extra_in_staged = sdf.index.difference(rdf.index)
-                    extra_in_repo = rdf.index.difference(sdf.index)
-                    if len(extra_in_staged) > 0 or len(extra_in_repo) > 0:
-                        if len(extra_in_repo) == 0:
-                            if extra_in_staged.min() > rdf.index.max():
-                                reason = "append_only"
-                            elif extra_in_staged.max() < rdf.index.min():
-                                reason = "prepend_only"
-                            else:
-                                reason = "index_mismatch"
-                        else:
-                            reason = "index_mismatch"
-                    else:
-                        reason = "overlap_values_changed"
-
-                if end_year is not None and (this_year - end_year) > recent_years:
-                    changed_old = True
-
-                actions.append(
-                    ReconcileAction(
-                        series_id=series_id,
-                        shard=shard,
-                        action="splice_write",
-                        reason=reason,
-                        staged_path=spath,
-                        repo_path=rpath,
-                    )
-                )
+    # Vet the inspected shards (possibly in parallel), then assemble the
+    # actions in staged order so the result does not depend on max_workers.
+    vetted = _run_repo_vetting(jobs, max_workers)
+    for series_id, staged_shards, repo_shards, slots in series_slots:
+        changed_old = False
+        for slot in slots:
+            if isinstance(slot, ReconcileAction):
+                actions.append(slot)
+                continue
+            action = vetted[slot]
+            if action is None:
+                continue
+            if action.action in ("splice_write", "append_write") and job_is_old[slot]:
+                changed_old = True
+            actions.append(action)
 
         if changed_old:
             existing_action_shards = {a.shard for a in actions if a.series_id == series_id}
@@ -1412,6 +1582,15 @@ def update_repo(
 
     n_updates = len({(a.series_id, a.shard) for a in actions})
     for a in actions:
+        if a.action == "append_write":
+            if _append_tail(a.staged_path, a.repo_path, regular=regular):
+                continue
+            logger.warning(
+                "Staged file is no longer a pure append; splicing instead: %s",
+                a.staged_path,
+            )
+            a = dataclasses.replace(a, action="splice_write")
+
         if a.action == "write":
             if a.repo_path is None:
                 raise ValueError("Internal error: repo_path is None")
@@ -1580,7 +1759,9 @@ def update_flagged_data(
 
     vetted: List[VettedWrite] = []
     if jobs:
-        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+        with DataHashManifest(repo_dir) as repo_hashes, concurrent.futures.ThreadPoolExecutor(
+            max_workers=max_workers
+        ) as executor:
             future_map = {
                 executor.submit(
                     _vet_one_flagged_shard,
@@ -1594,6 +1775,7 @@ def update_flagged_data(
                     value_reference=value_reference,
                     explicit_conflict=explicit_conflict,
                     freq_mismatch=freq_mismatch,   # <-- ADD THIS
+                    repo_hashes=repo_hashes,
                 ): (series_id, shard, spath, rpath)
                 for series_id, shard, spath, rpath in jobs
             }
@@ -1636,6 +1818,12 @@ def update_flagged_data(
                 _quarantine_file(action.staged_path)
             continue
 
+        # --- APPEND_WRITE ---
+        if vetted_write.append_bytes is not None:
+            logger.debug("update_flagged_data apply: %s", _action_debug_string(action))
+            _write_appended(action.repo_path, vetted_write.append_bytes)
+            continue
+
         # --- sanity check ---
         if action.repo_path is None or vetted_write.df_to_write is None:
             raise ValueError("Internal error: vetted write missing repo_path or dataframe")
@@ -0,0 +1,742 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Persistent file index for repository directories.
+
+Repository reads, inventories, reconciliation and directory comparison all
+start by globbing a directory that may hold ~100k shards on a network share,
+which can take seconds per call. When the index is enabled, those listings are
+served from a small SQLite database per directory instead.
+
+Each indexed file records its size, mtime and the year span parsed from its
+name. The file-name metadata from :func:`~dms_datastore.filename.interpret_fname`
+and the header ``unit`` are filled in the first time they are asked for and
+kept until the file changes. The index also serves as a manifest of
+data-section hashes (see :class:`DataHashManifest`), so reconciliation only
+re-hashes repository files whose size or mtime changed.
+
+The index is off unless a location is configured, either with the
+``repo_index`` key in ``dstore_config.yaml`` or the ``DMS_REPO_INDEX``
+environment variable (which wins). The value is either a local directory that
+holds the databases for all repos, or ``adjacent`` to keep the database in a
+``.dms_repo_index`` directory inside each indexed directory. SQLite locking
+is unreliable on some SMB mounts, so a local directory is preferred for shared
+repositories.
+
+Refresh is incremental. A directory is re-scanned only when its mtime has
+changed, which covers files being added, removed or replaced through a rename.
+The scan compares size and mtime of every entry against the index so that
+only new or changed files lose their cached metadata. Files rewritten in place
+do not change the directory mtime; use :func:`refresh_repo_index` (or
+``verify=True``) after such edits.
+
+A change made within the same mtime tick as an earlier scan does not move the
+directory mtime, so a listing is only served without scanning once a second
+scan has found the directory unchanged at the same mtime. No clocks are
+compared, since the client and the file server may disagree. Network file
+systems may also report a stale directory mtime from their attribute cache.
+For repositories written from several hosts, set ``repo_index_trust_dir_mtime:
+false`` in ``dstore_config.yaml`` (or ``DMS_REPO_INDEX_TRUST_MTIME=0``). Every
+lookup then re-scans the directory, and only the per-file metadata is served
+from the index.
+"""
+
+import os
+import glob
+import json
+import time
+import fnmatch
+import sqlite3
+import hashlib
+import logging
+import threading
+import weakref
+from collections import OrderedDict
+
+import pandas as pd
+
+from dms_datastore import dstore_config
+from dms_datastore.filename import interpret_fname, naming_spec, shard_year_span
+from dms_datastore.shard_writer import _hash_data_section
+
+logger = logging.getLogger(__name__)
+
+__all__ = [
+    "index_root",
+    "index_enabled",
+    "index_glob",
+    "refresh_repo_index",
+    "indexed_files",
+    "indexed_fname_meta",
+    "indexed_header_unit",
+    "indexed_header_units",
+    "DataHashManifest",
+    "indexed_data_hash",
+]
+
+INDEX_ENV = "DMS_REPO_INDEX"
+TRUST_ENV = "DMS_REPO_INDEX_TRUST_MTIME"
+ADJACENT = "adjacent"
+ADJACENT_DIR = ".dms_repo_index"
+_FORMAT_VERSION = 1
+
+# A file whose mtime is this close to the time it was hashed may still change
+# within the same mtime tick (SMB and some filesystems use coarse timestamps),
+# so such hashes are not recorded in the manifest.
+_RACY_NS = 2_000_000_000
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS state (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE IF NOT EXISTS files (
+    name TEXT PRIMARY KEY,
+    size INTEGER,
+    mtime_ns INTEGER,
+    syear INTEGER,
+    eyear INTEGER,
+    naming TEXT,
+    meta TEXT,
+    unit TEXT,
+    unit_done INTEGER DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS hashes (
+    name TEXT PRIMARY KEY,
+    size INTEGER,
+    mtime_ns INTEGER,
+    data_hash TEXT
+);
+"""
+
+# Process-wide memo of the latest listing per directory:
+# dirname -> (dir_mtime_ns, confirmed, names)
+_listings = {}
+_listings_lock = threading.Lock()
+
+# Per-thread open connections for per-file lookups, see _ConnectionCache.
+_local = threading.local()
+_CONN_CACHE_SIZE = 8
+
+
+def index_root():
+    """Configured index location, or None if the index is disabled.
+
+    Returns
+    -------
+    str or None
+        A directory path, the string ``'adjacent'``, or None.
+    """
+    root = os.environ.get(INDEX_ENV)
+    if root is None:
+        root = dstore_config.config.get("repo_index")
+    if root is None or str(root).strip().lower() in ("", "none", "false", "off"):
+        return None
+    return str(root)
+
+
+def index_enabled():
+    """True if an index location is configured."""
+    return index_root() is not None
+
+
+def _trust_dir_mtime():
+    """False if every lookup must re-scan the directory (see module notes)."""
+    value = os.environ.get(TRUST_ENV)
+    if value is None:
+        value = dstore_config.config.get("repo_index_trust_dir_mtime", True)
+    return str(value).strip().lower() not in ("0", "false", "no", "off")
+
+
+def _index_path(dirname, root):
+    if root == ADJACENT:
+        # A subdirectory, so that database writes do not touch the mtime of
+        # the indexed directory itself.
+        return os.path.join(dirname, ADJACENT_DIR, "index.sqlite")
+    # Prefix with a digest of the directory so equally named repo directories
+    # on different shares do not collide in a shared root.
+    dirname = os.path.abspath(dirname or ".")
+    digest = hashlib.sha1(dirname.encode("utf-8")).hexdigest()[:16]
+    base = os.path.basename(dirname.rstrip("/\\")) or "root"
+    return os.path.join(root, f"{digest}_{base}.sqlite")
+
+
+def _connect(dirname, root=None, check_same_thread=True):
+    root = index_root() if root is None else root
+    if root is None:
+        raise ValueError("Repository index is not configured")
+    path = _index_path(dirname, root)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    conn = sqlite3.connect(path, timeout=30, check_same_thread=check_same_thread)
+    conn.executescript(_SCHEMA)
+    version = _get_state(conn, "format_version")
+    if version is not None and int(version) != _FORMAT_VERSION:
+        with conn:
+            conn.execute("DELETE FROM files")
+            conn.execute("DELETE FROM hashes")
+            conn.execute("DELETE FROM state")
+    return conn
+
+
+def _close_connections(conns):
+    for conn in conns.values():
+        conn.close()
+    conns.clear()
+
+
+class _ConnectionCache:
+    """The most recently used index connections of one thread.
+
+    At most :data:`_CONN_CACHE_SIZE` stay open; older ones are closed. The
+    rest are closed when the thread ends or at interpreter exit, possibly
+    from another thread, hence ``check_same_thread=False``.
+    """
+
+    def __init__(self):
+        self.conns = OrderedDict()  # (index_root, dirname) -> Connection
+        weakref.finalize(self, _close_connections, self.conns)
+
+    def get(self, root, dirname):
+        key = (root, dirname)
+        conn = self.conns.pop(key, None)
+        if conn is None:
+            conn = _connect(dirname, root, check_same_thread=False)
+        self.conns[key] = conn
+        while len(self.conns) > _CONN_CACHE_SIZE:
+            self.conns.popitem(last=False)[1].close()
+        return conn
+
+
+def _cached_connect(dirname):
+    """Connection to the index of *dirname*, kept open for this thread."""
+    cache = getattr(_local, "cache", None)
+    if cache is None:
+        cache = _local.cache = _ConnectionCache()
+    return cache.get(index_root(), dirname)
+
+
+def _get_state(conn, key):
+    row = conn.execute("SELECT value FROM state WHERE key = ?", (key,)).fetchone()
+    return None if row is None else row[0]
+
+
+def _set_state(conn, **items):
+    conn.executemany(
+        "INSERT OR REPLACE INTO state (key, value) VALUES (?, ?)",
+        [(k, str(v)) for k, v in items.items()],
+    )
+
+
+def _dir_mtime_ns(dirname):
+    try:
+        return os.stat(dirname or ".").st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+
+def _trusted(dir_mtime, seen_mtime, confirmed):
+    return (
+        seen_mtime is not None
+        and int(seen_mtime) == dir_mtime
+        and bool(int(confirmed or 0))
+        and _trust_dir_mtime()
+    )
+
+
+def _scan(conn, dirname, dir_mtime):
+    """Diff the directory against the index and record the result.
+
+    The listing is confirmed when the directory still has the mtime of the
+    previous scan, both before and after this one, and nothing changed.
+    """
+    seen_mtime = _get_state(conn, "dir_mtime_ns")
+    current = {}
+    with os.scandir(dirname or ".") as it:
+        for entry in it:
+            if entry.name.startswith("."):
+                continue
+            try:
+                if not entry.is_file():
+                    continue
+                st = entry.stat()
+            except FileNotFoundError:
+                continue
+            current[entry.name] = (st.st_size, st.st_mtime_ns)
+
+    known = {
+        name: (size, mtime)
+        for name, size, mtime in conn.execute("SELECT name, size, mtime_ns FROM files")
+    }
+    gone = [(name,) for name in known if name not in current]
+    changed = []
+    for name, (size, mtime) in current.items():
+        if known.get(name) == (size, mtime):
+            continue
+        span = shard_year_span(name)
+        syear, eyear = span if span is not None else (None, None)
+        changed.append((name, size, mtime, syear, eyear))
+    confirmed = (
+        not gone
+        and not changed
+        and seen_mtime is not None
+        and int(seen_mtime) == dir_mtime
+        and _dir_mtime_ns(dirname) == dir_mtime
+    )
+
+    with conn:
+        conn.executemany("DELETE FROM files WHERE name = ?", gone)
+        conn.executemany("DELETE FROM hashes WHERE name = ?", gone)
+        conn.executemany(
+            "INSERT OR REPLACE INTO files "
+            "(name, size, mtime_ns, syear, eyear, naming, meta, unit, unit_done) "
+            "VALUES (?, ?, ?, ?, ?, NULL, NULL, NULL, 0)",
+            changed,
+        )
+        _set_state(
+            conn,
+            format_version=_FORMAT_VERSION,
+            dir_mtime_ns=dir_mtime,
+            confirmed=int(confirmed),
+        )
+    if gone or changed:
+        logger.debug(
+            "repo index %s: %d new/changed, %d removed", dirname, len(changed), len(gone)
+        )
+    return confirmed, sorted(current)
+
+
+def _refresh(conn, dirname, force=False):
+    """Bring the index for *dirname* up to date; return the file names."""
+    dir_mtime = _dir_mtime_ns(dirname)
+    if dir_mtime is None:
+        with _listings_lock:
+            _listings.pop(dirname, None)
+        return []
+    if not force and _trusted(
+        dir_mtime, _get_state(conn, "dir_mtime_ns"), _get_state(conn, "confirmed")
+    ):
+        names = [r[0] for r in conn.execute("SELECT name FROM files ORDER BY name")]
+        confirmed = True
+    else:
+        confirmed, names = _scan(conn, dirname, dir_mtime)
+    with _listings_lock:
+        _listings[dirname] = (dir_mtime, confirmed, names)
+    return names
+
+
+def _ensure_current(conn, dirname):
+    """Refresh the index of *dirname* unless this process already holds a
+    trusted listing for it. Unlike :func:`_refresh`, a current index is not
+    read back."""
+    dir_mtime = _dir_mtime_ns(dirname)
+    with _listings_lock:
+        memo = _listings.get(dirname)
+    if dir_mtime is not None and memo is not None and _trusted(dir_mtime, memo[0], memo[1]):
+        return
+    _refresh(conn, dirname)
+
+
+def _dir_names(dirname):
+    dir_mtime = _dir_mtime_ns(dirname)
+    if dir_mtime is None:
+        return []
+    with _listings_lock:
+        memo = _listings.get(dirname)
+    if memo is not None and _trusted(dir_mtime, memo[0], memo[1]):
+        return memo[2]
+    try:
+        conn = _connect(dirname)
+    except (OSError, sqlite3.Error) as exc:
+        logger.warning("Repository index unavailable for %s: %s", dirname, exc)
+        return sorted(
+            n
+            for n in os.listdir(dirname or ".")
+            if not n.startswith(".") and os.path.isfile(os.path.join(dirname, n))
+        )
+    try:
+        return _refresh(conn, dirname)
+    finally:
+        conn.close()
+
+
+def index_glob(pattern):
+    """Sorted files matching *pattern*, served from the index when enabled.
+
+    Only the final path component may contain wildcards for the index to be
+    used; any other pattern, or a disabled index, falls back to
+    :func:`glob.glob`. Like ``glob``, names starting with a dot are skipped.
+    Unlike ``glob``, only regular files are returned.
+
+    Parameters
+    ----------
+    pattern : str
+        Glob pattern such as ``/repo/screened/*_mrz@*_elev_*.csv``.
+
+    Returns
+    -------
+    list of str
+    """
+    dirname, basepat = os.path.split(pattern)
+    if not index_enabled() or glob.has_magic(dirname) or not glob.has_magic(basepat):
+        return sorted(glob.glob(pattern))
+    names = _dir_names(dirname)
+    return [os.path.join(dirname, n) for n in fnmatch.filter(names, basepat)]
+
+
+def refresh_repo_index(dirname, force=True):
+    """Re-scan *dirname* and update its index.
+
+    Parameters
+    ----------
+    dirname : str
+        Repository directory.
+    force : bool
+        If True (default), scan even if the directory mtime is unchanged. This
+        picks up files that were rewritten in place.
+
+    Returns
+    -------
+    int
+        Number of indexed files.
+    """
+    conn = _connect(dirname)
+    try:
+        return len(_refresh(conn, dirname, force=force))
+    finally:
+        conn.close()
+
+
+def _spec(repo, repo_cfg):
+    if repo is None and repo_cfg is None:
+        repo = dstore_config.config.get("default_repo")
+    return naming_spec(repo=repo, repo_cfg=repo_cfg)
+
+
+def _naming_key(spec):
+    text = json.dumps(spec, sort_keys=True, default=str)
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()[:12]
+
+
+def _parse_meta(fname, spec):
+    try:
+        return interpret_fname(fname, naming=spec)
+    except ValueError as exc:
+        return {"__error__": str(exc)}
+
+
+def _header_unit(path):
+    # Imported lazily: read_ts is heavy and not needed just for listings.
+    from dms_datastore.read_ts import read_header_fields
+
+    try:
+        return read_header_fields(path, ["unit"]).get("unit")
+    except (ValueError, OSError):
+        return None
+
+
+def _fill_meta(conn, rows, spec):
+    key = _naming_key(spec)
+    updates = []
+    for row in rows:
+        if row["naming"] != key or row["meta"] is None:
+            row["meta"] = json.dumps(_parse_meta(row["name"], spec))
+            row["naming"] = key
+            updates.append((key, row["meta"], row["name"]))
+    if updates:
+        with conn:
+            conn.executemany(
+                "UPDATE files SET naming = ?, meta = ? WHERE name = ?", updates
+            )
+
+
+def _fill_unit(conn, dirname, rows):
+    updates = []
+    for row in rows:
+        if not row["unit_done"]:
+            row["unit"] = _header_unit(os.path.join(dirname, row["name"]))
+            row["unit_done"] = 1
+            updates.append((row["unit"], row["name"]))
+    if updates:
+        with conn:
+            conn.executemany(
+                "UPDATE files SET unit = ?, unit_done = 1 WHERE name = ?", updates
+            )
+
+
+def _select_rows(conn, names):
+    conn.row_factory = sqlite3.Row
+    rows = []
+    # Stay below SQLite's host-parameter limit.
+    for i in range(0, len(names), 500):
+        chunk = names[i : i + 500]
+        marks = ",".join("?" * len(chunk))
+        rows.extend(
+            dict(r)
+            for r in conn.execute(f"SELECT * FROM files WHERE name IN ({marks})", chunk)
+        )
+    conn.row_factory = None
+    order = {n: i for i, n in enumerate(names)}
+    rows.sort(key=lambda r: order[r["name"]])
+    return rows
+
+
+def indexed_files(
+    dirname, pattern="*", repo=None, repo_cfg=None, unit=False, verify=False
+):
+    """Index records for the files in *dirname* matching *pattern*.
+
+    Parameters
+    ----------
+    dirname : str
+        Repository directory.
+    pattern : str
+        Wildcard pattern for the file names.
+    repo, repo_cfg :
+        Repository whose ``filename_templates`` are used for the ``meta``
+        column. Defaults to the configured default repo.
+    unit : bool
+        If True, include the header ``unit`` (read once per file and cached).
+    verify : bool
+        If True, re-scan even if the directory mtime is unchanged.
+
+    Returns
+    -------
+    pandas.DataFrame
+        One row per file with columns ``path``, ``filename``, ``size``,
+        ``mtime_ns``, ``syear``, ``eyear``, ``meta`` (dict, or None if the name
+        does not follow the templates) and, if requested, ``unit``.
+    """
+    spec = _spec(repo, repo_cfg)
+    conn = _connect(dirname)
+    try:
+        names = fnmatch.filter(_refresh(conn, dirname, force=verify), pattern)
+        rows = _select_rows(conn, names)
+        _fill_meta(conn, rows, spec)
+        if unit:
+            _fill_unit(conn, dirname, rows)
+    finally:
+        conn.close()
+
+    records = []
+    for row in rows:
+        meta = json.loads(row["meta"])
+        rec = {
+            "path": os.path.join(dirname, row["name"]),
+            "filename": row["name"],
+            "size": row["size"],
+            "mtime_ns": row["mtime_ns"],
+            "syear": row["syear"],
+            "eyear": row["eyear"],
+            "meta": None if "__error__" in meta else meta,
+        }
+        if unit:
+            rec["unit"] = row["unit"]
+        records.append(rec)
+    columns = ["path", "filename", "size", "mtime_ns", "syear", "eyear", "meta"]
+    return pd.DataFrame(records, columns=columns + (["unit"] if unit else []))
+
+
+def _group_by_dir(paths):
+    groups = {}
+    for i, p in enumerate(paths):
+        dirname, name = os.path.split(p)
+        groups.setdefault(dirname, []).append((i, name))
+    return groups
+
+
+def indexed_fname_meta(paths, repo=None, repo_cfg=None):
+    """:func:`~dms_datastore.filename.interpret_fname` for many files at once.
+
+    Results are cached in the index, so repeated inventories of an unchanged
+    repository do not parse the names again. Falls back to calling
+    ``interpret_fname`` directly when the index is disabled.
+
+    Parameters
+    ----------
+    paths : list of str
+        Files to interpret.
+    repo, repo_cfg :
+        Repository whose ``filename_templates`` are used.
+
+    Returns
+    -------
+    list of dict
+        Metadata in the order of *paths*.
+
+    Raises
+    ------
+    ValueError
+        If a name does not match any template, as ``interpret_fname`` does.
+    """
+    spec = _spec(repo, repo_cfg)
+    if not index_enabled():
+        return [interpret_fname(p, naming=spec) for p in paths]
+    out = [None] * len(paths)
+    for dirname, items in _group_by_dir(paths).items():
+        conn = _connect(dirname)
+        try:
+            _refresh(conn, dirname)
+            rows = {r["name"]: r for r in _select_rows(conn, [n for _, n in items])}
+            _fill_meta(conn, list(rows.values()), spec)
+        finally:
+            conn.close()
+        for i, name in items:
+            row = rows.get(name)
+            meta = json.loads(row["meta"]) if row else _parse_meta(name, spec)
+            if "__error__" in meta:
+                raise ValueError(meta["__error__"])
+            out[i] = meta
+    return out
+
+
+def indexed_header_units(paths):
+    """Header ``unit`` of many files, cached in the index when enabled.
+
+    Each directory is refreshed once and only the requested rows are read,
+    so an inventory costs one query per directory rather than one per file.
+
+    Parameters
+    ----------
+    paths : list of str
+        Files whose unit is wanted.
+
+    Returns
+    -------
+    list
+        Units in the order of *paths*; None where a file has no parseable
+        header or no unit.
+    """
+    if not index_enabled():
+        return [_header_unit(p) for p in paths]
+    out = [None] * len(paths)
+    for dirname, items in _group_by_dir(paths).items():
+        conn = _cached_connect(dirname)
+        _ensure_current(conn, dirname)
+        rows = {r["name"]: r for r in _select_rows(conn, [n for _, n in items])}
+        _fill_unit(conn, dirname, list(rows.values()))
+        for i, name in items:
+            row = rows.get(name)
+            out[i] = row["unit"] if row else _header_unit(os.path.join(dirname, name))
+    return out
+
+
+def indexed_header_unit(path):
+    """Header ``unit`` of *path*, cached in the index when enabled.
+
+    Returns None if the file has no parseable header or no unit. Use
+    :func:`indexed_header_units` to look up many files at once.
+    """
+    return indexed_header_units([path])[0]
+
+
+class DataHashManifest:
+    """Data-section hashes of the files in one directory, cached in the index.
+
+    :func:`~dms_datastore.shard_writer._hash_data_section` streams a whole
+    file through SHA-256. The manifest keeps ``(size, mtime, data_hash)`` per
+    file in the directory's index database and only re-hashes files whose
+    size or mtime changed. Files modified within the last couple of seconds
+    are hashed but not recorded, because a same-tick rewrite would not change
+    their mtime. When the index is disabled every call simply hashes the file.
+
+    The manifest may be shared between threads. New hashes are written to the
+    database when the manifest is closed; use it as a context manager::
+
+        with DataHashManifest(repo_dir) as manifest:
+            digest = manifest.data_hash(os.path.join(repo_dir, fname))
+
+    Parameters
+    ----------
+    dirname : str
+        Directory whose files are hashed.
+    """
+
+    def __init__(self, dirname):
+        self.dirname = os.path.abspath(dirname or ".")
+        self._lock = threading.Lock()
+        self._known = {}
+        self._pending = {}
+        self._conn = None
+        if not index_enabled():
+            return
+        try:
+            self._conn = _connect(self.dirname, check_same_thread=False)
+            self._known = {
+                name: (size, mtime, digest)
+                for name, size, mtime, digest in self._conn.execute(
+                    "SELECT name, size, mtime_ns, data_hash FROM hashes"
+                )
+            }
+        except (OSError, sqlite3.Error) as exc:
+            logger.warning("Hash manifest unavailable for %s: %s", dirname, exc)
+            self._conn = None
+
+    def cached_hash(self, path):
+        """Recorded data-section hash of *path* if still valid, else None.
+
+        Never reads the file, so it is a cheap first check before
+        :meth:`data_hash`.
+        """
+        dirname, name = os.path.split(os.path.abspath(path))
+        if self._conn is None or dirname != self.dirname:
+            return None
+        st = os.stat(path)
+        with self._lock:
+            rec = self._known.get(name)
+        if rec is not None and rec[:2] == (st.st_size, st.st_mtime_ns):
+            return rec[2]
+        return None
+
+    def data_hash(self, path):
+        """Data-section hash of *path*, from the manifest when still valid."""
+        dirname, name = os.path.split(os.path.abspath(path))
+        if self._conn is None or dirname != self.dirname:
+            return _hash_data_section(path)
+        digest = self.cached_hash(path)
+        if digest is not None:
+            return digest
+        st = os.stat(path)
+        digest = _hash_data_section(path)
+        if time.time_ns() - st.st_mtime_ns > _RACY_NS:
+            with self._lock:
+                self._known[name] = (st.st_size, st.st_mtime_ns, digest)
+                self._pending[name] = self._known[name]
+        return digest
+
+    def flush(self):
+        """Write newly computed hashes to the database."""
+        if self._conn is None:
+            return
+        with self._lock:
+            rows = [(n, *rec) for n, rec in self._pending.items()]
+            self._pending = {}
+        if not rows:
+            return
+        try:
+            with self._conn:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO hashes (name, size, mtime_ns, data_hash) "
+                    "VALUES (?, ?, ?, ?)",
+                    rows,
+                )
+        except sqlite3.Error as exc:
+            logger.warning("Could not update hash manifest for %s: %s", self.dirname, exc)
+
+    def close(self):
+        """Flush and release the database connection."""
+        if self._conn is not None:
+            self.flush()
+            self._conn.close()
+            self._conn = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def indexed_data_hash(path):
+    """Data-section hash of *path*, served from the index when still valid.
+
+    Opens the directory's manifest for a single lookup; use
+    :class:`DataHashManifest` directly when hashing many files.
+    """
+    with DataHashManifest(os.path.dirname(path)) as manifest:
+        return manifest.data_hash(path)
@@ -0,0 +1,410 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Throughput benchmark of the screening pipeline.
+
+Runs the screening protocol of a config over synthetic series of several
+parameters, frequencies and lengths (and optionally over sample files and a
+whole repository through :func:`~dms_datastore.auto_screen.auto_screen`) and
+reports wall time, peak memory and rows per second, in total and per step.
+Results are JSON, so runs on different commits can be compared directly.
+
+Per-step numbers come from the ``step_hook`` of
+:func:`~dms_datastore.auto_screen.screener`; the same hook is available in
+production runs with ``auto_screen --step-timing``.
+
+Timings are the best of ``repeat`` runs. Memory is measured with
+:mod:`tracemalloc` in a separate run, because tracing slows allocation-heavy
+code down; it covers allocations of the benchmarking process only.
+"""
+
+import copy
+import datetime
+import glob
+import json
+import logging
+import os
+import platform
+import shutil
+import tempfile
+import time
+import tracemalloc
+
+import click
+import numpy as np
+import pandas as pd
+
+from dms_datastore import __version__
+from dms_datastore.dstore_config import config_file
+from dms_datastore.filename import interpret_fname
+from dms_datastore.read_ts import read_ts
+
+logger = logging.getLogger(__name__)
+
+__all__ = [
+    "synthetic_series",
+    "benchmark_screener",
+    "benchmark_auto_screen",
+    "run_benchmarks",
+]
+
+DEFAULT_PARAMS = ("elev", "ec", "flow")
+DEFAULT_FREQS = ("15min", "1h")
+DEFAULT_YEARS = (1, 10, 30)
+ENGINES = ("pandas", "fused")
+
+
+def synthetic_series(param, freq="15min", years=1, seed=0):
+    """Synthetic series shaped like observations of *param*.
+
+    ``elev`` is tidal, ``flow`` is rounded with long runs of repeated values,
+    anything else looks like EC: a slow seasonal signal with multiplicative
+    spikes. All series get noise, scattered missing values and a few gaps.
+
+    Parameters
+    ----------
+    param : str
+        Parameter the series should resemble.
+    freq : str
+        Pandas frequency of the series.
+    years : int
+        Length of the series in years.
+    seed : int
+        Seed of the random generator.
+
+    Returns
+    -------
+    pandas.DataFrame
+        Frame with a ``value`` column and a regular ``datetime`` index.
+    """
+    rng = np.random.default_rng(seed)
+    start = pd.Timestamp("2000-01-01")
+    index = pd.date_range(start, start + pd.DateOffset(years=years), freq=freq,
+                          inclusive="left", name="datetime")
+    n = len(index)
+    hours = (index - start) / pd.Timedelta(hours=1)
+    hours = np.asarray(hours, dtype="float64")
+    if param == "elev":
+        v = (3.0 + np.sin(hours * 2 * np.pi / 12.42) + 0.4 * np.sin(hours * 2 * np.pi / 23.93)
+             + 0.02 * rng.standard_normal(n))
+        spikes = rng.random(n) < 0.001
+        v[spikes] += rng.choice([-3.0, 3.0], spikes.sum())
+    elif param == "flow":
+        v = np.round(1000 + 800 * np.sin(hours * 2 * np.pi / 8766.0)
+                     + 20 * rng.standard_normal(n), -1)
+        for s0 in rng.integers(0, max(n - 50, 1), max(n // 2000, 1)):
+            v[s0:s0 + rng.integers(3, 48)] = v[s0]
+    else:
+        v = 800 + 200 * np.sin(hours * 2 * np.pi / 8766.0) + 5 * rng.standard_normal(n)
+        spikes = rng.random(n) < 0.002
+        v[spikes] *= rng.choice([0.2, 5.0], spikes.sum())
+    v[rng.random(n) < 0.005] = np.nan
+    for s0 in rng.integers(0, max(n - 200, 1), max(n // 20000, 1)):
+        v[s0:s0 + rng.integers(1, 200)] = np.nan
+    return pd.DataFrame({"value": v}, index=index)
+
+
+class _StepRecorder(object):
+    """Step hook collecting the time (and traced peak memory) of each step."""
+
+    def __init__(self):
+        self.steps = []
+
+    def __call__(self, label, seconds, nrows):
+        record = {"label": label, "seconds": seconds, "rows": nrows,
+                  "rows_per_s": _rate(nrows, seconds), "peak_bytes": None}
+        if tracemalloc.is_tracing():
+            record["peak_bytes"] = tracemalloc.get_traced_memory()[1]
+            tracemalloc.reset_peak()
+        self.steps.append(record)
+
+
+class _StepTotals(object):
+    """Step hook summing the time of each step label over many series."""
+
+    def __init__(self):
+        self.totals = {}
+
+    def __call__(self, label, seconds, nrows):
+        total = self.totals.setdefault(label, {"label": label, "seconds": 0.0, "rows": 0, "calls": 0})
+        total["seconds"] += seconds
+        total["rows"] += nrows
+        total["calls"] += 1
+
+    def steps(self):
+        return [dict(t, rows_per_s=_rate(t["rows"], t["seconds"])) for t in self.totals.values()]
+
+
+def _rate(rows, seconds):
+    return rows / seconds if seconds > 0 else None
+
+
+def _traced(func):
+    """Run *func* under tracemalloc; return its result and the peak in bytes."""
+    tracing = tracemalloc.is_tracing()
+    if not tracing:
+        tracemalloc.start()
+    tracemalloc.reset_peak()
+    try:
+        result = func()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        if not tracing:
+            tracemalloc.stop()
+    return result, peak
+
+
+def benchmark_screener(ts, protocol, param, station_id="bench", subloc="default",
+                       fused=False, repeat=3, trace_memory=True):
+    """Time :func:`~dms_datastore.auto_screen.screener` on one series.
+
+    Parameters
+    ----------
+    ts : pandas.DataFrame
+        Series to screen; it is copied for every run.
+    protocol : dict
+        Screening protocol; it is copied for every run.
+    param : str
+        Parameter passed to the screener.
+    station_id, subloc : str
+        Passed to the screener for binding step args.
+    fused : bool
+        Use the fused engine of :mod:`dms_datastore.screen_engine`.
+    repeat : int
+        Number of timed runs; the fastest is reported.
+    trace_memory : bool
+        Also measure peak memory in one extra run.
+
+    Returns
+    -------
+    dict
+        ``rows``, ``seconds``, ``rows_per_s``, ``peak_bytes`` and a ``steps``
+        list with the same numbers per step.
+    """
+    from dms_datastore.auto_screen import screener
+
+    def screen(hook):
+        return screener(ts.copy(), station_id, subloc, param, copy.deepcopy(protocol),
+                        fused=fused, step_hook=hook)
+
+    best = None
+    for _ in range(max(repeat, 1)):
+        recorder = _StepRecorder()
+        started = time.perf_counter()
+        screen(recorder)
+        elapsed = time.perf_counter() - started
+        if best is None or elapsed < best[0]:
+            best = (elapsed, recorder.steps)
+    elapsed, steps = best
+    result = {
+        "rows": len(ts),
+        "seconds": elapsed,
+        "rows_per_s": _rate(len(ts), elapsed),
+        "peak_bytes": None,
+        "steps": steps,
+    }
+    if trace_memory:
+        recorder = _StepRecorder()
+        _, peak = _traced(lambda: screen(recorder))
+        result["peak_bytes"] = max([peak] + [s["peak_bytes"] for s in recorder.steps])
+        for step, traced in zip(steps, recorder.steps):
+            step["peak_bytes"] = traced["peak_bytes"]
+    return result
+
+
+def _count_rows(dest):
+    """Number of data rows in the csv shards written to *dest*."""
+    rows = 0
+    for fpath in glob.glob(os.path.join(dest, "*.csv")):
+        with open(fpath, "rb") as f:
+            lines = sum(1 for line in f if not line.startswith(b"#"))
+        rows += max(lines - 1, 0)  # column header
+    return rows
+
+
+def benchmark_auto_screen(output_naming="screened", repo="formatted", fpath=None, config=None,
+                          stations=None, params=None, workers=1, fused=False):
+    """Time an :func:`~dms_datastore.auto_screen.auto_screen` run over a repository.
+
+    Output goes to a temporary directory that is removed afterwards. Step
+    times and memory are only reported with ``workers=1``, because the other
+    workers run in separate processes.
+
+    Returns
+    -------
+    dict
+        ``rows`` (written), ``seconds``, ``rows_per_s``, ``peak_bytes`` and
+        ``steps`` summed over all series.
+    """
+    from dms_datastore.auto_screen import auto_screen
+
+    dest = tempfile.mkdtemp(prefix="screen_benchmark_")
+    totals = _StepTotals() if workers == 1 else None
+    try:
+        def run():
+            return auto_screen(output_naming, repo=repo, fpath=fpath, config=config, dest=dest,
+                               stations=stations, params=params, workers=workers, fused=fused,
+                               step_hook=totals)
+
+        started = time.perf_counter()
+        if workers == 1:
+            _, peak = _traced(run)
+        else:
+            run()
+            peak = None
+        elapsed = time.perf_counter() - started
+        rows = _count_rows(dest)
+    finally:
+        shutil.rmtree(dest, ignore_errors=True)
+    return {
+        "rows": rows,
+        "seconds": elapsed,
+        "rows_per_s": _rate(rows, elapsed),
+        "peak_bytes": peak,
+        "steps": totals.steps() if totals is not None else None,
+    }
+
+
+def _environment():
+    versions = {"dms_datastore": __version__, "numpy": np.__version__, "pandas": pd.__version__}
+    try:
+        import vtools
+
+        versions["vtools"] = getattr(vtools, "__version__", None)
+    except ImportError:
+        versions["vtools"] = None
+    return {
+        "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "versions": versions,
+    }
+
+
+def _protocol(screen_config, param, region=None):
+    from dms_datastore.auto_screen import _merge_protocol
+
+    return _merge_protocol(screen_config, region, "bench", param)
+
+
+def run_benchmarks(config=None, params=DEFAULT_PARAMS, freqs=DEFAULT_FREQS, years=DEFAULT_YEARS,
+                   engines=ENGINES, samples=(), sample_repo="formatted", region=None, repeat=3,
+                   trace_memory=True):
+    """Benchmark screening of synthetic and sample series.
+
+    Parameters
+    ----------
+    config : str or dict, optional
+        Screening config; default the configured ``screen_config``.
+    params : sequence of str
+        Parameters of the synthetic series; each is screened with its protocol.
+    freqs : sequence of str
+        Frequencies of the synthetic series.
+    years : sequence of int
+        Lengths of the synthetic series in years.
+    engines : sequence of str
+        ``'pandas'`` and/or ``'fused'``.
+    samples : sequence of str
+        Files read with :func:`~dms_datastore.read_ts.read_ts` and screened
+        with the protocol of the param in their file name.
+    sample_repo : str
+        Repo whose file naming the samples follow.
+    region : str, optional
+        Region of the config whose protocol overrides apply.
+    repeat : int
+        Timed runs per case.
+    trace_memory : bool
+        Measure peak memory per case.
+
+    Returns
+    -------
+    dict
+        ``environment`` and a list of ``cases``.
+    """
+    from dms_datastore.auto_screen import _load_screen_config
+
+    screen_config = _load_screen_config(config_file("screen_config") if config is None else config)
+    cases = []
+
+    def add_cases(ts, param, description):
+        protocol = _protocol(screen_config, param, region)
+        for engine in engines:
+            logger.info(f"benchmark {description} engine={engine}")
+            result = benchmark_screener(ts, protocol, param, fused=engine == "fused",
+                                        repeat=repeat, trace_memory=trace_memory)
+            cases.append(dict(description, engine=engine, **result))
+
+    for param in params:
+        for freq in freqs:
+            for nyear in years:
+                ts = synthetic_series(param, freq=freq, years=nyear)
+                add_cases(ts, param, {"source": "synthetic", "param": param, "freq": freq,
+                                      "years": nyear})
+    for sample in samples:
+        param = interpret_fname(os.path.basename(sample), repo=sample_repo)["param"]
+        ts = read_ts(sample)
+        if "value" in ts.columns:
+            ts = ts[["value"]]
+        span = (ts.index[-1] - ts.index[0]) / pd.Timedelta(days=365.25) if len(ts) else 0.0
+        add_cases(ts, param, {"source": os.path.abspath(sample), "param": param,
+                              "freq": getattr(ts.index, "freqstr", None), "years": round(span, 2)})
+    return {"environment": _environment(), "cases": cases}
+
+
+@click.command()
+@click.option("--config", type=str, default=None,
+              help="Screening config yaml or its label; default the configured screen_config.")
+@click.option("--params", multiple=True, default=DEFAULT_PARAMS, show_default=True,
+              help="Parameters screened, in the synthetic series and the auto_screen run.")
+@click.option("--freq", "freqs", multiple=True, default=DEFAULT_FREQS, show_default=True,
+              help="Frequencies of the synthetic series.")
+@click.option("--years", multiple=True, type=int, default=DEFAULT_YEARS, show_default=True,
+              help="Lengths of the synthetic series in years.")
+@click.option("--engine", type=click.Choice(["pandas", "fused", "both"]), default="both",
+              show_default=True, help="Screening engine(s) to time.")
+@click.option("--sample", "samples", multiple=True, type=click.Path(exists=True),
+              help="Series file to screen in addition to the synthetic series.")
+@click.option("--region", type=str, default=None,
+              help="Region whose protocol overrides apply to the series.")
+@click.option("--repeat", type=click.IntRange(min=1), default=3, show_default=True,
+              help="Timed runs per case; the fastest is reported.")
+@click.option("--no-memory", is_flag=True, help="Skip the memory-traced run of each case.")
+@click.option("--fpath", type=str, default=None,
+              help="Also time auto_screen over the series in this directory.")
+@click.option("--repo", type=str, default="formatted", show_default=True,
+              help="Repo whose file naming --sample and --fpath files follow.")
+@click.option("--stations", multiple=True, help="Stations for the auto_screen run.")
+@click.option("--workers", type=click.IntRange(min=1), default=1, show_default=True,
+              help="Workers of the auto_screen run.")
+@click.option("--output", type=click.Path(dir_okay=False), default=None,
+              help="JSON file for the results; default stdout.")
+@click.help_option("-h", "--help")
+def screen_benchmark_cli(config, params, freqs, years, engine, samples, region, repeat, no_memory,
+                         fpath, repo, stations, workers, output):
+    """Benchmark screening throughput and report per-step timings as JSON."""
+    if config is not None and not os.path.exists(config):
+        config = config_file(config)
+    engines = ENGINES if engine == "both" else (engine,)
+    results = run_benchmarks(config=config, params=params, freqs=freqs, years=years,
+                             engines=engines, samples=samples, sample_repo=repo, region=region,
+                             repeat=repeat,
+                             trace_memory=not no_memory)
+    if fpath is not None:
+        for eng in engines:
+            result = benchmark_auto_screen(
+                repo=repo, fpath=fpath,
+                config=config_file("screen_config") if config is None else config,
+                stations=list(stations) or None, params=list(params), workers=workers,
+                fused=eng == "fused",
+            )
+            results["cases"].append(dict({"source": "auto_screen", "fpath": os.path.abspath(fpath),
+                                          "workers": workers, "engine": eng}, **result))
+    text = json.dumps(results, indent=2)
+    if output is None:
+        click.echo(text)
+    else:
+        with open(output, "w") as f:
+            f.write(text + "\n")
+
+
+if __name__ == "__main__":
+    screen_benchmark_cli()
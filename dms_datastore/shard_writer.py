@@ -0,0 +1,269 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Atomic, write-if-changed output of repository shards.
+
+Every shard writer in the package (:func:`~dms_datastore.write_ts.write_ts_csv`,
+the reconcile and download tools) goes through :func:`write_shard`. The file is
+written to a temporary file next to the destination and moved into place with
+:func:`os.replace`, so readers and mirrors never see a partially written shard.
+The new file keeps the permission bits and group of the shard it replaces.
+
+If the destination already exists and the new file has the same data section
+(as hashed by :func:`_hash_data_section`) and the same header apart from
+volatile keys such as ``date_formatted``, the temporary file is discarded and
+the destination is left untouched. Its mtime is kept, so
+reformatting a repository does not re-ship unchanged shards to rsync mirrors.
+
+Equality of data sections is tiered (:func:`_same_data_section`): the length
+and the first and last :data:`FINGERPRINT_BYTES` of each data section are
+compared before anything streams a whole file through the hash. Changed shards
+nearly always differ in length or in their tail, so only the rare pairs that
+agree on this fingerprint pay for the full hash.
+
+:func:`write_shards` writes a batch of shards concurrently on a thread pool.
+"""
+
+import concurrent.futures
+import hashlib
+import logging
+import os
+import shutil
+import threading
+
+logger = logging.getLogger(__name__)
+
+__all__ = ["write_shard", "write_shards"]
+
+#: Header keys rewritten on every write that do not count as a change.
+VOLATILE_HEADER_KEYS = ("date_formatted",)
+
+DEFAULT_WORKERS = 4
+
+#: Bytes at each end of the data section covered by :func:`_data_fingerprint`.
+FINGERPRINT_BYTES = 4096
+
+
+def _skip_header(f, comment: bytes = b"#") -> None:
+    """Position binary file *f* at the first line after the comment header."""
+    while True:
+        pos = f.tell()
+        line = f.readline()
+        if not line or not line.startswith(comment):
+            f.seek(pos)
+            return
+
+
+def _hash_data_section(path: str, comment: str = "#") -> str:
+    """ Hash the data portion of a time-series CSV.
+
+    This function skips the leading commented YAML-like header (lines beginning
+    with ``comment``) and hashes the remaining bytes.
+
+    Parameters
+    ----------
+    path : str
+        Path to a CSV file written in the dms-datastore format (commented header
+        followed by a CSV table).
+    comment : str, default '#'
+        Comment prefix used for header lines.
+
+    Returns
+    -------
+    digest : str
+        Hex-encoded SHA256 digest of the non-header bytes.
+
+    Notes
+    -----
+    This is used as a fast path to avoid rewriting files when only metadata changes
+    (e.g., ``date_formatted`` updates). When hashes differ, the code may fall back
+    to parsed-data comparison to ignore benign formatting differences in numeric
+    strings.
+    """
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        _skip_header(f, comment.encode("utf-8"))
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _data_fingerprint(path, comment: str = "#", nbytes: int = FINGERPRINT_BYTES):
+    """ Cheap fingerprint of the data section of a time-series CSV.
+
+    Parameters
+    ----------
+    path : str
+        Path to a CSV file in the dms-datastore format.
+    comment : str, default '#'
+        Comment prefix used for header lines.
+    nbytes : int
+        Number of bytes hashed at each end of the data section.
+
+    Returns
+    -------
+    fingerprint : tuple
+        ``(length, head_digest, tail_digest)``: the byte length of the data
+        section and digests of its first and last *nbytes* bytes. Different
+        fingerprints mean different data sections; equal fingerprints have to
+        be confirmed with :func:`_hash_data_section`.
+    """
+    with open(path, "rb") as f:
+        _skip_header(f, comment.encode("utf-8"))
+        start = f.tell()
+        length = os.fstat(f.fileno()).st_size - start
+        head = f.read(min(nbytes, length))
+        f.seek(start + max(length - nbytes, 0))
+        tail = f.read()
+    return (
+        length,
+        hashlib.blake2b(head, digest_size=16).digest(),
+        hashlib.blake2b(tail, digest_size=16).digest(),
+    )
+
+
+def _same_data_section(path_a, path_b, hash_a=None, hash_b=None):
+    """ True if two files have identical data sections.
+
+    The fingerprints are compared first; the full hashes only when they agree.
+
+    Parameters
+    ----------
+    path_a, path_b : str
+        Files to compare.
+    hash_a, hash_b : callable, optional
+        Functions returning the full data-section hash of a path, e.g.
+        :meth:`~dms_datastore.repo_index.DataHashManifest.data_hash`. Default
+        :func:`_hash_data_section`.
+    """
+    if _data_fingerprint(path_a) != _data_fingerprint(path_b):
+        return False
+    hash_a = _hash_data_section if hash_a is None else hash_a
+    hash_b = _hash_data_section if hash_b is None else hash_b
+    return hash_a(path_a) == hash_b(path_b)
+
+
+def _stable_header(path, comment=b"#"):
+    """Leading comment lines of *path* without the volatile keys."""
+    lines = []
+    with open(path, "rb") as f:
+        for line in f:
+            if not line.startswith(comment):
+                break
+            key = line[len(comment):].split(b":", 1)[0].strip()
+            if key.decode("utf-8", "replace") in VOLATILE_HEADER_KEYS:
+                continue
+            lines.append(line.rstrip(b"\r\n"))
+    return lines
+
+
+def _unchanged(new, old):
+    if not os.path.exists(old):
+        return False
+    if _stable_header(new) != _stable_header(old):
+        return False
+    return _same_data_section(new, old)
+
+
+def _copy_permissions(src, dst):
+    """Give *dst* the permission bits and, where allowed, the group of *src*."""
+    try:
+        st = os.stat(src)
+    except FileNotFoundError:
+        return
+    shutil.copymode(src, dst)
+    if hasattr(os, "chown") and os.stat(dst).st_gid != st.st_gid:
+        try:
+            os.chown(dst, -1, st.st_gid)
+        except OSError:
+            pass
+
+
+def write_shard(path, write, skip_unchanged=True, binary=False):
+    """Atomically write one shard.
+
+    Parameters
+    ----------
+    path : str or path-like
+        Destination file. Parent directories are created as needed.
+    write : callable
+        Called with a text file open for writing (utf-8, ``"\\n"`` newlines)
+        and expected to write the complete file, header included.
+    skip_unchanged : bool
+        If True and *path* exists with the same data section and header
+        (ignoring :data:`VOLATILE_HEADER_KEYS`), leave it untouched.
+    binary : bool
+        If True, *write* is called with a binary file instead.
+
+    Returns
+    -------
+    bool
+        True if *path* was (re)written, False if it was unchanged.
+    """
+    path = os.fspath(path)
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        if binary:
+            f = open(tmp, "wb", buffering=1 << 20)
+        else:
+            f = open(tmp, "w", encoding="utf-8", newline="\n", buffering=1 << 20)
+        with f:
+            write(f)
+        if skip_unchanged and _unchanged(tmp, path):
+            logger.debug("Shard unchanged, not rewritten: %s", path)
+            os.remove(tmp)
+            return False
+        # A fresh file gets umask defaults; keep the shard's own mode and
+        # group, which matter on shared repositories.
+        _copy_permissions(path, tmp)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+    return True
+
+
+def write_shards(shards, max_workers=None, skip_unchanged=True):
+    """Write several shards concurrently with :func:`write_shard`.
+
+    Parameters
+    ----------
+    shards : iterable of (path, write)
+        Destinations and the callables that write them.
+    max_workers : int, optional
+        Size of the thread pool, default :data:`DEFAULT_WORKERS`. With one
+        worker or one shard the writes are done serially.
+    skip_unchanged : bool
+        Passed to :func:`write_shard`.
+
+    Returns
+    -------
+    list of str
+        Paths that were (re)written, in the order given.
+
+    Raises
+    ------
+    Exception
+        The first error raised by any shard, after all writes have finished.
+        Shards that failed keep their previous contents.
+    """
+    shards = [(os.fspath(p), w) for p, w in shards]
+    workers = DEFAULT_WORKERS if max_workers is None else max_workers
+    if workers < 1:
+        raise ValueError("max_workers must be >= 1")
+    workers = min(workers, len(shards))
+    if workers <= 1:
+        return [p for p, w in shards if write_shard(p, w, skip_unchanged)]
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(write_shard, p, w, skip_unchanged) for p, w in shards]
+        concurrent.futures.wait(futures)
+    written = []
+    for (path, _), fut in zip(shards, futures):
+        exc = fut.exception()
+        if exc is not None:
+            raise exc
+        if fut.result():
+            written.append(path)
+    return written
@@ -0,0 +1,320 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Binary (Parquet) sidecar cache for parsed repository shards.
+
+Reading a dms1 shard means parsing text, datetimes and padded values on every
+call. When the sidecar cache is enabled, :func:`~dms_datastore.read_ts.read_ts`
+stores the parsed frame of a whole-file dms1 read as a Parquet file and serves
+later reads of the same, unchanged shard from it.
+
+The cache is off unless a location is configured, either with the
+``sidecar_cache`` key in ``dstore_config.yaml`` or the ``DMS_SIDECAR_CACHE``
+environment variable (which wins). The value is either a directory that holds
+all sidecars, or ``adjacent`` to keep them in a ``.dms_sidecar`` directory next
+to each shard.
+
+A sidecar records the source path, size, mtime and data-section hash of the
+shard it was built from, the read options that produced it and the shard's
+YAML header text. It is used as is while size and mtime match. If they differ
+but the data-section hash still matches (e.g. a header-only rewrite or a copy
+that changed mtime) the sidecar is re-stamped and used; otherwise it is stale
+and rebuilt on the next read.
+
+Requires ``pyarrow``.
+"""
+
+import os
+import glob
+import json
+import hashlib
+import logging
+
+import click
+
+from dms_datastore import dstore_config
+from dms_datastore.shard_writer import _hash_data_section
+
+logger = logging.getLogger(__name__)
+
+__all__ = [
+    "sidecar_root",
+    "load_sidecar",
+    "store_sidecar",
+    "prune_sidecars",
+    "warm_sidecars",
+]
+
+SIDECAR_ENV = "DMS_SIDECAR_CACHE"
+ADJACENT = "adjacent"
+ADJACENT_DIR = ".dms_sidecar"
+_META_KEY = b"dms_sidecar"
+_FORMAT_VERSION = 1
+
+_pyarrow_missing_warned = False
+
+
+def _pyarrow():
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as exc:
+        raise ImportError(
+            "pyarrow is required for the sidecar cache. "
+            "Install it with: pip install pyarrow"
+        ) from exc
+    return pa, pq
+
+
+def sidecar_root():
+    """Configured sidecar location, or None if the cache is disabled.
+
+    Returns
+    -------
+    str or None
+        A directory path, the string ``'adjacent'``, or None.
+    """
+    root = os.environ.get(SIDECAR_ENV)
+    if root is None:
+        root = dstore_config.config.get("sidecar_cache")
+    if root is None or str(root).strip().lower() in ("", "none", "false", "off"):
+        return None
+    return str(root)
+
+
+def sidecar_enabled():
+    """True if a sidecar location is configured and pyarrow is importable."""
+    global _pyarrow_missing_warned
+    if sidecar_root() is None:
+        return False
+    try:
+        _pyarrow()
+    except ImportError as exc:
+        if not _pyarrow_missing_warned:
+            logger.warning("Sidecar cache configured but disabled: %s", exc)
+            _pyarrow_missing_warned = True
+        return False
+    return True
+
+
+def variant_key(**read_options):
+    """Short stable digest of the read options a sidecar was built with."""
+    text = json.dumps(read_options, sort_keys=True, default=str)
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()[:12]
+
+
+def sidecar_path(path, variant, root=None):
+    """Location of the sidecar for shard *path* built with *variant*."""
+    root = sidecar_root() if root is None else root
+    if root is None:
+        raise ValueError("Sidecar cache is not configured")
+    path = os.path.abspath(str(path))
+    dirname, base = os.path.split(path)
+    fname = f"{base}.{variant}.parquet"
+    if root == ADJACENT:
+        return os.path.join(dirname, ADJACENT_DIR, fname)
+    # Prefix with a digest of the directory so equally named shards from
+    # different repos do not collide in a shared root.
+    dir_digest = hashlib.sha1(dirname.encode("utf-8")).hexdigest()[:16]
+    return os.path.join(root, f"{dir_digest}_{fname}")
+
+
+def _data_hash(path):
+    return _hash_data_section(path)
+
+
+def _read_info(schema):
+    meta = schema.metadata or {}
+    if _META_KEY not in meta:
+        return None
+    return json.loads(meta[_META_KEY].decode("utf-8"))
+
+
+def _write_table(target, ts, info):
+    pa, pq = _pyarrow()
+    table = pa.Table.from_pandas(ts, preserve_index=True)
+    meta = dict(table.schema.metadata or {})
+    meta[_META_KEY] = json.dumps(info).encode("utf-8")
+    table = table.replace_schema_metadata(meta)
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    tmp = f"{target}.{os.getpid()}.tmp"
+    pq.write_table(table, tmp)
+    os.replace(tmp, target)
+
+
+def store_sidecar(path, variant, ts):
+    """Write the sidecar for shard *path*.
+
+    Parameters
+    ----------
+    path : str
+        Source shard that *ts* was parsed from.
+    variant : str
+        Digest of the read options, from :func:`variant_key`.
+    ts : pandas.DataFrame
+        Frame parsed from the whole shard.
+    """
+    from dms_datastore.read_ts import extract_commented_header
+
+    st = os.stat(path)
+    freq = getattr(ts.index, "freqstr", None)
+    info = {
+        "format_version": _FORMAT_VERSION,
+        "source": os.path.abspath(str(path)),
+        "size": st.st_size,
+        "mtime_ns": st.st_mtime_ns,
+        "data_hash": _data_hash(path),
+        "variant": variant,
+        "freq": freq,
+        "header": extract_commented_header(path),
+    }
+    _write_table(sidecar_path(path, variant), ts, info)
+
+
+def load_sidecar(path, variant, return_header=False):
+    """Return the cached frame for shard *path*, or None if missing or stale.
+
+    Parameters
+    ----------
+    path : str
+        Source shard.
+    variant : str
+        Digest of the read options, from :func:`variant_key`.
+    return_header : bool
+        If True, return ``(header_text, frame)``.
+
+    Returns
+    -------
+    pandas.DataFrame or tuple or None
+    """
+    _, pq = _pyarrow()
+    target = sidecar_path(path, variant)
+    if not os.path.exists(target):
+        return None
+    try:
+        table = pq.read_table(target, memory_map=True)
+        info = _read_info(table.schema)
+    except Exception as exc:
+        logger.warning("Ignoring unreadable sidecar %s: %s", target, exc)
+        return None
+    if info is None or info.get("format_version") != _FORMAT_VERSION:
+        return None
+    st = os.stat(path)
+    restamp = False
+    if (st.st_size, st.st_mtime_ns) != (info["size"], info["mtime_ns"]):
+        if _data_hash(path) != info["data_hash"]:
+            return None
+        restamp = True
+
+    ts = table.to_pandas()
+    if info.get("freq") is not None:
+        try:
+            ts.index.freq = info["freq"]
+        except ValueError:
+            pass
+    if restamp:
+        info["size"], info["mtime_ns"] = st.st_size, st.st_mtime_ns
+        try:
+            _write_table(target, ts, info)
+        except OSError as exc:
+            logger.debug("Could not re-stamp sidecar %s: %s", target, exc)
+    if return_header:
+        return info.get("header", ""), ts
+    return ts
+
+
+def _candidate_sidecars(root, repo_dir=None):
+    if root == ADJACENT:
+        if repo_dir is None:
+            raise ValueError("repo_dir is required to prune adjacent sidecars")
+        pattern = os.path.join(repo_dir, "**", ADJACENT_DIR, "*.parquet")
+        return glob.glob(pattern, recursive=True)
+    return glob.glob(os.path.join(root, "*.parquet"))
+
+
+def prune_sidecars(repo_dir=None, root=None):
+    """Delete sidecars whose source shard is gone or has changed.
+
+    Parameters
+    ----------
+    repo_dir : str, optional
+        Repository directory; required when sidecars are kept adjacent.
+    root : str, optional
+        Sidecar location; defaults to :func:`sidecar_root`.
+
+    Returns
+    -------
+    list of str
+        Sidecar files removed.
+    """
+    _, pq = _pyarrow()
+    root = sidecar_root() if root is None else root
+    if root is None:
+        raise ValueError("Sidecar cache is not configured")
+    removed = []
+    for sc in _candidate_sidecars(root, repo_dir):
+        try:
+            info = _read_info(pq.read_schema(sc))
+        except Exception:
+            info = None
+        stale = info is None or info.get("format_version") != _FORMAT_VERSION
+        if not stale:
+            src = info["source"]
+            if not os.path.exists(src):
+                stale = True
+            else:
+                st = os.stat(src)
+                if (st.st_size, st.st_mtime_ns) != (info["size"], info["mtime_ns"]):
+                    stale = _data_hash(src) != info["data_hash"]
+        if stale:
+            os.remove(sc)
+            removed.append(sc)
+    return removed
+
+
+def warm_sidecars(repo_dir, pattern="*.csv", force_regular=True):
+    """Build sidecars for every dms1 shard in *repo_dir* matching *pattern*.
+
+    Shards are read the way :func:`~dms_datastore.read_multi.ts_multifile`
+    reads them, so the sidecars serve repository reads directly.
+
+    Returns
+    -------
+    int
+        Number of shards read.
+    """
+    from dms_datastore.read_ts import read_ts
+
+    if not sidecar_enabled():
+        raise ValueError("Sidecar cache is not configured or pyarrow is missing")
+    count = 0
+    for fpath in sorted(glob.glob(os.path.join(repo_dir, pattern))):
+        try:
+            read_ts(fpath, force_regular=force_regular)
+            count += 1
+        except Exception as exc:
+            logger.warning("Could not read %s for sidecar: %s", fpath, exc)
+    return count
+
+
+@click.command()
+@click.option("--repo", default=None, help="Configured repo name (e.g. screened).")
+@click.option("--in-path", "in_path", default=None, help="Directory to use instead of the repo root.")
+@click.option("--pattern", default="*.csv", help="File pattern of shards to warm.")
+@click.option("--warm", is_flag=True, help="Build sidecars for all shards.")
+@click.option("--prune", is_flag=True, help="Remove stale or orphaned sidecars.")
+@click.help_option("-h", "--help")
+def sidecar_cache_cli(repo, in_path, pattern, warm, prune):
+    """Pre-warm or prune the Parquet sidecar cache for a repository."""
+    if not (warm or prune):
+        raise click.UsageError("Specify --warm and/or --prune")
+    repo_dir = dstore_config.resolve_repo_data_dir(repo_or_path=in_path or repo)
+    if prune:
+        removed = prune_sidecars(repo_dir=repo_dir)
+        click.echo(f"Removed {len(removed)} sidecar(s)")
+    if warm:
+        count = warm_sidecars(repo_dir, pattern=pattern)
+        click.echo(f"Read {count} shard(s) into the sidecar cache")
+
+
+if __name__ == "__main__":
+    sidecar_cache_cli()
@@ -57,6 +57,13 @@ logger = logging.getLogger(__name__)
     show_default=True,
     help="When staged and repo are both regular but have different inferred frequencies, quarantine staged or replace the repo file.",
 )
+@click.option(
+    "--max-workers",
+    default=1,
+    type=click.IntRange(min=1),
+    show_default=True,
+    help="Worker processes used to compare staged and repo shards. Writes stay serial.",
+)
 @click.option("--plan", is_flag=True, default=False, help="Dry-run: compute and print actions without writing.")
 @click.option("--apply", is_flag=True, default=False, help="Execute: write changes to the repo.")
 @click.option(
@@ -88,6 +95,7 @@ def main(
     atol: float,
     rtol: float,
     freq_mismatch: str,
+    max_workers: int,
     plan: bool,
     apply: bool,
     out_actions: str | None,
@@ -128,6 +136,7 @@ def main(
         rtol=rtol,
         freq_mismatch=freq_mismatch,
         plan=plan_effective,
+        max_workers=max_workers,
     )
     logger.info("update_repo CLI: %d action(s) computed", len(actions))
     if debug:
@@ -4,11 +4,14 @@
 # -*- coding: utf-8 -*-
 
 import yaml
+import numpy as np
 import pandas as pd
 import warnings
 import os
 from pathlib import Path
 
+from dms_datastore.shard_writer import write_shard, write_shards
+
 __all__ = ["write_ts_csv"]
 
 
@@ -313,19 +316,83 @@ def _effective_chunk_bounds(ts, block_size, min_points=16):
     Return only the chunk bounds that would actually produce output files.
     """
     bounds = chunk_bounds(ts, block_size=block_size)
+    first = ts.first_valid_index()
+    last = ts.last_valid_index()
     effective = []
 
-    for bnd in bounds:
-        s = max(pd.Timestamp(bnd[0], 1, 1), ts.first_valid_index())
-        e = min(pd.Timestamp(bnd[1], 12, 31, 23, 59, 59), ts.last_valid_index())
-        tssub = ts.loc[s:e]
+    if not ts.index.is_monotonic_increasing:
+        for bnd in bounds:
+            s = max(pd.Timestamp(bnd[0], 1, 1), first)
+            e = min(pd.Timestamp(bnd[1], 12, 31, 23, 59, 59), last)
+            tssub = ts.loc[s:e]
 
-        if _shard_has_enough_data(tssub, min_points=min_points):
+            if _shard_has_enough_data(tssub, min_points=min_points):
+                effective.append((bnd, s, e))
+        return effective
+
+    # Sorted index: locate every shard with one binary search per bound and
+    # count non-missing values on positional slices instead of label slices.
+    notna = ts.notna().to_numpy()
+    starts = [max(pd.Timestamp(b[0], 1, 1), first) for b in bounds]
+    ends = [min(pd.Timestamp(b[1], 12, 31, 23, 59, 59), last) for b in bounds]
+    lo = ts.index.searchsorted(starts, side="left")
+    hi = ts.index.searchsorted(ends, side="right")
+    for bnd, s, e, i0, i1 in zip(bounds, starts, ends, lo, hi):
+        if (notna[i0:i1].sum(axis=0) >= min_points).any():
             effective.append((bnd, s, e))
-
     return effective
 
 
+_DATE_FORMAT = "%Y-%m-%dT%H:%M:%S"
+
+
+def _iso_index(index):
+    """The index as ``_DATE_FORMAT`` strings, or None if to_csv must format it.
+
+    numpy formats datetime64 in C, which is far faster than the per-element
+    strftime that ``to_csv(date_format=...)`` performs, and gives the same
+    text for tz-naive stamps (sub-second parts are truncated in both).
+    """
+    if not isinstance(index, pd.DatetimeIndex) or index.tz is not None or index.hasnans:
+        return None
+    text = np.datetime_as_string(index.values.astype("datetime64[s]"), unit="s")
+    return pd.Index(text, dtype=object, name=index.name)
+
+
+def _write_csv_body(ts, outfile, sep, **kwargs):
+    """Write the csv part of a file, byte-identical to to_csv with _DATE_FORMAT."""
+    iso = None
+    dtypes = ts.dtypes if isinstance(ts, pd.DataFrame) else [ts.dtype]
+    # date_format would also apply to datetime-valued columns, so leave those
+    # to to_csv.
+    if "date_format" not in kwargs and not any(
+        isinstance(dtype, pd.DatetimeTZDtype) or getattr(dtype, "kind", None) == "M"
+        for dtype in dtypes
+    ):
+        iso = _iso_index(ts.index)
+    if iso is not None:
+        ts = ts.copy(deep=False)
+        ts.index = iso
+        ts.to_csv(outfile, header=True, sep=sep, lineterminator="\n", **kwargs)
+    else:
+        ts.to_csv(
+            outfile,
+            header=True,
+            sep=sep,
+            date_format=_DATE_FORMAT,
+            lineterminator="\n",
+            **kwargs,
+        )
+
+
+def _shard_body_writer(meta_header, ts, sep, kwargs):
+    def write(outfile):
+        outfile.write(meta_header)
+        _write_csv_body(ts, outfile, sep, **kwargs)
+
+    return write
+
+
 def write_ts_csv(
     ts,
     fpath,
@@ -336,6 +403,8 @@ def write_ts_csv(
     block_size=1,
     dtypes={"user_flag": "Int64"},
     sep=",",
+    skip_unchanged=True,
+    max_workers=1,
     **kwargs,
 ):
     """
@@ -346,6 +415,12 @@ def write_ts_csv(
       - str
       - dict
       - year -> (dict or str) mapping, but only when chunk_years=True
+
+    Files are written atomically. With skip_unchanged, an existing file whose
+    data and header (other than date_formatted) would not change is left
+    untouched. Year shards are written one at a time unless max_workers > 1,
+    in which case they are written concurrently on that many threads.
+    See :mod:`dms_datastore.shard_writer`.
     """
     if isinstance(ts, pd.Series):
         col_name = ts.name if ts.name is not None else "value"
@@ -381,6 +456,7 @@ def write_ts_csv(
                     f"Metadata mapping does not cover all output shard years. Missing: {missing}"
                 )
 
+        shards = []
         for bnd, s, e in effective_bounds:
             tssub = ts.loc[s:e]
 
@@ -401,38 +477,20 @@ def write_ts_csv(
                 header_dtypes=header_dtypes,
             )
 
-            with open(newfname, "w", newline="\n", encoding="utf-8") as outfile:
-                outfile.write(meta_header)
-                tssub.to_csv(
-                    outfile,
-                    header=True,
-                    sep=sep,
-                    date_format="%Y-%m-%dT%H:%M:%S",
-                    lineterminator="\n",
-                    **kwargs,
-                )
+            shards.append(
+                (newfname, _shard_body_writer(meta_header, tssub, sep, kwargs))
+            )
+        write_shards(shards, max_workers=max_workers, skip_unchanged=skip_unchanged)
     else:
         meta_header = _prepare_single_metadata_header(metadata, format_version, header_dtypes=header_dtypes)
 
         if isinstance(fpath, (str, bytes, os.PathLike)):
-            with open(fpath, "w", newline="\n", encoding="utf-8") as outfile:
-                outfile.write(meta_header)
-                ts.to_csv(
-                    outfile,
-                    header=True,
-                    sep=sep,
-                    date_format="%Y-%m-%dT%H:%M:%S",
-                    lineterminator="\n",
-                    **kwargs,
-                )
+            write_shard(
+                fpath,
+                _shard_body_writer(meta_header, ts, sep, kwargs),
+                skip_unchanged=skip_unchanged,
+            )
         else:
             outfile = fpath
             outfile.write(meta_header)
-            ts.to_csv(
-                outfile,
-                header=True,
-                sep=sep,
-                date_format="%Y-%m-%dT%H:%M:%S",
-                lineterminator="\n",
-                **kwargs,
-            )
\ No newline at end of file
+            _write_csv_body(ts, outfile, sep, **kwargs)
\ No newline at end of file
@@ -0,0 +1,20 @@
+import os
+
+import pytest
+
+
+def pytest_configure(config):
+    # Also registered in pyproject.toml; repeated here for runs from the
+    # packaged tests directory (conda-build), which has no pyproject.
+    config.addinivalue_line(
+        "markers", "benchmark: timing/memory benchmarks, skipped unless DMS_RUN_BENCHMARKS is set"
+    )
+
+
+def pytest_collection_modifyitems(config, items):
+    if os.environ.get("DMS_RUN_BENCHMARKS"):
+        return
+    skip = pytest.mark.skip(reason="set DMS_RUN_BENCHMARKS=1 to run benchmarks")
+    for item in items:
+        if "benchmark" in item.keywords:
+            item.add_marker(skip)
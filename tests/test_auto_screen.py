@@ -0,0 +1,251 @@
+import logging
+
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip("geopandas")
+pytest.importorskip("schimpy")
+
+from dms_datastore import auto_screen
+
+
+def _inventory():
+    return pd.DataFrame(
+        {
+            "station_id": ["anh", "mrz", "mrz", "sjj"],
+            "subloc": [None, "upper", "lower", None],
+            "param": ["ec", "ec", "ec", "temp"],
+        }
+    )
+
+
+def test_resume_inventory_starts_at_first_row_of_station():
+    inv = _inventory()
+    assert auto_screen._resume_inventory(inv, None) is inv
+    resumed = auto_screen._resume_inventory(inv, "mrz")
+    assert list(resumed["subloc"]) == ["upper", "lower", None]
+    with pytest.raises(ValueError, match="xyz"):
+        auto_screen._resume_inventory(inv, "xyz")
+
+
+def test_screen_series_job_returns_buffered_logs(monkeypatch):
+    pkg_logger = logging.getLogger("dms_datastore")
+    saved = (list(pkg_logger.handlers), pkg_logger.level, pkg_logger.propagate)
+    def fake_screen(row, resolver, **options):
+        auto_screen.logger.info("screening %s", row["station_id"])
+        if row["station_id"] == "sjj":
+            raise RuntimeError("bad series")
+        return (row["station_id"], "default", row["param"])
+
+    monkeypatch.setattr(auto_screen, "_screen_series", fake_screen)
+    try:
+        auto_screen._init_screen_worker(None, logging.INFO)
+        inv = _inventory()
+        failed, error, records = auto_screen._screen_series_job(inv.iloc[0], {})
+        assert failed == ("anh", "default", "ec") and error is None
+        assert [r.getMessage() for r in records] == ["screening anh"]
+
+        failed, error, records = auto_screen._screen_series_job(inv.iloc[3], {})
+        assert failed is None and isinstance(error, RuntimeError)
+        assert records[0].getMessage() == "screening sjj"
+        assert "bad series" in records[-1].getMessage()
+    finally:
+        pkg_logger.handlers[:] = saved[0]
+        pkg_logger.setLevel(saved[1])
+        pkg_logger.propagate = saved[2]
+        auto_screen._worker_state.clear()
+
+
+def test_log_step_time(caplog):
+    with caplog.at_level(logging.INFO, logger="dms_datastore.auto_screen"):
+        auto_screen.log_step_time("median_oneside_forward", 0.5, 1000)
+    assert "step median_oneside_forward: 0.500 s, 1000 rows, 2000 rows/s" in caplog.text
+
+
+class _FakeRegions:
+    calls = 0
+
+    def region_info(self, x, y):
+        self.calls += 1
+        # second station sits on a border and matches two regions
+        return pd.DataFrame({"name": ["delta", "delta", "ocean"]}, index=[0, 1, 1])
+
+
+def test_protocol_resolver_joins_once_and_memoizes(tmp_path, monkeypatch, caplog):
+    config = {
+        "config_dir": str(tmp_path),
+        "regions": {
+            "region_file": "regions.shp",
+            "default": {},
+            "delta": {"params": {"ec": {"inherits_global": True, "modify_steps": [
+                {"method": "bounds_test", "args": {"bounds": [0, 100]}}]}}},
+        },
+        "defaults": {
+            "global": {"steps": [{"method": "bounds_test", "args": {"bounds": [-1, 1]}}]},
+            "params": {},
+        },
+        "stations": {},
+    }
+    station_db = pd.DataFrame(
+        {"x": [1.0, 2.0, np.nan], "y": [1.0, 2.0, np.nan]}, index=["anh", "mrz", "nox"]
+    )
+    checker = _FakeRegions()
+    monkeypatch.setitem(
+        auto_screen.region_checkers, str(tmp_path / "regions.shp"), checker
+    )
+    resolver = auto_screen.ProtocolResolver(config, station_db=station_db)
+    resolver.precompute([("anh", "default", "ec"), ("zzz", "default", "ec")])
+
+    regions = resolver.regions()
+    assert regions["anh"] == "delta" and regions["mrz"] == "delta"
+    assert "mrz lies in more than one screening region" in caplog.text
+    assert pd.isna(regions["nox"])
+    proto = resolver.protocol("anh", "default", "ec")
+    assert proto["steps"][0]["args"]["bounds"] == [0, 100]
+    assert resolver.protocol("nox", "default", "ec")["steps"][0]["args"]["bounds"] == [-1, 1]
+
+    proto["steps"][0]["args"]["bounds"] = None
+    assert resolver.protocol("anh", "default", "ec")["steps"][0]["args"]["bounds"] == [0, 100]
+    assert checker.calls == 1
+    with pytest.raises(KeyError):
+        resolver.protocol("zzz", "default", "ec")
+
+
+def _series(values, start="2024-01-01"):
+    idx = pd.date_range(start, periods=len(values), freq="15min", name="datetime")
+    return pd.DataFrame({"value": values}, index=idx, dtype="float64")
+
+
+def test_screen_watermark_finds_first_new_or_changed_value():
+    prior = _series([1.0, 2.0, np.nan, 4.0])
+    prior["user_flag"] = pd.array([pd.NA, 1, pd.NA, pd.NA], dtype="Int64")
+
+    assert auto_screen._screen_watermark(_series([1.0, 2.0, np.nan, 4.0]), prior) is None
+    appended = _series([1.0, 2.0, np.nan, 4.0, 5.0])
+    assert auto_screen._screen_watermark(appended, prior) == appended.index[4]
+    revised = _series([1.0, 2.5, np.nan, 4.0, 5.0])
+    assert auto_screen._screen_watermark(revised, prior) == revised.index[1]
+    truncated = _series([1.0, 2.0, np.nan])
+    assert auto_screen._screen_watermark(truncated, prior) == prior.index[3]
+
+
+def test_incremental_window_covers_filters_and_runs():
+    values = np.arange(4000, dtype="float64")
+    values[3980:3995] = 7.0  # repeat run crossing the watermark at 3990
+    ts = _series(values)
+    watermark = ts.index[3990]
+
+    bounds = {"steps": [{"method": "bounds_test", "args": {"bounds": [0, 1]}}]}
+    first, start = auto_screen._incremental_window(ts, bounds, watermark)
+    assert first == 3990
+    assert start == 0  # less than INCREMENTAL_MIN_CONTEXT of history
+
+    repeat = {"steps": [{"method": "repeat_test", "args": {"max_repeat": 4}}]}
+    first, _ = auto_screen._incremental_window(ts, repeat, watermark)
+    assert first == 3979
+
+    median = {"steps": [{"method": "median_test_twoside", "args": {"filt_len": 7}}]}
+    first, _ = auto_screen._incremental_window(ts, median, watermark)
+    assert first == 3983
+
+    unknown = {"steps": [{"method": "my_custom_test", "args": {}}]}
+    assert auto_screen._incremental_window(ts, unknown, watermark) is None
+
+
+# Explicit median scales make every step depend only on nearby data, so an
+# incremental screen must reproduce a full one exactly.
+_LOCAL_PROTOCOL = {
+    "steps": [
+        {"method": "bounds_test", "args": {"bounds": [-50.0, 2000.0]}},
+        {"method": "repeat_test", "args": {"max_repeat": 6}},
+        {"method": "median_test_twoside", "args": {"level": 4, "scale": 20.0, "filt_len": 7}},
+        {"method": "median_test_oneside", "label": "forward",
+         "args": {"level": 4, "scale": 20.0, "filt_len": 6, "reverse": False}},
+    ]
+}
+
+
+class _FixedResolver:
+    station_db = pd.DataFrame({"name": ["Test station"]}, index=["tst"])
+
+    def protocol(self, station_id, subloc, param):
+        return auto_screen.copy.deepcopy(_LOCAL_PROTOCOL)
+
+
+def _random_ec(rng, end):
+    idx = pd.date_range("2021-01-01", end, freq="h", name="datetime")
+    t = np.arange(len(idx))
+    v = 800 + 200 * np.sin(t / 300.0) + 5 * rng.standard_normal(len(idx))
+    spikes = rng.random(len(idx)) < 0.005
+    v[spikes] *= rng.choice([0.2, 3.0], spikes.sum())
+    for s0 in rng.integers(0, len(idx) - 20, 20):
+        v[s0:s0 + rng.integers(3, 12)] = v[s0]
+    v[rng.random(len(idx)) < 0.01] = np.nan
+    return pd.DataFrame({"value": v}, index=idx)
+
+
+def _screen_into(dest, ts, monkeypatch, incremental):
+    meta = {"station_id": "tst", "param": "ec", "unit": "microS/cm"}
+    monkeypatch.setattr(
+        auto_screen, "custom_fetcher", lambda agency: lambda *a, **k: ([dict(meta)], ts.copy())
+    )
+    row = pd.Series(
+        {"station_id": "tst", "subloc": None, "param": "ec", "agency": "usgs", "agency_id": "123"}
+    )
+    return auto_screen._screen_series(
+        row,
+        _FixedResolver(),
+        "formatted",
+        None,
+        "{agency}_{station_id@subloc}_{agency_id}_{param}_{year}.csv",
+        str(dest),
+        None,
+        incremental=incremental,
+    )
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_incremental_screen_matches_full_screen(tmp_path, monkeypatch, seed):
+    rng = np.random.default_rng(seed)
+    full = _random_ec(rng, "2023-06-30 23:00")
+    cut = pd.Timestamp("2023-03-01") + pd.Timedelta(hours=int(rng.integers(0, 24 * 60)))
+    old = full.loc[:cut - pd.Timedelta(hours=1)]
+    new = full.copy()
+    # Revise a stretch of history in the last screened year and append data.
+    rev = pd.Timestamp("2023-02-01") + pd.Timedelta(hours=int(rng.integers(0, 24 * 20)))
+    new.loc[rev:rev + pd.Timedelta(hours=5), "value"] += 40.0
+
+    inc_dest, full_dest = tmp_path / "incremental", tmp_path / "full"
+    assert _screen_into(inc_dest, old, monkeypatch, incremental=False) is None
+    earlier = {p.name: (p.read_bytes(), p.stat().st_mtime_ns) for p in inc_dest.glob("*_202[12].csv")}
+    assert len(earlier) == 2
+
+    screened_rows, written = [], []
+    real_screener, real_write = auto_screen.screener, auto_screen.write_ts_csv
+    monkeypatch.setattr(
+        auto_screen,
+        "screener",
+        lambda ts, *a, **k: screened_rows.append(len(ts)) or real_screener(ts, *a, **k),
+    )
+    monkeypatch.setattr(
+        auto_screen,
+        "write_ts_csv",
+        lambda ts, *a, **k: written.append(ts.index[0]) or real_write(ts, *a, **k),
+    )
+    _screen_into(inc_dest, new, monkeypatch, incremental=True)
+    assert screened_rows[-1] < len(new)  # the incremental path was taken
+    assert written[-1] >= pd.Timestamp("2023-01-01")  # only the 2023 shard rewritten
+    _screen_into(full_dest, new, monkeypatch, incremental=False)
+
+    pattern = "usgs_tst_123_ec_*.csv"
+    got = auto_screen.read_flagged(str(inc_dest / pattern), apply_flags=False, return_flags=True)
+    expected = auto_screen.read_flagged(str(full_dest / pattern), apply_flags=False, return_flags=True)
+    pd.testing.assert_frame_equal(got, expected)
+    assert {p.name: (p.read_bytes(), p.stat().st_mtime_ns)
+            for p in inc_dest.glob("*_202[12].csv")} == earlier
+
+    # Nothing new: the series is skipped.
+    n = len(screened_rows)
+    assert _screen_into(inc_dest, new, monkeypatch, incremental=True) is None
+    assert len(screened_rows) == n
@@ -0,0 +1,143 @@
+import pandas as pd
+import pytest
+
+pytest.importorskip("diskcache")
+
+from dms_datastore import caching
+
+
+@pytest.fixture
+def local_cache(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    caching.LocalCache.close()
+    yield caching.LocalCache.instance()
+    caching.LocalCache.close()
+
+
+def test_interval_cache_slices_and_fills_gaps(local_cache) -> None:
+    full = pd.DataFrame(
+        {"value": range(4 * 8760)},
+        index=pd.date_range("2019-01-01", periods=4 * 8760, freq="h"),
+    )
+    calls = []
+
+    @caching.cache_dataframe(range_args=("start", "end"))
+    def fetch(station, start=None, end=None):
+        calls.append((start, end))
+        return full.loc[start:end]
+
+    fetch(station="sac", start="2020", end="2022")
+    sub = fetch(station="sac", start="2021", end="2021-06")
+    assert len(calls) == 1
+    pd.testing.assert_frame_equal(
+        sub, full.loc[pd.Timestamp("2021"):pd.Timestamp("2021-06")]
+    )
+
+    wider = fetch(station="sac", start="2019-06", end="2022-06")
+    assert calls[1:] == [
+        (pd.Timestamp("2019-06"), pd.Timestamp("2020")),
+        (pd.Timestamp("2022"), pd.Timestamp("2022-06")),
+    ]
+    pd.testing.assert_frame_equal(
+        wider, full.loc[pd.Timestamp("2019-06"):pd.Timestamp("2022-06")]
+    )
+    assert caching.cached_intervals("fetch") == {
+        "fetch|station=sac": [(pd.Timestamp("2019-06"), pd.Timestamp("2022-06"))]
+    }
+
+
+def test_frames_round_trip_and_stats(local_cache, monkeypatch) -> None:
+    pytest.importorskip("pyarrow")
+    ts = pd.DataFrame(
+        {"value": [1.5, None, 3.0, 4.25], "user_flag": [None, "1", None, None]},
+        index=pd.date_range("2020-01-01", periods=4, freq="15min", name="datetime"),
+    )
+    monkeypatch.setenv(caching.CACHE_TTL_ENV, "3600")
+
+    @caching.cache_dataframe()
+    def fetch(station):
+        return ts
+
+    caching.cache_stats(reset=True)
+    fetch(station="sac")
+    caching.LocalCache.close()  # force a reload from disk
+    got = fetch(station="sac")
+    pd.testing.assert_frame_equal(got, ts)
+    assert got.index.freq == ts.index.freq
+
+    stats = caching.cache_stats()
+    assert (stats["hits"], stats["misses"]) == (1, 1)
+    assert stats["entries"] == 1 and stats["bytes"] > 0
+
+
+def test_frames_with_non_string_labels_round_trip(local_cache) -> None:
+    pytest.importorskip("pyarrow")
+    index = pd.date_range("2020-01-01", periods=3, freq="h", name="datetime")
+    wide = pd.DataFrame(
+        [[1.0, 2.0], [3.0, 4.0], [5.0, 6.0]],
+        index=index,
+        columns=pd.MultiIndex.from_tuples([("sac", None), ("sjj", "upper")]),
+    )
+    mixed = pd.DataFrame({0: [1.0, 2.0, 3.0], "value": [4.0, 5.0, 6.0]}, index=index)
+    local_cache.set("wide", wide)
+    local_cache.set("mixed", mixed)
+    caching.LocalCache.close()
+    cache = caching.LocalCache.instance()
+    pd.testing.assert_frame_equal(cache.get("wide"), wide)
+    got = cache.get("mixed")
+    pd.testing.assert_frame_equal(got, mixed)
+    assert list(got.columns) == [0, "value"]
+
+
+def test_undecodable_entry_is_a_miss_and_evicted(local_cache, monkeypatch) -> None:
+    pytest.importorskip("pyarrow")
+    ts = pd.DataFrame({"value": [1.0, 2.0]})
+    local_cache.set("bad", {"data": ts})
+
+    def broken(kind, payload):
+        raise ValueError("malformed node or string")
+
+    monkeypatch.setattr(caching, "_frame_from_bytes", broken)
+    assert local_cache.get("bad", default="missing") == "missing"
+    assert "bad" not in local_cache
+    with pytest.raises(KeyError):
+        local_cache["bad"]
+
+
+def test_cache_csv_round_trip_streams_entries(local_cache) -> None:
+    @caching.cache_dataframe()
+    def fetch(station, n=3):
+        idx = pd.date_range("2020-01-01", periods=n, freq="h", name="datetime")
+        return pd.DataFrame({"value": [float(i) for i in range(n)]}, index=idx)
+
+    for station, n in [("01", 2), ("sac", 5), ("sjj", 3)]:
+        fetch(station=station, n=n)
+    expected = {k: local_cache[k] for k in local_cache.iterkeys()}
+
+    caching.cache_to_csv()
+    local_cache.clear()
+    caching.load_cache_csv("fetch.csv", chunksize=2)  # entries span chunks
+
+    assert sorted(local_cache.iterkeys()) == sorted(expected)
+    for key, frame in expected.items():
+        got = caching.unwrap_cache_value(local_cache[key])
+        pd.testing.assert_frame_equal(got, frame, check_freq=False)
+
+
+def test_cache_csv_takes_union_of_entry_columns(local_cache) -> None:
+    @caching.cache_dataframe()
+    def fetch(station):
+        idx = pd.date_range("2020-01-01", periods=2, freq="h", name="datetime")
+        cols = {"value": [1.0, 2.0]}
+        if station == "sac":
+            cols["flag"] = [0.0, 1.0]
+        return pd.DataFrame(cols, index=idx)
+
+    fetch(station="anh")
+    fetch(station="sac")
+    caching.cache_to_csv()
+
+    out = pd.read_csv("fetch.csv", comment="#")
+    assert list(out.columns) == ["datetime", "station", "value", "flag"]
+    assert len(out) == 4
+    assert out["flag"].isna().sum() == 2
@@ -4,8 +4,10 @@ from dms_datastore.filename import (
     naming_spec,
     build_repo_globs,
     interpret_fname,
+    interpret_fnames,
     meta_to_filename,
 )
+import pandas as pd
 
 
 def test_interpret_fname_no_backend():
@@ -265,3 +267,35 @@ def test_meta_to_filename_omits_optional_subloc_literal_site_key():
     fname = meta_to_filename(meta, naming=spec)
 
     assert fname == "model_jer_ec_2025.csv"
+
+
+def test_shard_year_span_single_and_blocked():
+    from dms_datastore.filename import shard_year_span
+
+    assert shard_year_span("usgs_fpt_11447650_flow_2020.csv") == (2020, 2020)
+    assert shard_year_span("cdec_fpt_fpt_flow_2020_2024.csv") == (2020, 2024)
+    assert shard_year_span("/repo/cdec_fpt_fpt_flow_2020_9999.csv") == (2020, 9999)
+    assert shard_year_span("usgs_fpt_11447650_flow.csv") is None
+
+
+def test_interpret_fnames_matches_interpret_fname():
+    spec = naming_spec(
+        templates=[
+            "{agency}_{station_id@subloc}_{agency_id}_{param@modifier}_{syear}_{eyear}.csv",
+            "{agency}_{station_id@subloc}_{agency_id}_{param@modifier}_{year}.csv",
+        ]
+    )
+    names = [
+        "des_mrz@upper_00_elev_2020.csv",
+        "/repo/usgs_anh_11303500_flow@daily_2020_2024.csv",
+        "ncro_old_b91_ec_2001_2002.csv",
+    ]
+    expected = pd.DataFrame([interpret_fname(n, naming=spec) for n in names])
+    got = interpret_fnames(names, naming=spec)
+    pd.testing.assert_frame_equal(got, expected, check_like=True)
+
+    with pytest.raises(ValueError, match="not matched"):
+        interpret_fnames(names + ["notes.txt"], naming=spec)
+    coerced = interpret_fnames(names + ["notes.txt"], naming=spec, errors="coerce")
+    assert coerced.iloc[-1]["filename"] == "notes.txt"
+    assert pd.isna(coerced.iloc[-1]["station_id"])
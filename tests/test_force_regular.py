@@ -0,0 +1,101 @@
+import importlib
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+import pytest
+
+rt = importlib.import_module("dms_datastore.read_ts")
+
+
+def _reference_collapse(big_ts, f):
+    """The frame-sorting collapse csv_retrieve_ts used before the int64 version."""
+    try:
+        pd.tseries.frequencies.to_offset(f).nanos
+        fixed_freq = True
+    except ValueError:
+        fixed_freq = False
+    big_ts = big_ts.copy()
+    orig_index = big_ts.index
+    rounded = big_ts.index.round(f) if fixed_freq else big_ts.index
+    abs_delta = np.abs(pd.Index((orig_index - rounded).asi8).to_numpy())
+    valcol = big_ts.columns[0]
+    big_ts["_orig_time"] = orig_index
+    big_ts["_rounded_time"] = rounded
+    big_ts["_abs_delta"] = abs_delta
+    big_ts["_is_nan"] = big_ts[valcol].isna()
+    big_ts = big_ts.sort_values(
+        by=["_rounded_time", "_is_nan", "_abs_delta", "_orig_time"]
+    )
+    big_ts = big_ts.drop_duplicates(subset="_rounded_time", keep="first")
+    big_ts.index = pd.DatetimeIndex(big_ts["_rounded_time"], name=big_ts.index.name)
+    big_ts = big_ts.drop(columns=["_orig_time", "_rounded_time", "_abs_delta", "_is_nan"])
+    return big_ts.asfreq(f)
+
+
+def _jittered(n, rng, nan_frac=0.2, sort=True):
+    secs = rng.integers(0, n * 15 * 60, n)
+    idx = pd.DatetimeIndex(
+        pd.Timestamp("2020-01-01") + pd.to_timedelta(secs, unit="s"), name="datetime"
+    ).unique()
+    vals = rng.normal(size=len(idx))
+    vals[rng.random(len(idx)) < nan_frac] = np.nan
+    df = pd.DataFrame({"value": vals, "other": np.arange(len(idx), dtype=float)}, index=idx)
+    return df.sort_index() if sort else df
+
+
+@pytest.mark.parametrize("sort", [True, False])
+def test_collapse_to_grid_matches_reference(sort):
+    rng = np.random.default_rng(1234)
+    for _ in range(50):
+        df = _jittered(int(rng.integers(1, 400)), rng, sort=sort)
+        pd.testing.assert_frame_equal(
+            rt._collapse_to_grid(df, "15min"), _reference_collapse(df, "15min")
+        )
+
+
+def test_collapse_to_grid_on_grid_and_calendar_freq():
+    on_grid = pd.DataFrame(
+        {"value": np.arange(10.0)},
+        index=pd.date_range("2020-01-01", periods=10, freq="15min", name="datetime"),
+    ).drop(index=pd.Timestamp("2020-01-01 00:30"))
+    pd.testing.assert_frame_equal(
+        rt._collapse_to_grid(on_grid, "15min"), _reference_collapse(on_grid, "15min")
+    )
+    monthly = pd.DataFrame(
+        {"value": np.arange(5.0)},
+        index=pd.date_range("2020-01-01", periods=5, freq="MS", name="datetime"),
+    )
+    pd.testing.assert_frame_equal(
+        rt._collapse_to_grid(monthly, "MS"), _reference_collapse(monthly, "MS")
+    )
+
+
+def _measure(fn, *args):
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    fn(*args)
+    elapsed = time.perf_counter() - t0
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize("case", ["on_grid", "jittered", "duplicated"])
+def test_benchmark_collapse_30yr_15min(case):
+    rng = np.random.default_rng(0)
+    idx = pd.date_range("1990-01-01", "2020-01-01", freq="15min", name="datetime")
+    df = pd.DataFrame({"value": rng.random(len(idx))}, index=idx)
+    if case == "jittered":
+        df.index = df.index + pd.to_timedelta(rng.integers(-60, 60, len(idx)), unit="s")
+    elif case == "duplicated":
+        shifted = df.iloc[::4].copy()
+        shifted.index = shifted.index + pd.Timedelta("1min")
+        df = pd.concat([df, shifted]).sort_index()
+
+    old_t, old_mem = _measure(_reference_collapse, df, "15min")
+    new_t, new_mem = _measure(rt._collapse_to_grid, df, "15min")
+    assert new_t < old_t
+    assert new_mem < old_mem
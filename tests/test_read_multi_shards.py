@@ -83,3 +83,130 @@ def test_ts_multifile_raises_for_overlapping_shards(monkeypatch):
 
     with pytest.raises(ValueError, match="Overlapping shard windows"):
         rm.ts_multifile("unused_pattern", force_regular=False)
+
+
+def _patch_three_shards(monkeypatch, bad=None):
+    files = ["a_2022.csv", "a_2023.csv", "a_2024.csv"]
+    starts = {"a_2022.csv": "2022-01-01", "a_2023.csv": "2023-01-01", "a_2024.csv": "2024-01-01"}
+
+    def fake_read_ts(path, force_regular=True, dtypes=None):
+        if path == bad:
+            idx = pd.DatetimeIndex(["2023-01-01", "2023-01-01"])
+            return pd.DataFrame({"value": [1, 2]}, index=idx)
+        return _df(starts[path], 4)
+
+    monkeypatch.setattr(rm.glob, "glob", lambda pattern: files)
+    monkeypatch.setattr(rm, "detect_dms_unit", lambda _fname: (None, None))
+    monkeypatch.setattr(rm, "read_yaml_header", lambda _fname: {})
+    monkeypatch.setattr(rm, "interpret_fname", lambda base, repo=None: {})
+    monkeypatch.setattr(rm, "filter_date", lambda _meta, _start, _end: False)
+    monkeypatch.setattr(rm, "read_ts", fake_read_ts)
+
+
+def test_ts_multifile_parallel_matches_serial(monkeypatch):
+    _patch_three_shards(monkeypatch)
+
+    serial = rm.ts_multifile("unused_pattern", force_regular=False)
+    threaded = rm.ts_multifile("unused_pattern", force_regular=False, max_workers=3)
+
+    pd.testing.assert_frame_equal(serial, threaded)
+
+
+def test_ts_multifile_parallel_keeps_duplicate_error(monkeypatch):
+    _patch_three_shards(monkeypatch, bad="a_2023.csv")
+
+    with pytest.raises(ValueError, match="Duplicate index detected in file a_2023.csv"):
+        rm.ts_multifile("unused_pattern", force_regular=False, max_workers=3)
+
+
+def test_read_ts_repo_many_lists_repo_once_and_collects_errors(monkeypatch, tmp_path):
+    for name in ["usgs_sac_1_flow_2023.csv", "usgs_sac_1_flow_2024.csv", "usgs_anh_2_flow_2024.csv"]:
+        (tmp_path / name).write_text("")
+    repo_cfg = {
+        "name": "unit",
+        "root": str(tmp_path),
+        "filename_templates": ["{source}_{station_id@subloc}_{agency_id}_{param}_{year}.csv"],
+        "provider_key": "source",
+        "provider_resolution_mode": "assume_unique",
+    }
+    listdir_calls = []
+    real_listdir = rm.os.listdir
+
+    def counting_listdir(path):
+        listdir_calls.append(path)
+        return real_listdir(path)
+
+    def fake_read_ts(path, force_regular=True, dtypes=None):
+        if "anh" in path:
+            raise ValueError("corrupt shard")
+        return _df("2023-01-01" if path.endswith("2023.csv") else "2024-01-01", 4)
+
+    monkeypatch.setattr(rm.dstore_config, "repo_config", lambda repo: repo_cfg)
+    monkeypatch.setattr(rm.os, "listdir", counting_listdir)
+    monkeypatch.setattr(rm, "detect_dms_unit", lambda _fname: (None, None))
+    monkeypatch.setattr(rm, "read_yaml_header", lambda _fname: {})
+    monkeypatch.setattr(rm, "interpret_fname", lambda base, repo=None: {})
+    monkeypatch.setattr(rm, "read_ts", fake_read_ts)
+
+    results, errors = rm.read_ts_repo_many(
+        [("sac", "flow"), ("anh", "flow"), ("xyz", "flow"), ("sac@top", "flow", "bot")],
+        repo="unit",
+    )
+
+    assert len(listdir_calls) == 1
+    assert list(results) == [("sac", None, "flow")]
+    assert len(results[("sac", None, "flow")]) == 8
+    assert set(errors) == {("anh", None, "flow"), ("sac@top", "bot", "flow")}
+    assert "corrupt shard" in str(errors[("anh", None, "flow")])
+    assert "mutually exclusive" in str(errors[("sac@top", "bot", "flow")])
+
+
+def test_iter_ts_repo_streams_shards_in_order(monkeypatch, tmp_path):
+    full = _df("2022-01-01", 3 * 365 * 24, freq="h")
+    shards = {}
+    for year in (2022, 2023, 2024):
+        name = f"usgs_sac_1_flow_{year}.csv"
+        (tmp_path / name).write_text("")
+        shards[str(tmp_path / name)] = full.loc[str(year)]
+    repo_cfg = {
+        "name": "unit",
+        "root": str(tmp_path),
+        "filename_templates": ["{source}_{station_id@subloc}_{agency_id}_{param}_{year}.csv"],
+        "provider_key": "source",
+        "provider_resolution_mode": "assume_unique",
+    }
+    reads = []
+
+    def fake_read_ts(path, force_regular=True, dtypes=None):
+        reads.append(path)
+        return shards[path]
+
+    monkeypatch.setattr(rm.dstore_config, "repo_config", lambda repo: repo_cfg)
+    monkeypatch.setattr(rm, "detect_dms_unit", lambda _fname: (None, None))
+    monkeypatch.setattr(rm, "interpret_fname", lambda base, repo=None: {})
+    monkeypatch.setattr(rm, "read_ts", fake_read_ts)
+
+    chunks = list(rm.iter_ts_repo("sac", "flow", repo="unit", chunk="Q"))
+    assert len(chunks) == 12
+    pd.testing.assert_frame_equal(pd.concat(chunks), full, check_freq=False)
+    assert reads == sorted(shards)
+
+    reads.clear()
+    chunks = list(
+        rm.iter_ts_repo("sac", "flow", repo="unit", start="2023-03-01", end="2023-06-30", rows=1000)
+    )
+    assert [len(c) for c in chunks[:-1]] == [1000] * (len(chunks) - 1)
+    pd.testing.assert_frame_equal(
+        pd.concat(chunks),
+        full.loc[pd.Timestamp("2023-03-01"):pd.Timestamp("2023-06-30")],
+        check_freq=False,
+    )
+    assert reads == [str(tmp_path / "usgs_sac_1_flow_2023.csv")]
+
+
+def test_iter_pattern_windows_all_empty_undated_shards(monkeypatch):
+    monkeypatch.setattr(rm, "detect_dms_unit", lambda _fname: (None, None))
+    monkeypatch.setattr(rm, "interpret_fname", lambda base, repo=None: {})
+    monkeypatch.setattr(rm, "read_ts", lambda path, force_regular=True, dtypes=None: _df("2024-01-01", 0))
+
+    assert list(rm._iter_pattern_windows([("*.csv", ["a.csv", "b.csv"])])) == []
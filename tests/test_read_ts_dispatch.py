@@ -47,4 +47,27 @@ def test_read_ts_hint_resort_skips_usgs_reader(tmp_path: Path, monkeypatch) -> N
     assert isinstance(ts, pd.DataFrame)
     assert ts.index.name == "datetime"
     assert list(ts.columns) == ["value"]
-    assert len(ts) == 2
\ No newline at end of file
+    assert len(ts) == 2
+
+def test_read_ts_remembers_winning_reader(tmp_path: Path, monkeypatch) -> None:
+    fpath = tmp_path / "des_xyz_00_elev_2018.csv"
+    fpath.write_text(
+        "# format: dwr-dms-1.0\n"
+        "# unit: feet\n"
+        "datetime,value\n"
+        "2018-01-01 00:00:00,1\n"
+        "2018-01-01 00:15:00,2\n",
+        encoding="utf-8",
+        newline="\n",
+    )
+    assert rt.detected_reader(str(fpath)) is None
+    rt.read_ts(str(fpath), force_regular=False)
+    assert rt.detected_reader(str(fpath)) == "read_dms1"
+
+    def bomb(*args, **kwargs):
+        raise AssertionError("known reader should be tried first")
+
+    monkeypatch.setattr(rt, "read_usgs_json1", bomb)
+    monkeypatch.setattr(rt, "read_dms1_screen", bomb)
+    ts = rt.read_ts(str(fpath), force_regular=False)
+    assert len(ts) == 2
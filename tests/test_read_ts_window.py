@@ -0,0 +1,52 @@
+import importlib
+from pathlib import Path
+
+import pandas as pd
+
+rt = importlib.import_module("dms_datastore.read_ts")
+
+
+def _write_dms1(path: Path, index) -> None:
+    lines = ["# format: dwr-dms-1.0", "# unit: feet", "datetime,value"]
+    lines += [
+        f"{t},{i}.0" for i, t in enumerate(index.strftime("%Y-%m-%dT%H:%M:%S"))
+    ]
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8", newline="\n")
+
+
+def test_prune_shards_to_window_skips_non_overlapping_years():
+    files = [
+        "x_flow_2019.csv",
+        "x_flow_2020.csv",
+        "x_flow_2021_2023.csv",
+        "x_flow_2024.csv",
+    ]
+    kept = rt._prune_shards_to_window(
+        files, pd.Timestamp("2021-06-01"), pd.Timestamp("2022-01-01")
+    )
+    assert kept == ["x_flow_2021_2023.csv"]
+    assert rt._prune_shards_to_window(files, None, None) == files
+
+
+def test_window_source_matches_full_read(tmp_path: Path):
+    fpath = tmp_path / "des_xyz_00_elev_2000_2005.csv"
+    idx = pd.date_range("2000-01-01", periods=120000, freq="15min")
+    _write_dms1(fpath, idx)
+
+    src, base = rt._window_source(str(fpath), "2002-03-01", "2002-04-01")
+    assert not isinstance(src, str)
+    assert base > 0
+    part = pd.read_csv(src, index_col=0, parse_dates=[0])
+    full = pd.read_csv(fpath, comment="#", index_col=0, parse_dates=[0])
+    window = slice("2002-03-01", "2002-04-01")
+    pd.testing.assert_frame_equal(part.loc[window], full.loc[window])
+
+
+def test_read_ts_window_equals_sliced_full_read(tmp_path: Path):
+    fpath = tmp_path / "des_xyz_00_elev_2000_2005.csv"
+    idx = pd.date_range("2000-01-01", periods=120000, freq="15min")
+    _write_dms1(fpath, idx)
+
+    part = rt.read_ts(str(fpath), start="2002-03-01", end="2002-04-01")
+    full = rt.read_ts(str(fpath)).loc["2002-03-01":"2002-04-01"]
+    pd.testing.assert_frame_equal(part, full)
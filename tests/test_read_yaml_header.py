@@ -1,3 +1,4 @@
+import importlib
 from pathlib import Path
 
 import pandas as pd
@@ -6,6 +7,7 @@ import pytest
 from dms_datastore.read_ts import (
     extract_commented_header,
     parse_yaml_header,
+    read_header_fields,
     read_yaml_header,
 )
 
@@ -164,4 +166,37 @@ def test_read_yaml_header_simple_file(tmp_path):
         "format": "dwr-dms-1.0",
         "param": "ec",
         "station_id": "abc",
-    }
\ No newline at end of file
+    }
+
+
+def test_read_header_fields_matches_full_parse(tmp_path, good_cases):
+    for i, (name, text) in enumerate(good_cases.items()):
+        fpath = tmp_path / f"case{i}.csv"
+        fpath.write_text(text, encoding="utf-8")
+        full = read_yaml_header(fpath)
+        for key, value in full.items():
+            assert read_header_fields(fpath, [key]) == {key: value}, (name, key)
+        assert read_header_fields(fpath, ["no_such_key"]) == {}, name
+
+
+def test_read_header_fields_skips_full_parse(tmp_path, monkeypatch):
+    rt = importlib.import_module("dms_datastore.read_ts")
+    fpath = tmp_path / "simple.csv"
+    fpath.write_text(
+        "# format: dwr-dms-1.0\n"
+        "# unit: ft\n"
+        "# original_header:\n"
+        "#   agency: usgs\n"
+        "#   notes: [a, b]\n"
+        "datetime,value\n",
+        encoding="utf-8",
+    )
+
+    def bomb(*args, **kwargs):
+        raise AssertionError("full header should not be parsed")
+
+    monkeypatch.setattr(rt, "parse_yaml_header", bomb)
+    assert read_header_fields(fpath, ["unit", "format"]) == {
+        "unit": "ft",
+        "format": "dwr-dms-1.0",
+    }
@@ -18,6 +18,8 @@ Run:
 
 from __future__ import annotations
 
+import os
+import time
 from pathlib import Path
 
 import pandas as pd
@@ -26,6 +28,7 @@ import pytest
 
 from dms_datastore.write_ts import write_ts_csv
 from dms_datastore.reconcile_data import update_repo, update_flagged_data
+from dms_datastore.reconcile_data import _merge_screened_flags, _normalize_flag
 
 NOW = pd.Timestamp("2026-02-08")
 
@@ -86,6 +89,124 @@ def test_update_repo_plans_splice_write_on_data_change(tmp_path: Path) -> None:
     assert actions[0].action in ("splice_write", "write")
 
 
+def test_update_repo_parallel_vetting_matches_serial(tmp_path: Path) -> None:
+    staged = tmp_path / "staging"
+    repo = tmp_path / "repo"
+    staged.mkdir()
+    repo.mkdir()
+
+    meta = "station_id: foo\nparam: flow\nunit: ft^3/s\n"
+    for station in ("foo", "bar", "baz"):
+        df = _mk_values("2010-01-01", "2025-12-31", seed=len(station))
+        stem = f"cdec_{station}_123_flow.csv"
+        write_ts_csv(df, repo / stem, metadata=meta, chunk_years=True)
+        if station == "foo":
+            df.loc["2012-06-01", "value"] += 1.0
+        elif station == "bar":
+            df.loc["2025-06-01", "value"] += 1.0
+        write_ts_csv(df, staged / stem, metadata=meta, chunk_years=True)
+    (staged / "cdec_qux_123_flow_2025.csv").write_text(
+        (staged / "cdec_baz_123_flow_2025.csv").read_text()
+    )
+
+    serial = update_repo(str(staged), str(repo), now=NOW, p10=1.0, p3=1.0, plan=True)
+    parallel = update_repo(
+        str(staged), str(repo), now=NOW, p10=1.0, p3=1.0, plan=True, max_workers=3
+    )
+    assert parallel == serial
+    reasons = {(a.series_id.split("_")[1], a.shard, a.reason) for a in serial}
+    assert ("foo", "2012", "overlap_values_changed") in reasons
+    assert ("bar", "2025", "overlap_values_changed") in reasons
+    assert ("qux", "2025", "missing_in_repo") in reasons
+    assert not any(a.series_id.split("_")[1] == "baz" for a in serial)
+
+
+def test_update_repo_appends_pure_tail(tmp_path: Path) -> None:
+    staged = tmp_path / "staging"
+    repo = tmp_path / "repo"
+    staged.mkdir()
+    repo.mkdir()
+
+    df = _mk_values("2025-01-01", "2025-03-31", seed=4)
+    f = "cdec_foo_123_flow_2025.csv"
+    write_ts_csv(df.loc[:"2025-03-20"], repo / f, metadata="station_id: foo\nnote: repo\n")
+    write_ts_csv(df, staged / f, metadata="station_id: foo\n")
+
+    actions = update_repo(str(staged), str(repo), now=NOW, p10=1.0, p3=1.0, plan=True)
+    assert [(a.action, a.reason) for a in actions] == [("append_write", "append_only")]
+    # Appended rows are copied verbatim, which would ignore float_format.
+    actions = update_repo(
+        str(staged), str(repo), now=NOW, p10=1.0, p3=1.0, plan=True, float_format="%.2f"
+    )
+    assert [a.action for a in actions] == ["splice_write"]
+
+    repo_before = (repo / f).read_bytes()
+    inode_before = os.stat(repo / f).st_ino
+    update_repo(str(staged), str(repo), now=NOW, p10=1.0, p3=1.0)
+    repo_after = (repo / f).read_bytes()
+    staged_rows = (staged / f).read_bytes().split(b"2025-03-21T00:00:00", 1)[1]
+    assert repo_after == repo_before + b"2025-03-21T00:00:00" + staged_rows
+    assert b"note: repo" in repo_after
+    # Written to a temporary file and moved into place, not appended in place.
+    assert os.stat(repo / f).st_ino != inode_before
+    assert not list(repo.glob("*.tmp"))
+
+
+def test_update_repo_changed_history_is_not_an_append(tmp_path: Path) -> None:
+    staged = tmp_path / "staging"
+    repo = tmp_path / "repo"
+    staged.mkdir()
+    repo.mkdir()
+
+    df = _mk_values("2025-01-01", "2025-03-31", seed=5)
+    f = "cdec_foo_123_flow_2025.csv"
+    write_ts_csv(df.loc[:"2025-03-20"], repo / f)
+    df.iloc[3, 0] += 1.0
+    write_ts_csv(df, staged / f)
+
+    actions = update_repo(str(staged), str(repo), now=NOW, p10=1.0, p3=1.0, plan=True)
+    assert [a.action for a in actions] == ["splice_write"]
+
+
+def test_appended_tail_requires_contiguous_later_rows(tmp_path: Path) -> None:
+    from dms_datastore.reconcile_data import _appended_tail
+
+    repo = tmp_path / "repo.csv"
+    repo.write_bytes(b"# unit: feet\ndatetime,value\n2025-01-01T00:00:00,1.0\n2025-01-01T01:00:00,2.0\n")
+    body = b"# unit: feet\ndatetime,value\n2025-01-01T00:00:00,1.0\n2025-01-01T01:00:00,2.0\n"
+    staged = tmp_path / "staged.csv"
+
+    staged.write_bytes(body + b"2025-01-01T02:00:00,3.0\n2025-01-01T03:00:00,\n")
+    assert _appended_tail(str(staged), str(repo)) == b"2025-01-01T02:00:00,3.0\n2025-01-01T03:00:00,\n"
+
+    staged.write_bytes(body + b"2025-01-01T04:00:00,3.0\n")  # gap in regular data
+    assert _appended_tail(str(staged), str(repo)) is None
+    assert _appended_tail(str(staged), str(repo), regular=False) == b"2025-01-01T04:00:00,3.0\n"
+
+    staged.write_bytes(body + b"2025-01-01T01:00:00,3.0\n")  # not after the repo end
+    assert _appended_tail(str(staged), str(repo), regular=False) is None
+
+    staged.write_bytes(body + b"2025-01-01T02:00:00,3.0,1\n")  # extra field
+    assert _appended_tail(str(staged), str(repo)) is None
+
+
+def test_update_flagged_appends_pure_tail(tmp_path: Path) -> None:
+    staged = tmp_path / "staging"
+    repo = tmp_path / "repo"
+    staged.mkdir()
+    repo.mkdir()
+
+    sdf = _mk_screened(_mk_values("2025-01-01", "2025-01-20", seed=6))
+    sdf.iloc[2, 1] = 1
+    f = "cdec_baz_789_ec_2025.csv"
+    write_ts_csv(sdf.iloc[:15], repo / f)
+    write_ts_csv(sdf, staged / f)
+
+    actions = update_flagged_data(str(staged), str(repo), plan=False)
+    assert [(a.action, a.reason) for a in actions] == [("append_write", "append_only")]
+    assert (repo / f).read_bytes().split(b"datetime,", 1)[1] == (staged / f).read_bytes().split(b"datetime,", 1)[1]
+
+
 @pytest.mark.parametrize(
     "repo_flag, staged_flag, value_changed, expected",
     [
@@ -551,4 +672,103 @@ def test_update_flagged_plan_staged_irregular_quarantined(tmp_path: Path) -> Non
         plan=True,
     )
     assert len(actions) == 1
-    assert actions[0].action == "quarantine_skip"
\ No newline at end of file
+    assert actions[0].action == "quarantine_skip"
+
+
+def test_normalize_flag_spellings() -> None:
+    s = pd.Series([None, np.nan, "", " 1 ", "0", "1.0", "0.0", 1, 0.0, "None", pd.NA],
+                  dtype=object)
+    got = _normalize_flag(s)
+    assert got.dtype.name == "Int64"
+    expected = pd.array([pd.NA, pd.NA, pd.NA, 1, 0, 1, 0, 1, 0, pd.NA, pd.NA], dtype="Int64")
+    pd.testing.assert_extension_array_equal(got.array, expected)
+    assert got.index.equals(s.index)
+
+    with pytest.raises(ValueError, match="2"):
+        _normalize_flag(pd.Series([0.0, 1.0, 2.0]))
+    with pytest.raises(ValueError, match="x"):
+        _normalize_flag(pd.Series(["1", "x"]))
+
+
+def _merge_screened_flags_rowwise(repo, staged, value_reference, explicit_conflict):
+    """Row-by-row statement of the screened merge rules, for comparison."""
+    idx = repo.index.union(staged.index)
+    r = repo.reindex(idx)
+    s = staged.reindex(idx)
+    ref = r if value_reference == "repo" else s
+    values, flags = [], []
+    for t in idx:
+        rv, sv = r.at[t, "value"], s.at[t, "value"]
+        rf, sf = _normalize_flag(r["user_flag"]).at[t], _normalize_flag(s["user_flag"]).at[t]
+        equal = (pd.isna(rv) and pd.isna(sv)) or (not pd.isna(rv) and rv == sv)
+        if not equal:
+            values.append(ref.at[t, "value"])
+            flags.append(rf if value_reference == "repo" else sf)
+            continue
+        values.append(rv)
+        if pd.isna(rf):
+            flags.append(sf)
+        elif pd.isna(sf) or rf == sf or explicit_conflict == "prefer_repo":
+            flags.append(rf)
+        else:
+            flags.append(sf)
+    return pd.DataFrame(
+        {"value": values, "user_flag": pd.array(flags, dtype="Int64")}, index=idx
+    )
+
+
+@pytest.mark.parametrize("value_reference", ["repo", "staged"])
+@pytest.mark.parametrize("explicit_conflict", ["prefer_repo", "prefer_staged"])
+def test_merge_screened_flags_matches_rowwise_rules(value_reference, explicit_conflict) -> None:
+    rng = np.random.default_rng(3)
+    idx = pd.date_range("2024-01-01", periods=120, freq="h", name="datetime")
+    n = len(idx)
+
+    def flags():
+        f = pd.array(rng.integers(0, 2, n), dtype="Int64")
+        f[rng.random(n) < 0.5] = pd.NA
+        return f
+
+    rv = rng.random(n)
+    rv[rng.random(n) < 0.1] = np.nan
+    sv = rv.copy()
+    sv[rng.random(n) < 0.2] += 1.0
+    sv[rng.random(n) < 0.1] = np.nan
+    repo = pd.DataFrame({"value": rv, "user_flag": flags()}, index=idx).iloc[10:]
+    # staged flags as floats, as they come out of a default CSV read
+    staged = pd.DataFrame(
+        {"value": sv, "user_flag": pd.Series(flags()).astype("float64").to_numpy()}, index=idx
+    ).iloc[:-10]
+
+    got = _merge_screened_flags(repo, staged, atol=0.0, rtol=0.0,
+                                value_reference=value_reference,
+                                explicit_conflict=explicit_conflict)
+    expected = _merge_screened_flags_rowwise(repo, staged, value_reference, explicit_conflict)
+    pd.testing.assert_frame_equal(got, expected, check_names=False, check_freq=False)
+
+
+@pytest.mark.benchmark
+def test_benchmark_merge_screened_flags_20yr_15min() -> None:
+    """Merge a 20-year 15-minute screened shard set (~700k rows)."""
+    rng = np.random.default_rng(0)
+    idx = pd.date_range("2004-01-01", "2024-01-01", freq="15min", name="datetime")
+    n = len(idx)
+    rv = rng.random(n)
+    rflag = pd.array(rng.integers(0, 2, n), dtype="Int64")
+    rflag[rng.random(n) > 0.01] = pd.NA
+    repo = pd.DataFrame({"value": rv, "user_flag": rflag}, index=idx)
+    sv = rv.copy()
+    sv[rng.random(n) < 0.05] += 1.0
+    # staged flags read back as strings
+    sflag = pd.Series(rflag, index=idx).astype(object)
+    sflag = sflag.where(sflag.notna(), None).map(lambda x: None if x is None else str(x))
+    staged = pd.DataFrame({"value": sv, "user_flag": sflag}, index=idx)
+
+    t0 = time.perf_counter()
+    out = _merge_screened_flags(repo, staged, atol=0.0, rtol=0.0,
+                                value_reference="staged", explicit_conflict="prefer_repo")
+    elapsed = time.perf_counter() - t0
+
+    assert len(out) == n
+    assert out["user_flag"].dtype.name == "Int64"
+    assert elapsed < 2.0
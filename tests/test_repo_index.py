@@ -0,0 +1,184 @@
+import gc
+import os
+from pathlib import Path
+
+import pytest
+
+from dms_datastore import repo_index
+
+
+def _touch(path: Path) -> None:
+    path.write_text("# unit: feet\ndatetime,value\n", encoding="utf-8")
+
+
+def _age_dir(path: Path) -> None:
+    # Move the directory mtime, as adding or removing a file does.
+    old = os.stat(path).st_mtime_ns - 10_000_000_000
+    os.utime(path, ns=(old, old))
+
+
+def test_index_glob_matches_glob_and_skips_rescan(tmp_path: Path, monkeypatch) -> None:
+    for name in ["des_mrz_00_elev_2020.csv", "des_mrz_00_elev_2021_2024.csv",
+                 "usgs_x_1_flow_2020.csv", ".hidden.csv"]:
+        _touch(tmp_path / name)
+    pattern = str(tmp_path / "*_elev_*.csv")
+    expected = repo_index.index_glob(pattern)  # index disabled: plain glob
+
+    monkeypatch.setenv(repo_index.INDEX_ENV, str(tmp_path / "index"))
+    monkeypatch.setattr(repo_index, "_listings", {})
+    assert repo_index.index_glob(pattern) == expected
+    _age_dir(tmp_path)
+    repo_index._listings.clear()
+    assert repo_index.index_glob(pattern) == expected  # re-scan, dir mtime moved
+    repo_index._listings.clear()
+    assert repo_index.index_glob(pattern) == expected  # re-scan confirms the listing
+
+    real_scan = repo_index._scan
+
+    def bomb(*args, **kwargs):
+        raise AssertionError("unchanged directory should not be re-scanned")
+
+    repo_index._listings.clear()
+    monkeypatch.setattr(repo_index, "_scan", bomb)
+    assert repo_index.index_glob(pattern) == expected
+
+    # Without trusting the directory mtime every lookup scans.
+    scans = []
+    monkeypatch.setattr(repo_index, "_scan", lambda *a: scans.append(a) or real_scan(*a))
+    monkeypatch.setenv(repo_index.TRUST_ENV, "false")
+    assert repo_index.index_glob(pattern) == expected
+    assert repo_index.index_glob(pattern) == expected
+    assert len(scans) == 2
+
+
+def test_listing_not_trusted_until_confirmed(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setenv(repo_index.INDEX_ENV, str(tmp_path / "index"))
+    monkeypatch.setattr(repo_index, "_listings", {})
+    data = tmp_path / "data"
+    data.mkdir()
+    _touch(data / "des_mrz_00_elev_2020.csv")
+    pattern = str(data / "*.csv")
+    assert len(repo_index.index_glob(pattern)) == 1
+
+    # A file added within the same mtime tick leaves the directory mtime as
+    # it was at the first scan; the unconfirmed listing must not hide it.
+    mtime = os.stat(data).st_mtime_ns
+    _touch(data / "des_mrz_00_elev_2021.csv")
+    os.utime(data, ns=(mtime, mtime))
+    assert len(repo_index.index_glob(pattern)) == 2
+
+
+def test_index_picks_up_new_files_and_caches_meta(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setenv(repo_index.INDEX_ENV, "adjacent")
+    monkeypatch.setattr(repo_index, "_listings", {})
+    _touch(tmp_path / "des_mrz_00_elev_2020.csv")
+    assert len(repo_index.index_glob(str(tmp_path / "*.csv"))) == 1
+
+    _touch(tmp_path / "des_mrz_00_elev_2021_2024.csv")
+    _age_dir(tmp_path)
+    cfg = {
+        "name": "test",
+        "provider_key": "agency",
+        "filename_templates": [
+            "{agency}_{station_id}_{agency_id}_{param}_{syear}_{eyear}.csv",
+            "{agency}_{station_id}_{agency_id}_{param}_{year}.csv",
+        ],
+    }
+    df = repo_index.indexed_files(str(tmp_path), "*.csv", repo_cfg=cfg)
+    assert list(df.filename) == [
+        "des_mrz_00_elev_2020.csv",
+        "des_mrz_00_elev_2021_2024.csv",
+    ]
+    assert list(df.syear) == [2020, 2021] and list(df.eyear) == [2020, 2024]
+    assert df.meta.iloc[1]["station_id"] == "mrz"
+    assert (tmp_path / repo_index.ADJACENT_DIR).is_dir()
+
+
+def test_data_hash_manifest_rehashes_only_changed_files(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setenv(repo_index.INDEX_ENV, str(tmp_path / "index"))
+    repo = tmp_path / "repo"
+    repo.mkdir()
+    for yr in (2020, 2021):
+        path = repo / f"des_mrz_00_elev_{yr}.csv"
+        path.write_text(f"# unit: feet\ndatetime,value\n{yr}-01-01T00:00:00,1.0\n")
+        old = os.stat(path).st_mtime_ns - 10 * repo_index._RACY_NS
+        os.utime(path, ns=(old, old))
+    first, second = sorted(str(p) for p in repo.iterdir())
+
+    with repo_index.DataHashManifest(str(repo)) as manifest:
+        expected = {p: manifest.data_hash(p) for p in (first, second)}
+    assert expected[first] == repo_index._hash_data_section(first)
+
+    hashed = []
+    real = repo_index._hash_data_section
+    monkeypatch.setattr(
+        repo_index, "_hash_data_section", lambda p: hashed.append(p) or real(p)
+    )
+    with repo_index.DataHashManifest(str(repo)) as manifest:
+        assert {p: manifest.data_hash(p) for p in (first, second)} == expected
+        assert manifest.cached_hash(first) == expected[first]
+    assert hashed == []
+
+    Path(second).write_text("# unit: feet\ndatetime,value\n2021-01-01T00:00:00,2.0\n")
+    assert repo_index.indexed_data_hash(second) != expected[second]
+    assert repo_index.indexed_data_hash(first) == expected[first]
+    assert hashed == [second]
+
+
+def test_header_units_read_requested_rows_once(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setenv(repo_index.INDEX_ENV, str(tmp_path / "index"))
+    monkeypatch.setattr(repo_index, "_listings", {})
+    monkeypatch.setattr(repo_index, "_local", repo_index.threading.local())
+    data = tmp_path / "data"
+    data.mkdir()
+    names = [f"des_s{i}_00_elev_2020.csv" for i in range(5)]
+    for name in names:
+        _touch(data / name)
+    (data / names[2]).write_text("datetime,value\n", encoding="utf-8")
+    _age_dir(data)
+    paths = [str(data / n) for n in names[::-1]] + [str(data / "missing.csv")]
+    assert repo_index.indexed_header_units(paths) == ["feet", "feet", None, "feet", "feet", None]
+    repo_index.index_glob(str(data / "*.csv"))  # second scan confirms the listing
+
+    connects = []
+    real_connect = repo_index._connect
+    monkeypatch.setattr(
+        repo_index, "_connect", lambda *a, **k: connects.append(a) or real_connect(*a, **k)
+    )
+
+    def bomb(*args, **kwargs):
+        raise AssertionError("unchanged directory should not be refreshed per file")
+
+    monkeypatch.setattr(repo_index, "_refresh", bomb)
+    monkeypatch.setattr(repo_index, "_header_unit", bomb)
+    assert [repo_index.indexed_header_unit(p) for p in paths[:5]] == [
+        "feet", "feet", None, "feet", "feet"
+    ]
+    assert connects == []
+
+
+def test_cached_connections_are_bounded_and_closed(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setenv(repo_index.INDEX_ENV, str(tmp_path / "index"))
+    monkeypatch.setattr(repo_index, "_local", repo_index.threading.local())
+    monkeypatch.setattr(repo_index, "_CONN_CACHE_SIZE", 2)
+    dirs = []
+    for i in range(3):
+        d = tmp_path / f"d{i}"
+        d.mkdir()
+        _touch(d / "des_mrz_00_elev_2020.csv")
+        dirs.append(d)
+    conns = [repo_index._cached_connect(str(d)) for d in dirs]
+    assert repo_index._cached_connect(str(dirs[2])) is conns[2]
+    with pytest.raises(repo_index.sqlite3.ProgrammingError):
+        conns[0].execute("SELECT 1")  # evicted and closed
+
+    def worker():
+        conns.append(repo_index._cached_connect(str(dirs[0])))
+
+    thread = repo_index.threading.Thread(target=worker)
+    thread.start()
+    thread.join()
+    del thread
+    gc.collect()
+    with pytest.raises(repo_index.sqlite3.ProgrammingError):
+        conns[-1].execute("SELECT 1")  # closed with its thread
@@ -0,0 +1,59 @@
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+import yaml
+from click.testing import CliRunner
+
+pytest.importorskip("geopandas")
+pytest.importorskip("schimpy")
+
+from dms_datastore import screen_benchmark
+
+
+CONFIG = {
+    "regions": {},
+    "stations": {},
+    "defaults": {
+        "global": {
+            "steps": [
+                {"method": "bounds_test", "label": "bounds", "args": {"bounds": [0.0, 3000.0]}},
+                {"method": "repeat_test", "label": "repeats", "args": {"max_repeat": 4}},
+            ]
+        },
+        "params": {},
+    },
+}
+
+
+def test_synthetic_series_shapes():
+    ts = screen_benchmark.synthetic_series("flow", freq="1h", years=1)
+    assert len(ts) == 8784 and list(ts.columns) == ["value"]
+    assert ts.index.freq == pd.tseries.frequencies.to_offset("1h")
+    assert ts.index[0] == pd.Timestamp("2000-01-01")
+    values = ts["value"].to_numpy()
+    assert np.isnan(values).any()
+    assert (values[1:] == values[:-1]).sum() > 100  # runs of repeated values
+
+
+def test_screen_benchmark_cli_writes_json_per_step(tmp_path):
+    config = tmp_path / "screen.yaml"
+    config.write_text(yaml.safe_dump(CONFIG))
+    output = tmp_path / "bench.json"
+    result = CliRunner().invoke(
+        screen_benchmark.screen_benchmark_cli,
+        ["--config", str(config), "--params", "ec", "--freq", "1h", "--years", "1",
+         "--repeat", "1", "--output", str(output)],
+    )
+    assert result.exit_code == 0, result.output
+
+    results = json.loads(output.read_text())
+    assert results["environment"]["versions"]["pandas"]
+    cases = results["cases"]
+    assert [c["engine"] for c in cases] == ["pandas", "fused"]
+    for case in cases:
+        assert case["rows"] == 8784 and case["years"] == 1 and case["freq"] == "1h"
+        assert case["rows_per_s"] > 0 and case["peak_bytes"] > 0
+        assert [s["label"] for s in case["steps"]] == ["bounds", "repeats"]
+        assert all(s["rows"] == 8784 and s["peak_bytes"] > 0 for s in case["steps"])
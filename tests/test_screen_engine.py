@@ -0,0 +1,226 @@
+import copy
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+import yaml
+
+from dms_datastore import screen_engine
+from dms_datastore.screen_engine import compile_protocol
+
+
+# Reference step functions: the published vtools algorithms written out in
+# pandas, one full-series pass each, as screener runs them.
+def bounds_test(ts, bounds):
+    v = ts.squeeze(axis=1)
+    bad = pd.Series(False, index=v.index)
+    if bounds[0] is not None:
+        bad |= v < bounds[0]
+    if bounds[1] is not None:
+        bad |= v > bounds[1]
+    return bad
+
+
+def repeat_test(ts, max_repeat, lower_limit=None, upper_limit=None):
+    v = ts.squeeze(axis=1)
+    counts = v.groupby(v.ne(v.shift()).cumsum()).transform("count")
+    bad = counts > max_repeat
+    if lower_limit is not None:
+        bad &= v >= lower_limit
+    if upper_limit is not None:
+        bad &= v <= upper_limit
+    return bad
+
+
+def _scaled(res, level, scale, quantiles):
+    if scale is None:
+        qq = res.quantile(q=quantiles)
+        scale = qq.loc[quantiles[1]] - qq.loc[quantiles[0]]
+    return (res.abs() > level * scale) | (res.abs() < -level * scale)
+
+
+def median_test_twoside(ts, level=4, scale=None, filt_len=7, quantiles=(0.005, 0.095)):
+    v = ts.squeeze(axis=1)
+    res = v - v.rolling(filt_len, center=True).median()
+    return _scaled(res, level, scale, quantiles)
+
+
+def median_test_oneside(
+    ts, scale=None, level=4, filt_len=6, quantiles=(0.005, 0.095), reverse=False
+):
+    v = ts.squeeze(axis=1)
+    vals = v[::-1] if reverse else v
+    kappa = filt_len // 2
+    my = vals.shift().rolling(2 * kappa, min_periods=2 * kappa - 1).median()
+    mz = vals.diff().shift().rolling(2 * kappa, min_periods=2 * kappa - 1).median()
+    anomaly = _scaled(vals - (my + kappa * mz), level, scale, quantiles)
+    return anomaly[::-1] if reverse else anomaly
+
+
+def big_jump_test(ts, jump):
+    return ts.squeeze(axis=1).diff().abs() > jump
+
+
+METHODS = {
+    f.__name__: f
+    for f in (bounds_test, repeat_test, median_test_twoside, median_test_oneside, big_jump_test)
+}
+
+
+def _stepwise(ts, proto, methods):
+    """user_flag and anomaly frame computed the way screener does."""
+    ts_process = ts.copy()
+    full = None
+    for step in proto["steps"]:
+        label = step.get("label", step["method"])
+        anomaly = methods[step["method"]](ts_process, **step["args"])
+        if step.get("apply_immediately", False):
+            ts_process = ts_process.mask(anomaly, axis=0)
+        if full is None:
+            full = anomaly.to_frame()
+            full.columns = [label]
+        else:
+            full[label] = anomaly
+    flag = full.any(axis=1).astype(pd.Int64Dtype())
+    return flag.mask(flag == 0, other=pd.NA), full
+
+
+def _sample(kind, n=6000, seed=0):
+    rng = np.random.default_rng(seed)
+    t = np.arange(n)
+    freq = "1h" if kind == "flow" else "15min"
+    if kind == "stage":
+        v = 3.0 + np.sin(t * 2 * np.pi / 49.7) + 0.02 * rng.standard_normal(n)
+    elif kind == "ec":
+        v = 800 + 200 * np.sin(t / 500.0) + 5 * rng.standard_normal(n)
+        spikes = rng.random(n) < 0.005
+        v[spikes] *= rng.choice([0.2, 5.0], spikes.sum())
+    else:
+        v = np.round(1000 + 300 * np.sin(t / 200.0) + 20 * rng.standard_normal(n), -1)
+        for s0 in rng.integers(0, n - 50, 30):
+            v[s0:s0 + rng.integers(3, 40)] = v[s0]
+    v[rng.random(n) < 0.01] = np.nan
+    for s0 in rng.integers(0, n - 100, 5):
+        v[s0:s0 + rng.integers(1, 100)] = np.nan
+    index = pd.date_range("2000-01-01", periods=n, freq=freq, name="datetime")
+    return pd.DataFrame({"value": v}, index=index)
+
+
+PROTOCOLS = {
+    "standard": {
+        "steps": [
+            {"method": "bounds_test", "args": {"bounds": [-100.0, 5000.0]}},
+            {"method": "repeat_test", "args": {"max_repeat": 4}},
+            {"method": "median_test_twoside", "args": {"level": 5, "filt_len": 7}},
+            {"method": "median_test_oneside", "label": "forward",
+             "args": {"level": 5, "filt_len": 5, "quantiles": [0.03, 0.97], "reverse": False}},
+            {"method": "median_test_oneside", "label": "reverse",
+             "args": {"level": 5, "filt_len": 5, "quantiles": [0.03, 0.97], "reverse": True}},
+        ]
+    },
+    "masking": {
+        "steps": [
+            {"method": "bounds_test", "args": {"bounds": [None, 1200.0]}, "apply_immediately": True},
+            {"method": "big_jump_test", "args": {"jump": 50.0}},
+            {"method": "repeat_test", "args": {"max_repeat": 3, "lower_limit": 0.0},
+             "apply_immediately": True},
+            {"method": "median_test_oneside", "args": {"filt_len": 4, "scale": 0.3}},
+            {"method": "median_test_oneside", "args": {"filt_len": 6, "reverse": True}},
+            {"method": "median_test_twoside", "args": {"filt_len": 4}},
+        ]
+    },
+}
+
+
+@pytest.mark.parametrize("window", [1, 2, 4, 5, 7])
+@pytest.mark.parametrize("min_periods", [0, 1, 3])
+def test_rolling_median_matches_pandas(window, min_periods, monkeypatch):
+    monkeypatch.setattr(screen_engine, "MEDIAN_BLOCK", 500)
+    min_periods = min(min_periods, window)
+    rng = np.random.default_rng(window)
+    x = np.round(rng.standard_normal(2000), 1)
+    x[rng.random(2000) < 0.2] = np.nan
+    x[100:130] = np.nan
+    expected = pd.Series(x).rolling(window, min_periods=min_periods).median().to_numpy()
+    got = screen_engine._rolling_median(x, window, min_periods)
+    np.testing.assert_array_equal(got, expected)
+
+
+@pytest.mark.parametrize("kind", ["stage", "ec", "flow"])
+@pytest.mark.parametrize("name", sorted(PROTOCOLS))
+def test_plan_flags_match_stepwise_screen(kind, name):
+    ts = _sample(kind)
+    proto = PROTOCOLS[name]
+    flag, full = _stepwise(ts, proto, METHODS)
+
+    plan = compile_protocol(copy.deepcopy(proto), METHODS)
+    assert all(step.kernel is not None for step in plan.steps if step.name in screen_engine._KERNELS)
+    result = plan.run(ts)
+    pd.testing.assert_series_equal(result.user_flag(), flag, check_names=False)
+    pd.testing.assert_frame_equal(result.anomalies(), full.fillna(False).astype(bool))
+
+
+def test_plan_falls_back_to_step_function_when_kernel_differs():
+    def inclusive_bounds(ts, bounds):
+        v = ts.squeeze(axis=1)
+        return (v <= bounds[0]) | (v >= bounds[1])
+
+    ts = _sample("flow")
+    proto = {"steps": [{"method": "bounds_test", "args": {"bounds": [900.0, 1100.0]}}]}
+    methods = dict(METHODS, bounds_test=inclusive_bounds)
+    plan = compile_protocol(proto, methods)
+    assert plan.steps[0].kernel is None
+    flag, _ = _stepwise(ts, proto, methods)
+    pd.testing.assert_series_equal(plan.run(ts).user_flag(), flag, check_names=False)
+
+
+def test_repeated_label_replaces_earlier_step():
+    ts = _sample("stage", n=500)
+    proto = {
+        "steps": [
+            {"method": "bounds_test", "args": {"bounds": [0.0, 3.5]}},
+            {"method": "bounds_test", "args": {"bounds": [0.0, 10.0]}},
+        ]
+    }
+    flag, full = _stepwise(ts, proto, METHODS)
+    result = compile_protocol(proto, METHODS).run(ts)
+    assert result.labels == ["bounds_test"] and result.bits.dtype == np.uint8
+    assert flag.isna().all()
+    pd.testing.assert_series_equal(result.user_flag(), flag, check_names=False)
+
+
+def test_plan_step_hook_times_each_step():
+    calls = []
+    proto = PROTOCOLS["standard"]
+    compile_protocol(copy.deepcopy(proto), METHODS).run(
+        _sample("ec", n=500), step_hook=lambda *args: calls.append(args)
+    )
+    assert [c[0] for c in calls] == ["bounds_test", "repeat_test", "median_test_twoside",
+                                     "forward", "reverse"]
+    assert all(seconds >= 0 and nrows == 500 for _, seconds, nrows in calls)
+
+
+def test_screener_fused_matches_stepwise_on_shipped_protocols():
+    pytest.importorskip("geopandas")
+    pytest.importorskip("schimpy")
+    from dms_datastore import auto_screen
+
+    fname = os.path.join(
+        os.path.dirname(auto_screen.__file__), "config_data", "screen_config_v20230126.yaml"
+    )
+    with open(fname) as f:
+        config = yaml.safe_load(f)
+    for param in config["defaults"]["params"]:
+        proto = auto_screen._merge_protocol(config, "default", "xyz", param)
+        for kind in ("stage", "ec", "flow"):
+            ts = _sample(kind, n=3000)
+            expected, full = auto_screen.screener(
+                ts.copy(), "xyz", "default", param, copy.deepcopy(proto), return_anomaly=True
+            )
+            got, anomalies = auto_screen.screener(
+                ts.copy(), "xyz", "default", param, copy.deepcopy(proto),
+                return_anomaly=True, fused=True,
+            )
+            pd.testing.assert_series_equal(got["user_flag"], expected["user_flag"])
+            assert list(anomalies.columns) == list(full.columns)
@@ -0,0 +1,123 @@
+import os
+
+import pandas as pd
+import pytest
+
+from dms_datastore import shard_writer
+from dms_datastore.shard_writer import (
+    _data_fingerprint,
+    _hash_data_section,
+    _same_data_section,
+    write_shard,
+    write_shards,
+)
+from dms_datastore.write_ts import write_ts_csv
+
+
+def _writer(text):
+    def write(f):
+        f.write(text)
+
+    return write
+
+
+def test_write_shard_is_atomic_on_error(tmp_path):
+    dest = tmp_path / "a_2020.csv"
+    dest.write_text("# unit: feet\ndatetime,value\n2020-01-01T00:00:00,1.0\n")
+
+    def fail(f):
+        f.write("# unit: feet\ndatetime,val")
+        raise RuntimeError("interrupted")
+
+    with pytest.raises(RuntimeError):
+        write_shard(dest, fail)
+    assert dest.read_text().endswith("1.0\n")
+    assert os.listdir(tmp_path) == ["a_2020.csv"]
+
+
+def test_write_shard_skips_unchanged_data(tmp_path):
+    dest = tmp_path / "a_2020.csv"
+    body = "datetime,value\n2020-01-01T00:00:00,1.0\n"
+    assert write_shard(dest, _writer("# date_formatted: 2024-01-01\n" + body))
+    os.utime(dest, ns=(0, 0))
+
+    # Only the volatile date stamp differs: file and mtime are kept.
+    assert not write_shard(dest, _writer("# date_formatted: 2025-06-01\n" + body))
+    assert dest.stat().st_mtime_ns == 0
+    assert "2024-01-01" in dest.read_text()
+
+    # A real header change or a data change is written.
+    assert write_shard(dest, _writer("# date_formatted: 2025-06-01\n# unit: feet\n" + body))
+    assert write_shard(dest, _writer(body.replace("1.0", "2.0")))
+    assert write_shard(dest, _writer(body.replace("1.0", "2.0")), skip_unchanged=False)
+    assert dest.read_text() == body.replace("1.0", "2.0")
+
+
+@pytest.mark.skipif(os.name == "nt", reason="POSIX permission bits")
+def test_write_shard_keeps_destination_mode(tmp_path):
+    dest = tmp_path / "a_2020.csv"
+    dest.write_text("# unit: feet\ndatetime,value\n2020-01-01T00:00:00,1.0\n")
+    os.chmod(dest, 0o664)
+    assert write_shard(dest, _writer("# unit: feet\ndatetime,value\n2020-01-01T00:00:00,2.0\n"))
+    assert os.stat(dest).st_mode & 0o777 == 0o664
+
+
+def test_write_shards_batch(tmp_path):
+    shards = [(tmp_path / f"s_{yr}.csv", _writer(f"datetime,value\n{yr}-01-01,1\n")) for yr in range(2000, 2010)]
+    written = write_shards(shards, max_workers=4)
+    assert written == [os.fspath(p) for p, _ in shards]
+    assert write_shards(shards, max_workers=4) == []
+    assert sorted(os.listdir(tmp_path)) == [f"s_{yr}.csv" for yr in range(2000, 2010)]
+
+
+def test_write_shards_reports_first_error(tmp_path):
+    def fail(f):
+        raise ValueError("bad shard")
+
+    shards = [(tmp_path / "ok.csv", _writer("x\n")), (tmp_path / "bad.csv", fail)]
+    with pytest.raises(ValueError, match="bad shard"):
+        write_shards(shards, max_workers=2)
+    assert os.listdir(tmp_path) == ["ok.csv"]
+
+
+def test_write_ts_csv_leaves_unchanged_shards(tmp_path):
+    index = pd.date_range("2019-01-01", "2020-12-31", freq="D", name="datetime")
+    df = pd.DataFrame({"value": range(len(index))}, index=index, dtype=float)
+    write_ts_csv(df, tmp_path / "sta@value.csv", chunk_years=True)
+    first, second = tmp_path / "sta@value_2019.csv", tmp_path / "sta@value_2020.csv"
+    before = _hash_data_section(second)
+    os.utime(first, ns=(0, 0))
+    os.utime(second, ns=(0, 0))
+
+    df.loc["2020-06-01", "value"] = -1.0
+    write_ts_csv(df, tmp_path / "sta@value.csv", chunk_years=True)
+    assert first.stat().st_mtime_ns == 0
+    assert second.stat().st_mtime_ns != 0
+    assert _hash_data_section(second) != before
+
+
+def test_same_data_section_hashes_only_on_matching_fingerprints(tmp_path, monkeypatch):
+    rows = "".join(f"2020-01-01T{h:02d}:00:00,{h}.0\n" for h in range(24))
+    body = "datetime,value\n" + rows * 400  # larger than two fingerprint windows
+    a, b, c, d = (tmp_path / f"{n}.csv" for n in "abcd")
+    a.write_text("# unit: feet\n" + body)
+    b.write_text("# unit: feet\n# date_formatted: 2025-01-01\n" + body)
+    c.write_text("# unit: feet\n" + body + "2020-01-02T00:00:00,0.0\n")
+    # same length, ends untouched, one value changed in the middle
+    mid = len(body) // 2
+    mid = body.index("1.0", mid)
+    d.write_text("# unit: feet\n" + body[:mid] + "7.0" + body[mid + 3:])
+
+    assert _data_fingerprint(a) == _data_fingerprint(b)
+    assert _data_fingerprint(a) == _data_fingerprint(d)
+    assert _data_fingerprint(a) != _data_fingerprint(c)
+
+    hashed = []
+    monkeypatch.setattr(
+        shard_writer, "_hash_data_section", lambda p: hashed.append(p) or _hash_data_section(p)
+    )
+    assert _same_data_section(a, b)
+    assert not _same_data_section(a, d)
+    assert len(hashed) == 4
+    assert not _same_data_section(a, c)
+    assert len(hashed) == 4
@@ -0,0 +1,60 @@
+import importlib
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+pytest.importorskip("pyarrow")
+
+rt = importlib.import_module("dms_datastore.read_ts")
+from dms_datastore import sidecar
+
+
+def _write_shard(path: Path, nrows: int = 96) -> None:
+    idx = pd.date_range("2020-01-01", periods=nrows, freq="15min")
+    lines = ["# format: dwr-dms-1.0", "# unit: feet", "datetime,value"]
+    lines += [f"{t},{i}.5" for i, t in enumerate(idx.strftime("%Y-%m-%dT%H:%M:%S"))]
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8", newline="\n")
+
+
+def test_read_ts_builds_and_uses_sidecar(tmp_path: Path, monkeypatch) -> None:
+    cache = tmp_path / "cache"
+    monkeypatch.setenv(sidecar.SIDECAR_ENV, str(cache))
+    fpath = tmp_path / "des_xyz_00_elev_2020.csv"
+    _write_shard(fpath)
+
+    first = rt.read_ts(str(fpath))
+    assert len(list(cache.glob("*.parquet"))) == 1
+
+    def bomb(*args, **kwargs):
+        raise AssertionError("csv should not be parsed when the sidecar is fresh")
+
+    monkeypatch.setattr(rt, "read_dms1", bomb)
+    second = rt.read_ts(str(fpath))
+    pd.testing.assert_frame_equal(first, second)
+
+
+def test_read_ts_hint_bypasses_sidecar(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setenv(sidecar.SIDECAR_ENV, str(tmp_path / "cache"))
+    fpath = tmp_path / "des_xyz_00_elev_2020.csv"
+    _write_shard(fpath)
+    first = rt.read_ts(str(fpath))
+
+    def bomb(*args, **kwargs):
+        raise AssertionError("an explicit hint should not be served from the sidecar")
+
+    monkeypatch.setattr(sidecar, "load_sidecar", bomb)
+    monkeypatch.setattr(sidecar, "store_sidecar", bomb)
+    pd.testing.assert_frame_equal(rt.read_ts(str(fpath), hint="dms1"), first)
+
+
+def test_sidecar_goes_stale_when_data_changes(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setenv(sidecar.SIDECAR_ENV, "adjacent")
+    fpath = tmp_path / "des_xyz_00_elev_2020.csv"
+    _write_shard(fpath)
+    rt.read_ts(str(fpath))
+
+    _write_shard(fpath, nrows=100)
+    ts = rt.read_ts(str(fpath))
+    assert len(ts) == 100
+    assert sidecar.prune_sidecars(repo_dir=str(tmp_path)) == []
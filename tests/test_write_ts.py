@@ -1,9 +1,30 @@
 import io
+import time
+
+import numpy as np
 import pandas as pd
 import pytest
 from dms_datastore.write_ts import write_ts_csv
 
 
+def _reference_csv(ts, **kwargs):
+    """Data section as written before the fast index formatting."""
+    buf = io.StringIO()
+    ts.to_csv(
+        buf,
+        header=True,
+        sep=",",
+        date_format="%Y-%m-%dT%H:%M:%S",
+        lineterminator="\n",
+        **kwargs,
+    )
+    return buf.getvalue()
+
+
+def _data_section(text):
+    return "".join(line for line in text.splitlines(True) if not line.startswith("#"))
+
+
 @pytest.fixture
 def sample_ts():
     index = pd.date_range("2020-01-01", periods=5, freq="h", name="datetime")
@@ -98,3 +119,55 @@ def test_write_ts_csv_path_rewrite_closes_file(tmp_path):
     assert out.exists()
     text = out.read_text(encoding="utf-8")
     assert "# format: dwr-dms-1.0" in text
+
+
+@pytest.mark.parametrize("kwargs", [{}, {"float_format": "%.3f"}, {"na_rep": "m"}])
+def test_write_ts_csv_matches_to_csv(kwargs):
+    index = pd.DatetimeIndex(
+        ["1965-03-01 00:00:00.700", "1999-12-31 23:45:00", "2024-02-29 12:00:01.2"],
+        name="datetime",
+    )
+    df = pd.DataFrame(
+        {
+            "value": [1.25, np.nan, -3.0],
+            "user_flag": pd.array([0, None, 1], dtype="Int64"),
+            "note": ["a", "b,c", None],
+        },
+        index=index,
+    )
+    buf = io.StringIO()
+    write_ts_csv(df, buf, **kwargs)
+    assert _data_section(buf.getvalue()) == _reference_csv(df, **kwargs)
+
+
+def test_write_ts_csv_chunked_shards_match_to_csv(tmp_path):
+    index = pd.date_range("2018-06-01", "2021-03-01", freq="h", name="datetime")
+    df = pd.DataFrame({"value": np.arange(len(index), dtype=float)}, index=index)
+    df.loc["2019-02":"2019-11", "value"] = np.nan
+    write_ts_csv(df, tmp_path / "sta@value.csv", chunk_years=True)
+
+    written = sorted(p.name for p in tmp_path.iterdir())
+    assert written == [
+        "sta@value_2018.csv",
+        "sta@value_2019.csv",
+        "sta@value_2020.csv",
+        "sta@value_2021.csv",
+    ]
+    text = (tmp_path / "sta@value_2019.csv").read_text(encoding="utf-8")
+    expected = df.loc["2019-01-01":"2019-12-31 23:59:59"]
+    assert _data_section(text) == _reference_csv(expected)
+
+
+@pytest.mark.benchmark
+def test_benchmark_write_ts_csv_30yr_15min(tmp_path):
+    rng = np.random.default_rng(0)
+    idx = pd.date_range("1990-01-01", "2020-01-01", freq="15min", name="datetime")
+    df = pd.DataFrame({"value": rng.random(len(idx)).round(4)}, index=idx)
+
+    start = time.perf_counter()
+    _reference_csv(df)
+    old_t = time.perf_counter() - start
+    start = time.perf_counter()
+    write_ts_csv(df, tmp_path / "bench.csv", chunk_years=True)
+    new_t = time.perf_counter() - start
+    assert new_t < old_t